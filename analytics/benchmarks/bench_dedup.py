@@ -0,0 +1,89 @@
+"""
+Benchmark de la deduplicación global por bloques (src/dedup.py) frente a drop_duplicates de
+pandas sobre el DataFrame completo: tiempo, pico de memoria (RSS) y filas eliminadas.
+Cada bloque repite un 10% de filas de bloques anteriores, además de los duplicados aleatorios.
+drop_duplicates necesita todas las filas en memoria (con 50M filas, varios GiB);
+--skip-pandas mide solo la versión por bloques.
+
+Uso (desde el directorio analytics):
+    python -m benchmarks.bench_dedup
+    python -m benchmarks.bench_dedup --rows 5000000 --max-memory-mb 32
+"""
+
+import argparse
+import resource
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.dedup import Deduplicator, FingerprintSet, KEY_BYTES
+
+DATES = pd.date_range("2020-01-01", periods=1500).strftime("%Y-%m-%d").to_numpy(dtype=object)
+CATEGORIES = np.array(list("ABCDEFGH"), dtype=object)
+
+
+def generate_chunks(rows, chunk_rows, seed=0):
+    """Bloques de eventos sintéticos; cada bloque repite filas de los bloques anteriores."""
+    rng = np.random.default_rng(seed)
+    previous = None
+    for start in range(0, rows, chunk_rows):
+        size = min(chunk_rows, rows - start)
+        chunk = pd.DataFrame({
+            "date": DATES[rng.integers(0, len(DATES), size)],
+            "category": CATEGORIES[rng.integers(0, len(CATEGORIES), size)],
+            "value": rng.integers(0, 1_000_000, size).astype(float),
+        })
+        if previous is not None:
+            repeated = rng.choice(size, size // 10, replace=False)
+            chunk.iloc[repeated] = previous.iloc[rng.integers(0, len(previous), len(repeated))].to_numpy()
+        previous = chunk
+        yield chunk
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def bench_stream(args):
+    fingerprints = FingerprintSet(max_memory_keys=args.max_memory_mb * 1024 * 1024 // KEY_BYTES, spill_dir=args.spill_dir)
+    with Deduplicator(fingerprints) as deduplicator:
+        elapsed = 0.0
+        for chunk in generate_chunks(args.rows, args.chunk_rows):
+            start = time.perf_counter()
+            deduplicator(chunk)
+            elapsed += time.perf_counter() - start
+        stats = deduplicator.stats
+    print(f"Por bloques:      {elapsed:8.2f} s  {stats['rows_dropped']:>12,} eliminadas  "
+          f"tramos en disco {stats['spilled_runs']}  pico RSS {peak_rss_mb():,.0f} MiB")
+    return stats["rows_dropped"]
+
+
+def bench_pandas(args):
+    df = pd.concat(generate_chunks(args.rows, args.chunk_rows), ignore_index=True)
+    start = time.perf_counter()
+    result = df.drop_duplicates()
+    elapsed = time.perf_counter() - start
+    print(f"drop_duplicates:  {elapsed:8.2f} s  {len(df) - len(result):>12,} eliminadas  "
+          f"pico RSS {peak_rss_mb():,.0f} MiB")
+    return len(df) - len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50_000_000)
+    parser.add_argument("--chunk-rows", type=int, default=1_000_000)
+    parser.add_argument("--max-memory-mb", type=int, default=256, help="memoria de huellas antes de volcar a disco")
+    parser.add_argument("--spill-dir", default=None)
+    parser.add_argument("--skip-pandas", action="store_true")
+    args = parser.parse_args()
+
+    print(f"{args.rows:,} filas en bloques de {args.chunk_rows:,}")
+    # Primero la versión por bloques: el pico de RSS es acumulado en el proceso
+    dropped = bench_stream(args)
+    if not args.skip_pandas:
+        assert bench_pandas(args) == dropped
+
+
+if __name__ == "__main__":
+    main()
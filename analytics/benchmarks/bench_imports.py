@@ -0,0 +1,73 @@
+"""
+Benchmark del tiempo de importación de cada módulo de src (python -X importtime, en un
+proceso nuevo por medida) frente a un presupuesto por módulo. Muestra también qué dependencias
+pesadas carga cada uno y termina con error si algún módulo supera su presupuesto.
+
+Uso (desde el directorio analytics):
+    python -m benchmarks.bench_imports
+    python -m benchmarks.bench_imports --repeat 5 --scale 2   # presupuestos x2 (máquinas lentas)
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+# Presupuesto (ms) de importación por módulo. Los módulos sin dependencias pesadas al importar
+# (pandas, TensorFlow, matplotlib, seaborn) solo pagan numpy como mucho; los del pipeline
+# necesitan pandas (y pyarrow en loaders) desde el principio
+BUDGETS_MS = {
+    "config": 20,
+    "data_processing": 20,
+    "visualization": 20,
+    "artifacts": 250,
+    "machine_learning": 250,
+    "inference": 250,
+    "plotting": 250,
+    "dedup": 1000,
+    "pipeline": 1000,
+    "parallel": 1000,
+    "incremental": 1000,
+    "loaders": 1500,
+}
+
+HEAVY_MODULES = ("numpy", "pandas", "pyarrow", "tensorflow", "matplotlib", "seaborn")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_time(module):
+    """(ms acumulados de importar src.<module>, dependencias pesadas cargadas) en un proceso nuevo."""
+    code = f"import sys, src.{module}; print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == f"src.{module}":
+            return int(fields[1]) / 1000, result.stdout.split()
+    raise RuntimeError(f"Sin medida de importación para src.{module}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="medidas por módulo (se toma la mínima)")
+    parser.add_argument("--scale", type=float, default=1.0, help="factor de los presupuestos")
+    parser.add_argument("modules", nargs="*", default=list(BUDGETS_MS))
+    args = parser.parse_args()
+
+    exceeded = []
+    for module in args.modules:
+        measures = [import_time(module) for _ in range(args.repeat)]
+        elapsed, heavy = min(measures)
+        budget = BUDGETS_MS[module] * args.scale
+        status = "ok" if elapsed <= budget else "SUPERADO"
+        print(f"src.{module:<18} {elapsed:8.1f} ms  (presupuesto {budget:6.0f} ms) {status:<9} {', '.join(heavy) or '-'}")
+        if elapsed > budget:
+            exceeded.append(module)
+    if exceeded:
+        sys.exit(f"Presupuesto de importación superado: {', '.join(exceeded)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark de inferencia en CPU con peticiones de una fila desde N hilos concurrentes: cada
+petición con su propia llamada al modelo (model.predict, como se haría sin servicio, y la
+llamada directa model(x)) frente a BatchPredictor, que agrupa las peticiones en lotes.
+Muestra peticiones/s y latencias p50/p99.
+
+Uso (desde el directorio analytics):
+    python -m benchmarks.bench_inference
+    python -m benchmarks.bench_inference --concurrency 1 8 64 --requests 2000 --max-wait-ms 1
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1") # Solo CPU
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+
+import numpy as np
+
+from src.inference import BatchPredictor, load_model
+from src.machine_learning import build_model
+
+
+def run_clients(predict, rows, concurrency):
+    # Reparte las filas entre `concurrency` hilos que piden una predicción cada vez; devuelve
+    # (peticiones/s, latencias en ms)
+    latencies = [[] for _ in range(concurrency)]
+
+    def client(k):
+        for row in rows[k::concurrency]:
+            start = time.perf_counter()
+            predict(row)
+            latencies[k].append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=client, args=(k,)) for k in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(rows) / (time.perf_counter() - start), np.concatenate(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--features", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    rows = np.random.default_rng(0).random((args.requests, args.features), dtype=np.float32)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "model.keras")
+        model = build_model()
+        model(rows[:1])
+        model.save(path)
+        model = load_model(path) # Se carga una sola vez
+    print(f"{args.requests:,} peticiones de una fila, {args.features} características, {os.cpu_count()} núcleos")
+
+    for concurrency in args.concurrency:
+        cases = {
+            "model.predict por fila": lambda row: model.predict(row[None], verbose=0),
+            "model(x) por fila": lambda row: model(row[None], training=False),
+        }
+        predictor = BatchPredictor(model, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms)
+        predictor.predict(rows[0]) # Trazado del grafo
+        cases["BatchPredictor"] = predictor.predict
+        for name, predict in cases.items():
+            requests = rows if name != "model.predict por fila" else rows[: max(args.requests // 10, concurrency)]
+            throughput, latencies = run_clients(predict, requests, concurrency)
+            p50, p99 = np.percentile(latencies, [50, 99])
+            print(f"{concurrency:>3} hilos  {name:<24} {throughput:9,.0f} pet/s  p50 {p50:7.2f} ms  p99 {p99:7.2f} ms")
+        predictor.close()
+        print(f"{'':>10}lote medio de BatchPredictor: {predictor.metrics()['mean_batch_size']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
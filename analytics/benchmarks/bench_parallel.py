@@ -0,0 +1,75 @@
+"""
+Benchmark de escalado del pipeline en paralelo (src/parallel.py) de 1 a N procesos sobre un
+CSV sintético de varios GB, frente al pipeline por bloques en un solo proceso (src/pipeline.py).
+Todas las ejecuciones deben dar el mismo resultado.
+
+Uso (desde el directorio analytics):
+    python -m benchmarks.bench_parallel
+    python -m benchmarks.bench_parallel --size-gb 0.5 --workers 1 2 4
+    python -m benchmarks.bench_parallel --path /data/events.csv   # reutiliza un CSV generado antes
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from src.parallel import run_parallel
+from src.pipeline import run_pipeline
+
+from .bench_dedup import generate_chunks
+
+
+def write_dataset(path, size_gb, chunk_rows=1_000_000):
+    """CSV de eventos sintéticos (con duplicados entre bloques) de unos `size_gb` GB."""
+    target = int(size_gb * 1024 ** 3)
+    with open(path, "w") as f:
+        f.write("date,category,value\n")
+        for chunk in generate_chunks(10 ** 12, chunk_rows):
+            chunk.to_csv(f, header=False, index=False)
+            if f.tell() >= target:
+                break
+    return path
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-gb", type=float, default=2.0)
+    parser.add_argument("--path", default=None, help="CSV ya generado (si no existe, se genera ahí)")
+    parser.add_argument("--workers", type=int, nargs="+", default=None, help="por defecto 1, 2, 4... hasta los núcleos")
+    parser.add_argument("--skip-pipeline", action="store_true", help="no medir el pipeline en un solo proceso")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    workers = args.workers or sorted({min(2 ** i, cores) for i in range(cores.bit_length() + 1)})
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.path or os.path.join(directory, "events.csv")
+        if not os.path.exists(path):
+            _, elapsed = timed(write_dataset, path, args.size_gb)
+            print(f"Generado {path} en {elapsed:.1f} s")
+        print(f"{os.path.getsize(path) / 1024 ** 3:.2f} GB, {cores} núcleos")
+
+        expected = None
+        if not args.skip_pipeline:
+            expected, elapsed = timed(run_pipeline, path)
+            print(f"pipeline (1 proceso, por bloques): {elapsed:8.2f} s")
+        baseline = None
+        for n in workers:
+            result, elapsed = timed(run_parallel, path, workers=n)
+            baseline = baseline or elapsed
+            print(f"paralelo, {n:>2} procesos:            {elapsed:8.2f} s  x{baseline / elapsed:.2f}")
+            if expected is not None:
+                pd.testing.assert_series_equal(result, expected)
+            expected = result
+
+
+if __name__ == "__main__":
+    main()
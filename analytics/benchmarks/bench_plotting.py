@@ -0,0 +1,74 @@
+"""
+Benchmark de dibujo de gráficas sin pantalla:
+ 1. Una serie temporal de millones de puntos: pyplot con todos los puntos (como
+    plot_time_series, guardando a PNG) frente a Renderer, que la reduce con LTTB.
+ 2. Un lote de gráficas: una figura de pyplot nueva por gráfica frente a un Renderer que
+    reutiliza su figura, y render_many con varios procesos.
+
+Uso (desde el directorio analytics):
+    python -m benchmarks.bench_plotting
+    python -m benchmarks.bench_plotting --points 10000000 --charts 500 --workers 1 2 4
+"""
+
+import argparse
+import io
+import os
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from src.plotting import Renderer, render_many
+
+
+def time_series(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "date": pd.date_range("2020-01-01", periods=rows, freq="s"),
+        "value": rng.normal(size=rows).cumsum(),
+    })
+
+
+def pyplot_png(df):
+    # Lo que hace plot_time_series, guardando la figura en lugar de mostrarla
+    figure = plt.figure(figsize=(8, 4.5), dpi=100)
+    plt.plot(df["date"], df["value"])
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="png")
+    plt.close(figure)
+    return buffer.getvalue()
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=5_000_000)
+    parser.add_argument("--charts", type=int, default=200)
+    parser.add_argument("--chart-points", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=None, help="por defecto 1, 2, 4... hasta los núcleos")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    series = time_series(args.points)
+    print(f"Serie de {args.points:,} puntos")
+    print(f"  pyplot, todos los puntos:  {timed(pyplot_png, series):8.2f} s")
+    print(f"  Renderer con LTTB:         {timed(Renderer().render, 'time_series', series):8.2f} s")
+
+    charts = [{"kind": "time_series", "df": time_series(args.chart_points, seed), "title": f"serie {seed}"}
+              for seed in range(args.charts)]
+    print(f"{args.charts} gráficas de {args.chart_points:,} puntos, {cores} núcleos")
+    print(f"  pyplot, figura por gráfica: {timed(lambda: [pyplot_png(c['df']) for c in charts]):8.2f} s")
+    for workers in args.workers or sorted({min(2 ** i, cores) for i in range(cores.bit_length() + 1)}):
+        print(f"  render_many, {workers:>2} procesos:  {timed(render_many, charts, workers=workers):8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
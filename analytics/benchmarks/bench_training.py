@@ -0,0 +1,62 @@
+"""
+Benchmark de entrenamiento en CPU (muestras/segundo) de train_model: la llamada anterior
+(model.fit con arrays en memoria y el lote por defecto de 32) frente a la entrada con tf.data
+desde disco (numpy_dataset con memmap y tfrecord_dataset) con varios tamaños de lote.
+
+Uso (desde el directorio analytics):
+    python -m benchmarks.bench_training
+    python -m benchmarks.bench_training --samples 200000 --features 64 --batch-sizes 256 1024
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1") # Solo CPU
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+
+import numpy as np
+
+from src.machine_learning import build_model, numpy_dataset, save_arrays, tfrecord_dataset, write_tfrecords
+
+
+def samples_per_second(fit, samples, epochs):
+    # La primera época (trazado del grafo, búferes en frío) no se mide
+    model = build_model()
+    fit(model, 1)
+    start = time.perf_counter()
+    fit(model, epochs)
+    return samples * epochs / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=100_000)
+    parser.add_argument("--features", type=int, default=32)
+    parser.add_argument("--epochs", type=int, default=2)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[32, 256, 1024])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    X = rng.random((args.samples, args.features), dtype=np.float32)
+    y = rng.integers(0, 10, args.samples).astype(np.int32)
+    print(f"{args.samples:,} muestras, {args.features} características, {os.cpu_count()} núcleos")
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = save_arrays(directory, X, y)
+        record = write_tfrecords(os.path.join(directory, "train.tfrecord"), X, y)
+        cases = {"model.fit(X, y) (anterior, lote 32)": lambda model, epochs: model.fit(X, y, epochs=epochs, verbose=0)}
+        for batch_size in args.batch_sizes:
+            memmap = numpy_dataset(*paths, batch_size=batch_size, seed=0)
+            records = tfrecord_dataset(record, args.features, batch_size=batch_size, seed=0)
+            cases[f"numpy_dataset (memmap), lote {batch_size}"] = \
+                lambda model, epochs, data=memmap: model.fit(data, epochs=epochs, verbose=0, shuffle=False)
+            cases[f"tfrecord_dataset, lote {batch_size}"] = \
+                lambda model, epochs, data=records: model.fit(data, epochs=epochs, verbose=0, shuffle=False)
+        for name, fit in cases.items():
+            print(f"{name:<40} {samples_per_second(fit, args.samples, args.epochs):12,.0f} muestras/s")
+
+
+if __name__ == "__main__":
+    main()
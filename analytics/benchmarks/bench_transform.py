@@ -0,0 +1,64 @@
+"""
+Benchmark de transform_data sobre 10M filas con fechas muy repetidas: la versión anterior
+(pd.to_datetime sin formato + .dt.year sobre todas las filas, modificando el DataFrame) frente
+a la conversión de cada fecha distinta una sola vez, con el formato detectado o explícito,
+con y sin copia del DataFrame, y con varios campos de calendario.
+
+Uso (desde el directorio analytics):
+    python -m benchmarks.bench_transform
+    python -m benchmarks.bench_transform --rows 1000000 --distinct 36500
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.data_processing import transform_data
+
+
+def previous_transform(df):
+    df['date'] = pd.to_datetime(df['date'])
+    df['year'] = df['date'].dt.year
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--distinct", type=int, default=1_500, help="fechas distintas (días)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2020-01-01", periods=args.distinct).strftime("%Y-%m-%d").to_numpy(dtype=object)
+    df = pd.DataFrame({
+        "date": dates[rng.integers(0, len(dates), args.rows)],
+        "category": np.array(list("ABCDEFGH"), dtype=object)[rng.integers(0, 8, args.rows)],
+        "value": rng.random(args.rows),
+    })
+    print(f"{args.rows:,} filas, {args.distinct:,} fechas distintas")
+
+    cases = {
+        "to_datetime + .dt.year (anterior)": lambda frame: previous_transform(frame.copy()),
+        "fechas distintas, formato detectado": lambda frame: transform_data(frame),
+        "fechas distintas, formato explícito": lambda frame: transform_data(frame, date_format="%Y-%m-%d"),
+        "fechas distintas, inplace (sobre copia)": lambda frame: transform_data(frame.copy(), inplace=True),
+        "year, month, dayofweek, week": lambda frame: transform_data(frame, fields=("year", "month", "dayofweek", "week")),
+    }
+    expected = None
+    for name, case in cases.items():
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = case(df)
+            times.append(time.perf_counter() - start)
+        if expected is None:
+            expected = result
+        pd.testing.assert_series_equal(result["year"], expected["year"])
+        print(f"{name:<42} {min(times) * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import configparser
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from .config import DEFAULT_CONFIG_PATH
+
+# Caché local de modelos entrenados. Cada modelo se guarda una vez con su huella de contenido
+# (arquitectura y pesos) como nombre, models/<huella>.keras, de modo que la huella identifica
+# una versión concreta. Cada entrenamiento se registra en runs/<clave>.json con una clave
+# hecha de la huella de los datos de entrenamiento, los hiperparámetros y la arquitectura. Si
+# se repite un entrenamiento idéntico, se carga el modelo guardado en lugar de entrenarlo.
+# TensorFlow solo se importa para guardar o cargar un modelo.
+
+# Filas por bloque al calcular la huella de arrays (los memmap no se leen enteros en memoria)
+FINGERPRINT_BLOCK_ROWS = 1 << 16
+
+
+def fingerprint_arrays(*arrays):
+    """Huella (hex) del tipo, la forma y el contenido de uno o varios arrays (o memmap)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        array = np.asarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        if array.ndim == 0:
+            digest.update(array.tobytes())
+            continue
+        for start in range(0, len(array), FINGERPRINT_BLOCK_ROWS):
+            digest.update(np.ascontiguousarray(array[start:start + FINGERPRINT_BLOCK_ROWS]).data)
+    return digest.hexdigest()
+
+
+def fingerprint_files(*paths):
+    """Huella (hex) del contenido de uno o varios ficheros (p. ej. los .npy o TFRecord de entrenamiento)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for path in paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _architecture(model):
+    # Configuración del modelo sin los nombres que Keras numera en cada construcción (dense_3...)
+    def strip(value):
+        if isinstance(value, dict):
+            return {k: strip(v) for k, v in value.items() if k != "name"}
+        if isinstance(value, list):
+            return [strip(v) for v in value]
+        return value
+    return json.dumps(strip(json.loads(model.to_json())), sort_keys=True)
+
+
+def model_digest(model):
+    """Huella de contenido de un modelo: arquitectura y pesos."""
+    digest = hashlib.sha256(_architecture(model).encode())
+    for weights in model.get_weights():
+        digest.update(np.ascontiguousarray(weights).data)
+    return digest.hexdigest()
+
+
+def training_key(data_fingerprint, model, **hyperparameters):
+    """Clave de un entrenamiento: huella de los datos, arquitectura de `model` e hiperparámetros."""
+    run = {"data": data_fingerprint, "architecture": _architecture(model), "hyperparameters": hyperparameters}
+    return hashlib.sha256(json.dumps(run, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class ArtifactCache:
+    """
+    Modelos guardados en `directory` (models/<huella>.keras) y registro de entrenamientos
+    (runs/<clave>.json). Cada load lee el modelo del disco y devuelve un objeto nuevo, así que
+    seguir entrenando el modelo devuelto no cambia la versión guardada.
+    """
+
+    def __init__(self, directory):
+        self.directory = str(directory)
+        os.makedirs(os.path.join(self.directory, "models"), exist_ok=True)
+        os.makedirs(os.path.join(self.directory, "runs"), exist_ok=True)
+
+    def path(self, digest):
+        return os.path.join(self.directory, "models", f"{digest}.keras")
+
+    def save(self, model):
+        """Guarda el modelo (si esa versión no estaba ya) y devuelve su huella."""
+        digest = model_digest(model)
+        path = self.path(digest)
+        if not os.path.exists(path):
+            temporary = os.path.join(self.directory, "models", f"{digest}.{os.getpid()}.tmp.keras")
+            model.save(temporary)
+            os.replace(temporary, path)
+        return digest
+
+    def load(self, digest):
+        """Modelo nuevo de la versión `digest`, leído del disco (KeyError si no está en la caché)."""
+        if not os.path.exists(self.path(digest)):
+            raise KeyError(digest)
+        import tensorflow as tf
+        return tf.keras.models.load_model(self.path(digest))
+
+    def lookup(self, key):
+        """Huella del modelo del entrenamiento `key`, o None si no se ha hecho (o se borró el modelo)."""
+        path = os.path.join(self.directory, "runs", f"{key}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            digest = json.load(f)["model"]
+        return digest if os.path.exists(self.path(digest)) else None
+
+    def record(self, key, digest, **metadata):
+        """Registra que el entrenamiento `key` produjo el modelo `digest`."""
+        path = os.path.join(self.directory, "runs", f"{key}.json")
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as f:
+            json.dump({"model": digest, **metadata}, f, default=str)
+        os.replace(temporary, path)
+
+
+def cache_from_config(path=DEFAULT_CONFIG_PATH):
+    # Caché de la sección [models], cache_dir (None si no está configurada)
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    directory = parser.get("models", "cache_dir", fallback="")
+    return ArtifactCache(directory) if directory else None
@@ -0,0 +1,5 @@
+import os
+
+# Ruta de config/config.ini, en un módulo sin dependencias para que leer la configuración no
+# obligue a importar pandas (pipeline) ni TensorFlow
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "config.ini")
@@ -1,15 +1,53 @@
-import pandas as pd
+# pandas se importa en las funciones que lo usan (tarda ~0.3 s), no al importar el módulo
 
-def clean_data(df):
-    # Elimina valores nulos y duplicados
+# Campos de calendario que puede añadir transform_data (a partir de la columna 'date')
+CALENDAR_FIELDS = {
+    'year': lambda dates: dates.dt.year,
+    'quarter': lambda dates: dates.dt.quarter,
+    'month': lambda dates: dates.dt.month,
+    'day': lambda dates: dates.dt.day,
+    'dayofweek': lambda dates: dates.dt.dayofweek,
+    'dayofyear': lambda dates: dates.dt.dayofyear,
+    'week': lambda dates: dates.dt.isocalendar().week,
+}
+
+def clean_data(df, deduplicate=None):
+    # Elimina valores nulos y duplicados. Con `deduplicate` (p. ej. dedup.Deduplicator) los
+    # duplicados se eliminan también respecto a los bloques procesados antes
     df = df.dropna()
-    df = df.drop_duplicates()
+    df = df.drop_duplicates() if deduplicate is None else deduplicate(df)
     return df
 
-def transform_data(df):
-    # Cambia el formato de las columnas y crea nuevas columnas
-    df['date'] = pd.to_datetime(df['date'])
-    df['year'] = df['date'].dt.year
+def infer_date_format(values):
+    # Formato strftime de las fechas, detectado una vez con el primer valor no nulo (None si no se reconoce)
+    from pandas.tseries.api import guess_datetime_format
+    first = values.dropna()
+    return guess_datetime_format(str(first.iloc[0])) if len(first) else None
+
+def parse_dates(values, date_format=None):
+    # Convierte una Serie de cadenas a fechas convirtiendo cada cadena distinta una sola vez
+    # (los datos repiten mucho las fechas). Devuelve (códigos, fechas distintas): la fecha de la
+    # fila i es la distinta codes[i] (-1 para nulos)
+    import pandas as pd
+    codes, uniques = pd.factorize(values)
+    if date_format is None and not pd.api.types.is_datetime64_any_dtype(uniques):
+        date_format = infer_date_format(pd.Series(uniques))
+    return codes, pd.Series(pd.to_datetime(uniques, format=date_format))
+
+def transform_data(df, date_format=None, fields=('year',), inplace=False):
+    # Cambia el formato de las columnas y crea nuevas columnas: 'date' pasa a fecha (con
+    # `date_format` o con el formato detectado una vez) y se añaden los campos de calendario
+    # `fields` (ver CALENDAR_FIELDS), calculados sobre las fechas distintas. Sin `inplace` el
+    # DataFrame recibido no se modifica; con `inplace=True` se añaden las columnas sin copiarlo
+    from pandas.api.extensions import take
+    codes, dates = parse_dates(df['date'], date_format)
+    columns = {'date': take(dates.array, codes, allow_fill=True)}
+    for field in fields:
+        columns[field] = take(CALENDAR_FIELDS[field](dates).array, codes, allow_fill=True)
+    if not inplace:
+        return df.assign(**columns)
+    for name, values in columns.items():
+        df[name] = values
     return df
 
 def aggregate_data(df):
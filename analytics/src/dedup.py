@@ -0,0 +1,386 @@
+import configparser
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from .config import DEFAULT_CONFIG_PATH
+
+# Deduplicación global de filas sobre un flujo de bloques (drop_duplicates sobre todos los
+# ficheros y bloques, no solo dentro de cada uno) con memoria acotada:
+#  - cada fila se reduce a una huella de 128 bits (dos hashes de 64 bits independientes);
+#  - las huellas ya vistas se guardan en tramos ordenados de arrays uint64 (16 bytes por fila
+#    única) y se buscan con searchsorted, sin objetos de Python por fila; un filtro de Bloom
+#    (~10 bits por huella) descarta antes las que seguro no se han visto;
+#  - con un límite de huellas en memoria, los tramos se vuelcan a disco (.npy con memmap) y en
+#    memoria solo quedan sus filtros de Bloom, de modo que casi nunca se lee del disco.
+# Dos filas distintas solo se confundirían si coinciden sus 128 bits (probabilidad del orden
+# de n²/2¹²⁹, ~4e-24 con mil millones de filas únicas).
+
+# Bytes por huella en memoria (hi y lo, uint64)
+KEY_BYTES = 16
+
+# Claves de SipHash (16 caracteres) de los valores de texto de cada mitad de la huella y
+# semillas/multiplicadores distintos para combinar las columnas
+_HASH_KEYS = ("0123456789123456", "alphapp-dedup-lo")
+_SEEDS = (np.uint64(0x243F6A8885A308D3), np.uint64(0x13198A2E03707344))
+_MULTIPLIERS = (np.uint64(0x9E3779B97F4A7C15), np.uint64(0xC2B2AE3D27D4EB4F))
+# Hash de los nulos de columnas de texto (como en pandas, distinto del de cualquier cadena)
+_NULL_HASH = np.uint64(np.iinfo(np.uint64).max)
+
+
+def _mix64(x):
+    # Finalizador de splitmix64 (biyectivo) para repartir los bits de la combinación de columnas
+    x = x ^ (x >> np.uint64(30))
+    x = x * np.uint64(0xBF58476D1CE4E5B9)
+    x = x ^ (x >> np.uint64(27))
+    x = x * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _column_hashes(column):
+    # Hashes de 64 bits de los valores de una columna con cada clave. Las columnas de texto se
+    # factorizan una sola vez y solo se hashean los valores únicos
+    if not (pd.api.types.is_numeric_dtype(column.dtype) or pd.api.types.is_datetime64_any_dtype(column.dtype)):
+        codes, uniques = pd.factorize(column)
+        uniques = np.asarray(uniques, dtype=object)
+        if pd.api.types.infer_dtype(uniques, skipna=False) != "string":
+            # Valores que no son texto: con el tipo delante, 1 y "1" no tienen el mismo hash
+            uniques = np.array([f"{type(value).__name__}:{value}" for value in uniques], dtype=object)
+        for key in _HASH_KEYS:
+            table = np.append(pd.util.hash_array(uniques, hash_key=key, categorize=False), _NULL_HASH)
+            yield table[codes] # El código -1 (nulo) toma el último elemento
+        return
+    values = column.to_numpy()
+    if values.dtype.kind == "f":
+        values = values + 0.0 # -0.0 y 0.0 son iguales para drop_duplicates
+    column_hash = pd.util.hash_array(values, categorize=False)
+    yield column_hash
+    yield column_hash
+
+
+def row_fingerprints(df):
+    """
+    Huella de 128 bits de cada fila como dos arrays uint64 (hi, lo): cada mitad combina
+    hashes por columna con su propia clave, semilla y multiplicador, de modo que una
+    colisión de `hi` no implica una de `lo`.
+    """
+    hashes = [np.full(len(df), seed, dtype=np.uint64) for seed in _SEEDS]
+    with np.errstate(over="ignore"):
+        for _, column in df.items():
+            for i, column_hash in enumerate(_column_hashes(column)):
+                hashes[i] = _mix64(hashes[i] * _MULTIPLIERS[i] + column_hash)
+    return hashes[0], hashes[1]
+
+
+def first_occurrences(hi, lo):
+    """
+    Índices de la primera aparición de cada huella (hi, lo), ordenados por `hi`.
+    """
+    if not len(hi):
+        return np.arange(0)
+    # Ordenar solo por `hi` (sin estabilidad) es bastante más rápido que por (hi, lo); solo si dos
+    # huellas comparten `hi` con distinto `lo` (colisión de 64 bits) hace falta el orden completo
+    order = np.argsort(hi)
+    sorted_hi, sorted_lo = hi[order], lo[order]
+    same = sorted_hi[1:] == sorted_hi[:-1]
+    if np.any(same & (sorted_lo[1:] != sorted_lo[:-1])):
+        order = np.lexsort((lo, hi))
+        sorted_hi, sorted_lo = hi[order], lo[order]
+        same = (sorted_hi[1:] == sorted_hi[:-1]) & (sorted_lo[1:] == sorted_lo[:-1])
+    # La primera aparición de cada grupo de huellas iguales es su menor índice
+    starts = np.flatnonzero(np.concatenate(([True], ~same)))
+    return np.minimum.reduceat(order, starts)
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom por bloques sobre huellas (hi, lo): los `hashes` bits de cada huella caen en
+    una misma palabra de 64 bits (elegida con `hi`, bits tomados de `lo`), de modo que añadir y
+    consultar es un solo acceso a memoria por huella. Sin falsos negativos; ~2% de falsos
+    positivos con 10 bits por huella.
+    """
+
+    def __init__(self, capacity, bits_per_key=10):
+        self.hashes = min(10, max(1, round(bits_per_key * 0.693)))
+        self._words = np.zeros(max(1, -(-int(capacity * bits_per_key) // 64)), dtype=np.uint64)
+
+    @property
+    def nbytes(self):
+        return self._words.nbytes
+
+    def _locate(self, hi, lo):
+        mask = np.zeros(len(lo), dtype=np.uint64)
+        for i in range(self.hashes):
+            mask |= np.left_shift(np.uint64(1), (lo >> np.uint64(6 * i)) & np.uint64(63))
+        return hi % np.uint64(len(self._words)), mask
+
+    def add(self, hi, lo):
+        word, mask = self._locate(hi, lo)
+        np.bitwise_or.at(self._words, word, mask)
+
+    def might_contain(self, hi, lo):
+        word, mask = self._locate(hi, lo)
+        return self._words[word] & mask == mask
+
+
+class _Run:
+    # Tramo de huellas únicas ordenado por `hi`; en memoria o abierto con memmap desde disco
+    def __init__(self, keys, path=None, blooms=(), temporary=False):
+        self.keys = keys # array (2, n): fila 0 hi, fila 1 lo
+        self.path = path
+        self.blooms = blooms
+        self.temporary = temporary # Volcado al directorio temporal (se borra con close)
+        hi = keys[0]
+        self.collisions = bool(len(hi) > 1 and np.any(hi[1:] == hi[:-1]))
+
+    def __len__(self):
+        return self.keys.shape[1]
+
+    def contains(self, hi, lo):
+        run_hi, run_lo = self.keys[0], self.keys[1]
+        left = np.searchsorted(run_hi, hi, side="left")
+        at = np.minimum(left, len(self) - 1)
+        found = (left < len(self)) & (run_hi[at] == hi) & (run_lo[at] == lo)
+        if self.collisions:
+            # Varias huellas con el mismo `hi` en el tramo: se busca `lo` en todo el rango
+            right = np.searchsorted(run_hi, hi, side="right")
+            for i in np.flatnonzero(right - left > 1):
+                found[i] = bool(np.any(run_lo[left[i]:right[i]] == lo[i]))
+        return found
+
+
+def _merge(runs):
+    # Fusión de tramos ordenados por `hi`: el orden estable de numpy (timsort) detecta los
+    # tramos ya ordenados y los mezcla en tiempo lineal
+    keys = np.concatenate([run.keys for run in runs], axis=1)
+    return keys[:, np.argsort(keys[0], kind="stable")]
+
+
+class FingerprintSet:
+    """
+    Conjunto de huellas de 128 bits en tramos ordenados por `hi` (como un LSM): cada lote de huellas
+    nuevas es un tramo y cada `fanout` tramos de tamaño parecido se fusionan en uno, de modo que
+    hay O(log n) tramos y cada huella se reordena O(log n) veces. Un filtro de Bloom delante de los
+    tramos evita buscar en ellos las huellas que seguro no están (la mayoría: las filas nuevas).
+
+    Con `max_memory_keys`, al superarlo los tramos en memoria se fusionan y se vuelcan a un
+    fichero .npy en `spill_dir` (o en un directorio temporal), que se abre con memmap; solo se
+    leen del disco las huellas que pasan su filtro de Bloom. `close()` borra los ficheros.
+    """
+
+    # Capacidad del primer filtro de Bloom sin límite de memoria (cada filtro nuevo, el doble)
+    initial_bloom_capacity = 1 << 20
+    fanout = 4
+
+    def __init__(self, max_memory_keys=None, spill_dir=None, bloom_bits_per_key=10):
+        self.max_memory_keys = max_memory_keys
+        self.spill_dir = spill_dir
+        self.bloom_bits_per_key = bloom_bits_per_key
+        self._memory_runs = []
+        self._memory_blooms = [] # [filtro, capacidad libre] de las huellas en memoria
+        self._disk_runs = []
+        self._directory = None
+
+    def __len__(self):
+        return sum(len(run) for run in self._memory_runs + self._disk_runs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def memory_keys(self):
+        return sum(len(run) for run in self._memory_runs)
+
+    @property
+    def memory_bytes(self):
+        """Memoria ocupada: huellas en memoria y filtros de Bloom."""
+        blooms = [bloom for bloom, _ in self._memory_blooms] + [bloom for run in self._disk_runs for bloom in run.blooms]
+        return self.memory_keys * KEY_BYTES + sum(bloom.nbytes for bloom in blooms)
+
+    @property
+    def spilled_runs(self):
+        return len(self._disk_runs)
+
+    def contains(self, hi, lo):
+        """Máscara de las huellas (hi, lo) que ya están en el conjunto (más rápido con las consultas ordenadas)."""
+        found = np.zeros(len(hi), dtype=bool)
+        maybe = np.zeros(len(hi), dtype=bool)
+        for bloom, _ in self._memory_blooms:
+            maybe |= bloom.might_contain(hi, lo)
+        pending = np.flatnonzero(maybe)
+        for run in self._memory_runs:
+            found[pending] = run.contains(hi[pending], lo[pending])
+            pending = pending[~found[pending]]
+        pending = np.flatnonzero(~found)
+        for run in self._disk_runs:
+            maybe = np.zeros(len(pending), dtype=bool)
+            for bloom in run.blooms:
+                maybe |= bloom.might_contain(hi[pending], lo[pending])
+            candidates = pending[maybe]
+            found[candidates] = run.contains(hi[candidates], lo[candidates])
+            pending = pending[~found[pending]]
+        return found
+
+    def add(self, hi, lo, is_sorted=False):
+        """Añade huellas que no estén ya en el conjunto ni repetidas entre sí (`is_sorted`: ya ordenadas por hi)."""
+        if not len(hi):
+            return
+        keys = np.vstack([hi, lo])
+        if not is_sorted:
+            keys = keys[:, np.argsort(hi, kind="stable")]
+        # Se vuelca antes de añadir, de modo que los filtros de Bloom de memoria (con capacidad
+        # max_memory_keys) cubran justo el tramo volcado y pasen a él sin reconstruirlos
+        if self.max_memory_keys is not None and self._memory_runs and self.memory_keys + len(hi) > self.max_memory_keys:
+            self._spill()
+        self._add_to_blooms(hi, lo)
+        runs = self._memory_runs
+        runs.append(_Run(keys))
+        while len(runs) >= self.fanout and len(runs[-self.fanout]) < self.fanout * len(runs[-1]):
+            runs[-self.fanout:] = [_Run(_merge(runs[-self.fanout:]))]
+        if self.max_memory_keys is not None and self.memory_keys > self.max_memory_keys:
+            self._spill() # Un solo lote mayor que el límite
+
+    def _add_to_blooms(self, hi, lo):
+        # Filtros de Bloom escalables: al llenarse uno se crea otro (con el doble de capacidad si
+        # no hay límite de memoria) y se consultan todos
+        start = 0
+        while start < len(hi):
+            if not self._memory_blooms or self._memory_blooms[-1][1] == 0:
+                if self.max_memory_keys is not None:
+                    capacity = self.max_memory_keys
+                elif self._memory_blooms:
+                    capacity = 2 * (self._memory_blooms[-1][0].nbytes * 8 // self.bloom_bits_per_key)
+                else:
+                    capacity = self.initial_bloom_capacity
+                self._memory_blooms.append([BloomFilter(capacity, self.bloom_bits_per_key), capacity])
+            entry = self._memory_blooms[-1]
+            end = start + min(entry[1], len(hi) - start)
+            entry[0].add(hi[start:end], lo[start:end])
+            entry[1] -= end - start
+            start = end
+
+    def _spill(self):
+        if self._directory is None:
+            if self.spill_dir:
+                os.makedirs(self.spill_dir, exist_ok=True)
+            self._directory = tempfile.mkdtemp(prefix="dedup-", dir=self.spill_dir or None)
+        keys = _merge(self._memory_runs) if len(self._memory_runs) > 1 else self._memory_runs[0].keys
+        path = os.path.join(self._directory, f"run-{len(self._disk_runs):05d}.npy")
+        np.save(path, keys)
+        blooms = [bloom for bloom, _ in self._memory_blooms]
+        self._disk_runs.append(_Run(np.load(path, mmap_mode="r"), path=path, blooms=blooms, temporary=True))
+        self._memory_runs, self._memory_blooms = [], []
+
+    @property
+    def files(self):
+        """Ficheros de huellas propios (escritos con flush o añadidos con attach)."""
+        return [run.path for run in self._disk_runs if not run.temporary]
+
+    def attach(self, path):
+        """Añade el fichero de huellas `path` (escrito con flush) como tramo en disco abierto con memmap."""
+        keys = np.load(path, mmap_mode="r")
+        bloom = BloomFilter(keys.shape[1], self.bloom_bits_per_key)
+        bloom.add(keys[0], keys[1])
+        self._disk_runs.append(_Run(keys, path=path, blooms=[bloom]))
+
+    def flush(self, path, compact=False):
+        """
+        Escribe en `path` (.npy) las huellas que no están en un fichero propio (en memoria o
+        volcadas al directorio temporal), o todas con `compact`, y pasa a usar ese fichero en su
+        lugar. Devuelve False si no había nada que escribir. Los ficheros propios anteriores no
+        se borran: dejan de usarse y el llamador decide cuándo eliminarlos.
+        """
+        pending = self._memory_runs + [run for run in self._disk_runs if run.temporary]
+        if not pending:
+            return False
+        runs = self._memory_runs + self._disk_runs if compact else pending
+        np.save(path, _merge(runs) if len(runs) > 1 else runs[0].keys)
+        for run in runs:
+            if run.temporary:
+                os.remove(run.path)
+        self._disk_runs = [run for run in self._disk_runs if not any(run is other for other in runs)]
+        self._memory_runs, self._memory_blooms = [], []
+        self.attach(path)
+        return True
+
+    def close(self):
+        """Libera los tramos y borra los ficheros volcados a disco."""
+        self._memory_runs, self._memory_blooms, self._disk_runs = [], [], []
+        if self._directory is not None:
+            shutil.rmtree(self._directory, ignore_errors=True)
+            self._directory = None
+
+
+class Deduplicator:
+    """
+    Etapa de deduplicación global: cada llamada devuelve las filas del bloque que no han
+    aparecido antes (en el mismo bloque ni en los anteriores), conservando la primera aparición
+    y el orden, igual que drop_duplicates sobre la concatenación de todos los bloques.
+    Las columnas de todos los bloques deben tener los mismos tipos (ver pipeline.DTYPES).
+    """
+
+    def __init__(self, fingerprints=None, subset=None):
+        self.fingerprints = fingerprints if fingerprints is not None else FingerprintSet()
+        self.subset = subset
+        self.rows_seen = 0
+        self.rows_dropped = 0
+
+    def __call__(self, df, fingerprints=None):
+        # `fingerprints`: huellas (hi, lo) de las filas de df ya calculadas con row_fingerprints
+        if df.empty:
+            return df
+        hi, lo = fingerprints if fingerprints is not None else row_fingerprints(df if self.subset is None else df[self.subset])
+        candidates = first_occurrences(hi, lo) # Primera aparición en el bloque, ordenadas por `hi`
+        new = ~self.fingerprints.contains(hi[candidates], lo[candidates])
+        candidates = candidates[new]
+        self.fingerprints.add(hi[candidates], lo[candidates], is_sorted=True)
+        keep = np.zeros(len(df), dtype=bool)
+        keep[candidates] = True
+        self.rows_seen += len(df)
+        self.rows_dropped += len(df) - len(candidates)
+        return df[keep]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.fingerprints.close()
+
+    @property
+    def stats(self):
+        return {
+            "rows_seen": self.rows_seen,
+            "rows_dropped": self.rows_dropped,
+            "unique_rows": self.rows_seen - self.rows_dropped,
+            "memory_bytes": self.fingerprints.memory_bytes,
+            "spilled_runs": self.fingerprints.spilled_runs,
+        }
+
+
+def load_dedup_settings(path=DEFAULT_CONFIG_PATH):
+    """
+    Límite de huellas en memoria y directorio de volcado de la sección [processing]
+    (dedup_memory_mb y spill_dir) como argumentos de FingerprintSet; sin límite configurado,
+    todas las huellas se quedan en memoria.
+    """
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    max_memory_keys = None
+    if parser.has_option("processing", "dedup_memory_mb"):
+        max_memory_keys = parser.getint("processing", "dedup_memory_mb") * 1024 * 1024 // KEY_BYTES
+    spill_dir = parser.get("processing", "spill_dir", fallback="") or None
+    return {"max_memory_keys": max_memory_keys, "spill_dir": spill_dir}
+
+
+def deduplicator_from_config(path=DEFAULT_CONFIG_PATH):
+    """Deduplicador con el límite de memoria y el directorio de volcado de config.ini."""
+    return Deduplicator(FingerprintSet(**load_dedup_settings(path)))
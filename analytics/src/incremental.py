@@ -0,0 +1,249 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .data_processing import CALENDAR_FIELDS, clean_data, infer_date_format, transform_data
+from .dedup import Deduplicator, FingerprintSet, load_dedup_settings
+from .pipeline import estimate_chunk_rows, finalize_mean, load_memory_budget, read_chunks
+
+# Agregación incremental para datos que solo crecen: en lugar de recalcular
+#     aggregate_data(transform_data(clean_data(df)))
+# sobre todos los eventos, se guarda en disco un estado por grupo (recuento y suma, y si se
+# piden, media y M2 para la varianza, mínimo y máximo, y un DDSketch para cuantiles
+# aproximados) que se combina con cada lote nuevo. Los lotes ya ingeridos se reconocen por su
+# identificador, y las huellas de las filas vistas se guardan también, de modo que un duplicado
+# de una fila de un lote anterior se descarta igual que en el cálculo completo.
+#
+# Cada ingesta escribe ficheros nuevos (state-<versión>.parquet...) y después reemplaza de forma
+# atómica state.json, que indica qué ficheros forman el estado: un fallo a mitad deja el estado
+# anterior intacto.
+
+STATE_FILE = "state.json"
+
+_FILE_PREFIXES = ("state-", "sketch-", "fingerprints-")
+
+
+def _sketch_buckets(values, relative_accuracy):
+    # Cubo de DDSketch de cada valor, identificado por su representante: con
+    # gamma = (1 + a) / (1 - a), el cubo k cubre (gamma^(k-1), gamma^k] y su representante
+    # 2·gamma^k / (gamma + 1) está a un error relativo de como mucho `a` de cualquier valor del cubo
+    gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+    magnitude = np.abs(values)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k = np.ceil(np.log(magnitude) / np.log(gamma))
+        return np.where(magnitude > 0, np.sign(values) * 2 * gamma ** k / (gamma + 1), 0.0)
+
+
+def _merge_states(left, right, variance, extremes):
+    # Combina dos estados por grupo; la media y M2 con la fórmula de Chan et al.
+    if left is None:
+        return right
+    index = left.index.union(right.index)
+    a, b = left.reindex(index), right.reindex(index)
+    count_a, count_b = a["count"].fillna(0), b["count"].fillna(0)
+    merged = pd.DataFrame({"count": (count_a + count_b).astype("int64"),
+                           "sum": a["sum"].fillna(0) + b["sum"].fillna(0)}, index=index)
+    if variance:
+        mean_a, mean_b = a["mean"].fillna(0), b["mean"].fillna(0)
+        delta = mean_b - mean_a
+        merged["mean"] = mean_a + delta * count_b / merged["count"]
+        merged["m2"] = a["m2"].fillna(0) + b["m2"].fillna(0) + delta ** 2 * count_a * count_b / merged["count"]
+    if extremes:
+        merged["min"] = np.fmin(a["min"], b["min"])
+        merged["max"] = np.fmax(a["max"], b["max"])
+    return merged
+
+
+class IncrementalAggregator:
+    """
+    Agregado de `column` por `by` (columnas de los datos o campos de calendario de transform_data,
+    p. ej. ('category', 'year')) con el estado en `directory`. Al abrirlo se carga el estado
+    anterior, que debe tener la misma configuración (ValueError si no).
+
+    - ingest(df, batch_id): añade un lote de eventos sin limpiar (False si ya se ingirió).
+    - ingest_files(paths): añade cada fichero CSV/Parquet nuevo o modificado como un lote.
+    - mean(): con by=('category',), la misma Serie que aggregate_data sobre todos los lotes.
+    - result(): count, mean y, según la configuración, var, min, max y cuantiles por grupo.
+
+    Con deduplicate=False no se guardan huellas y los duplicados solo se eliminan dentro de cada
+    lote (igual al cálculo completo solo si los lotes no comparten filas).
+    """
+
+    # Ficheros de huellas a partir de los que se fusionan en uno al ingerir
+    max_fingerprint_files = 8
+
+    def __init__(self, directory, by=("category",), column="value", variance=False, extremes=False,
+                 quantiles=(), relative_accuracy=0.01, deduplicate=True, date_format=None):
+        self.directory = directory
+        self.by = tuple(by)
+        self.column = column
+        self.variance = variance
+        self.extremes = extremes
+        self.quantiles = tuple(quantiles)
+        self.relative_accuracy = relative_accuracy
+        self.date_format = date_format
+        self._fields = tuple(field for field in self.by if field in CALENDAR_FIELDS)
+        self._deduplicator = Deduplicator(FingerprintSet(**load_dedup_settings())) if deduplicate else None
+        self._state = None
+        self._sketch = None
+        self._version = 0
+        self._batches = []
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._deduplicator is not None:
+            self._deduplicator.close()
+
+    @property
+    def config(self):
+        return {"by": list(self.by), "column": self.column, "variance": self.variance, "extremes": self.extremes,
+                "quantiles": list(self.quantiles), "relative_accuracy": self.relative_accuracy,
+                "deduplicate": self._deduplicator is not None}
+
+    @property
+    def batches(self):
+        return list(self._batches)
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _load(self):
+        path = self._path(STATE_FILE)
+        if not os.path.exists(path):
+            self._remove_unreferenced({})
+            return
+        with open(path) as f:
+            meta = json.load(f)
+        if meta["config"] != self.config:
+            raise ValueError(f"El estado de {self.directory} se creó con otra configuración: {meta['config']}")
+        self._version, self._batches = meta["version"], meta["batches"]
+        self.date_format = self.date_format or meta.get("date_format")
+        files = meta["files"]
+        if "state" in files:
+            self._state = pd.read_parquet(self._path(files["state"]))
+        if "sketch" in files:
+            self._sketch = pd.read_parquet(self._path(files["sketch"]))["count"]
+        for name in files.get("fingerprints", []):
+            self._deduplicator.fingerprints.attach(self._path(name))
+        self._remove_unreferenced(files)
+
+    def _remove_unreferenced(self, files):
+        # Ficheros de versiones anteriores o de una ingesta que falló antes de reemplazar state.json
+        referenced = {files.get("state"), files.get("sketch"), *files.get("fingerprints", [])}
+        for name in os.listdir(self.directory):
+            if name.startswith(_FILE_PREFIXES) and name not in referenced:
+                os.remove(self._path(name))
+
+    def _update(self, df):
+        # Limpia, transforma y combina un bloque con el estado en memoria (sin guardarlo)
+        chunk = clean_data(df, self._deduplicator)
+        if chunk.empty:
+            return
+        self.date_format = self.date_format or infer_date_format(chunk["date"])
+        chunk = transform_data(chunk, self.date_format, fields=self._fields)
+        grouped = chunk.groupby(list(self.by))[self.column]
+        state = grouped.agg(["count", "sum"])
+        if self.variance:
+            state["mean"] = grouped.mean()
+            state["m2"] = grouped.var(ddof=0) * state["count"]
+        if self.extremes:
+            state["min"] = grouped.min()
+            state["max"] = grouped.max()
+        self._state = _merge_states(self._state, state, self.variance, self.extremes)
+        if self.quantiles:
+            buckets = _sketch_buckets(chunk[self.column].to_numpy(dtype="float64"), self.relative_accuracy)
+            sketch = chunk[list(self.by)].assign(bucket=buckets).groupby(list(self.by) + ["bucket"]).size()
+            if self._sketch is not None:
+                sketch = pd.concat([self._sketch, sketch]).groupby(level=list(range(sketch.index.nlevels))).sum()
+            self._sketch = sketch.rename("count")
+
+    def _commit(self, batch_id):
+        version = self._version + 1
+        files = {}
+        if self._state is not None:
+            files["state"] = f"state-{version:06d}.parquet"
+            self._state.to_parquet(self._path(files["state"]))
+        if self._sketch is not None:
+            files["sketch"] = f"sketch-{version:06d}.parquet"
+            self._sketch.to_frame().to_parquet(self._path(files["sketch"]))
+        if self._deduplicator is not None:
+            fingerprints = self._deduplicator.fingerprints
+            compact = len(fingerprints.files) >= self.max_fingerprint_files
+            fingerprints.flush(self._path(f"fingerprints-{version:06d}.npy"), compact=compact)
+            files["fingerprints"] = [os.path.basename(path) for path in fingerprints.files]
+        batches = self._batches + ([batch_id] if batch_id is not None else [])
+        meta = {"config": self.config, "version": version, "batches": batches,
+                "date_format": self.date_format, "files": files}
+        temporary = self._path(STATE_FILE + ".tmp")
+        with open(temporary, "w") as f:
+            json.dump(meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self._path(STATE_FILE))
+        self._version, self._batches = version, batches
+        self._remove_unreferenced(files)
+
+    def ingest(self, df, batch_id=None):
+        """Añade un lote de eventos (sin limpiar) y guarda el estado. False si `batch_id` ya se ingirió."""
+        if batch_id is not None and batch_id in self._batches:
+            return False
+        self._update(df)
+        self._commit(batch_id)
+        return True
+
+    def ingest_files(self, paths, chunk_rows=None):
+        """
+        Ingiere como un lote cada fichero CSV/Parquet que no se haya ingerido ya (identificado por
+        ruta, tamaño y fecha de modificación), leyéndolo por bloques. Devuelve los ficheros ingeridos.
+        """
+        if isinstance(paths, (str, os.PathLike)):
+            paths = [paths]
+        ingested = []
+        for path in paths:
+            stat = os.stat(path)
+            batch_id = f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+            if batch_id in self._batches:
+                continue
+            rows = chunk_rows or estimate_chunk_rows(path, load_memory_budget())
+            for chunk in read_chunks(path, rows):
+                self._update(chunk)
+            self._commit(batch_id)
+            ingested.append(path)
+        return ingested
+
+    def mean(self):
+        """Media de `column` por grupo (misma forma que aggregate_data)."""
+        return finalize_mean(self._state, self.column)
+
+    def quantile(self, q):
+        """Cuantil `q` aproximado por grupo (error relativo <= relative_accuracy; rango inferior, como interpolation='lower')."""
+        if not self.quantiles:
+            raise ValueError("El agregador no guarda cuantiles (quantiles=())")
+        by = list(self.by)
+        sketch = self._sketch.reset_index().sort_values(by + ["bucket"])
+        grouped = sketch.groupby(by)["count"]
+        rank = np.floor(q * (grouped.transform("sum") - 1))
+        return sketch[grouped.cumsum() > rank].groupby(by)["bucket"].first().rename(f"q{q:g}")
+
+    def result(self):
+        """count y mean por grupo y, según la configuración, var (muestral), min, max y q<cuantil>."""
+        if self._state is None:
+            return pd.DataFrame(columns=["count", "mean"])
+        state = self._state.sort_index()
+        result = pd.DataFrame({"count": state["count"], "mean": state["sum"] / state["count"]})
+        if self.variance:
+            result["var"] = (state["m2"] / (state["count"] - 1)).where(state["count"] > 1)
+        if self.extremes:
+            result["min"], result["max"] = state["min"], state["max"]
+        for q in self.quantiles:
+            result[f"q{q:g}"] = self.quantile(q)
+        return result
@@ -0,0 +1,183 @@
+import configparser
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+
+from .config import DEFAULT_CONFIG_PATH
+
+# Inferencia por lotes en CPU para los modelos de machine_learning.py: las peticiones de una
+# fila que llegan a la vez desde varios hilos se agrupan en un lote (hasta max_batch_size
+# filas o hasta que la más antigua lleva max_wait_ms esperando) y cada lote se calcula con una
+# sola llamada al modelo en un pool de hilos. Una llamada por lote amortiza el coste fijo de
+# cada llamada (mucho mayor que el de una fila) y aprovecha las operaciones vectorizadas.
+# TensorFlow se importa al configurar los hilos o crear el primer BatchPredictor.
+
+# Latencias recientes que se guardan para los percentiles de metrics()
+LATENCY_WINDOW = 10_000
+
+
+def load_inference_settings(path=DEFAULT_CONFIG_PATH):
+    """Sección [inference] de config.ini como argumentos de BatchPredictor y configure_threads."""
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    return {
+        "max_batch_size": parser.getint("inference", "max_batch_size", fallback=64),
+        "max_wait_ms": parser.getfloat("inference", "max_wait_ms", fallback=2.0),
+        "workers": parser.getint("inference", "workers", fallback=1),
+        "intra_op_threads": parser.getint("inference", "intra_op_threads", fallback=0),
+        "inter_op_threads": parser.getint("inference", "inter_op_threads", fallback=0),
+    }
+
+
+def configure_threads(intra_op_threads=0, inter_op_threads=0):
+    """
+    Hilos de TensorFlow dentro de una operación (intra) y entre operaciones independientes
+    (inter); 0 deja el valor por defecto (todos los núcleos). Solo tiene efecto antes de la
+    primera operación de TensorFlow del proceso: devuelve False si ya es tarde.
+    """
+    import tensorflow as tf
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+        tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+    except RuntimeError:
+        return False
+    return True
+
+
+def load_model(path):
+    """Carga un modelo guardado (model.save) para inferencia."""
+    import tensorflow as tf
+    return tf.keras.models.load_model(path, compile=False)
+
+
+class BatchPredictor:
+    """
+    Predicciones de `model` para peticiones de una fila desde cualquier número de hilos:
+    predict(row) bloquea hasta tener la salida de esa fila y submit(row) devuelve un Future.
+    metrics() da peticiones, lotes, tamaño medio de lote, throughput, latencias (p50/p95/p99) y
+    peticiones fallidas.
+    """
+
+    def __init__(self, model, max_batch_size=64, max_wait_ms=2.0, workers=1):
+        import tensorflow as tf
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        # Grafo compilado: evita el coste por llamada de model.predict (bucle de Keras, callbacks)
+        self._call = tf.function(lambda x: model(x, training=False), reduce_retracing=True)
+        self._queue = queue.Queue()
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="inference")
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._requests = 0
+        self._batches = 0
+        self._errors = 0 # Peticiones de lotes en los que falló el modelo
+        self._started = time.perf_counter()
+        self._closed = False
+        self._collector = threading.Thread(target=self._collect, name="inference-batcher", daemon=True)
+        self._collector.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def submit(self, row):
+        """Encola una fila (array de características) y devuelve un Future con su predicción."""
+        row = np.asarray(row, dtype=np.float32)
+        future = Future()
+        # Comprobación y encolado atómicos respecto a close: nada se encola detrás del centinela
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BatchPredictor cerrado")
+            self._queue.put((row, future, time.perf_counter()))
+        return future
+
+    def predict(self, row, timeout=None):
+        """Predicción de una fila (bloquea hasta que se calcula su lote)."""
+        return self.submit(row).result(timeout)
+
+    def _collect(self):
+        # Agrupa las peticiones: espera la primera y añade las que lleguen hasta completar el
+        # lote o hasta que la primera lleve max_wait esperando
+        while True:
+            request = self._queue.get()
+            if request is None:
+                return
+            batch = [request]
+            deadline = request[2] + self.max_wait
+            while len(batch) < self.max_batch_size:
+                try:
+                    request = self._queue.get(timeout=max(0.0, deadline - time.perf_counter()))
+                except queue.Empty:
+                    break
+                if request is None:
+                    self._executor.submit(self._run, batch)
+                    return
+                batch.append(request)
+            self._executor.submit(self._run, batch)
+
+    def _run(self, batch):
+        rows, futures, submitted = zip(*batch)
+        try:
+            outputs = self._call(np.stack(rows)).numpy()
+        except Exception as error:
+            for future in futures:
+                future.set_exception(error)
+            with self._lock:
+                self._errors += len(batch)
+            return
+        done = time.perf_counter()
+        for future, output in zip(futures, outputs):
+            future.set_result(output)
+        with self._lock:
+            self._requests += len(batch)
+            self._batches += 1
+            self._latencies.extend(done - start for start in submitted)
+
+    def metrics(self):
+        """Métricas desde la creación: latencias en ms (de las últimas LATENCY_WINDOW peticiones) y peticiones/s."""
+        with self._lock:
+            latencies = np.array(self._latencies) * 1000
+            requests, batches, errors = self._requests, self._batches, self._errors
+        elapsed = time.perf_counter() - self._started
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (np.nan,) * 3
+        return {
+            "requests": requests,
+            "batches": batches,
+            "mean_batch_size": requests / batches if batches else 0.0,
+            "throughput": requests / elapsed if elapsed > 0 else 0.0,
+            "latency_p50_ms": float(p50),
+            "latency_p95_ms": float(p95),
+            "latency_p99_ms": float(p99),
+            "errors": errors,
+        }
+
+    def close(self):
+        """Termina las peticiones pendientes y para los hilos."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._collector.join()
+        self._executor.shutdown(wait=True)
+        # Ninguna petición debería quedar en la cola tras el centinela; si quedara, su Future falla
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is not None:
+                request[1].set_exception(RuntimeError("BatchPredictor cerrado"))
+
+
+def predictor_from_config(model_path, path=DEFAULT_CONFIG_PATH):
+    """Carga el modelo una vez y crea su BatchPredictor con la sección [inference] de config.ini."""
+    settings = load_inference_settings(path)
+    configure_threads(settings.pop("intra_op_threads"), settings.pop("inter_op_threads"))
+    return BatchPredictor(load_model(model_path), **settings)
@@ -0,0 +1,137 @@
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from .data_processing import infer_date_format
+
+# Lectura y escritura de datos en columnas (Parquet y Arrow IPC) para las funciones de
+# data_processing.py: se leen solo las columnas que usan ('date', 'category', 'value') y los
+# filtros por rango de fechas y por categoría se aplican al leer, de modo que Arrow descarta
+# particiones y grupos de filas enteros con sus estadísticas (mínimo y máximo por columna) sin
+# leerlos. Los ficheros Arrow IPC (.arrow, .feather, .ipc) se abren con memmap, sin copiarlos.
+
+# Columnas que usan clean_data, transform_data y aggregate_data
+COLUMNS = ("date", "category", "value")
+
+# Filas por grupo al escribir: grupos pequeños permiten descartar más al filtrar por fecha
+ROW_GROUP_ROWS = 128 * 1024
+
+_IPC_SUFFIXES = (".arrow", ".feather", ".ipc")
+
+# Formatos de fecha en texto que se ordenan igual que las fechas (necesario para filtrar por rango)
+_SORTABLE_DATE_FORMATS = ("%Y-%m-%d", "%Y/%m/%d", "%Y%m%d")
+
+# Filas de la columna 'date' que se leen para detectar el formato de las fechas en texto
+DATE_SAMPLE_ROWS = 1_000
+
+
+def open_dataset(source):
+    """
+    Dataset de Arrow de un fichero o directorio Parquet (con particiones hive, p. ej. category=A/),
+    una lista de ficheros Parquet o un fichero Arrow IPC, que se abre con memmap.
+    """
+    if isinstance(source, (str, os.PathLike)) and str(source).endswith(_IPC_SUFFIXES):
+        return ds.dataset(pa.ipc.open_file(pa.memory_map(str(source))).read_all())
+    if isinstance(source, (list, tuple)):
+        source = [str(path) for path in source]
+    else:
+        source = str(source)
+    return ds.dataset(source, format="parquet", partitioning="hive")
+
+
+def _is_text(field_type):
+    return pa.types.is_string(field_type) or pa.types.is_large_string(field_type)
+
+
+def date_sample(dataset, rows=DATE_SAMPLE_ROWS):
+    """Primeros `rows` valores de la columna 'date' del dataset (para detectar su formato)."""
+    return dataset.head(rows, columns=["date"]).column("date").to_pandas()
+
+
+def _date_bound(value, field_type, date_format):
+    # Límite de fecha con el tipo de la columna 'date' (texto, fecha o timestamp)
+    value = pd.Timestamp(value)
+    if _is_text(field_type):
+        if date_format is None:
+            raise ValueError("Con fechas en texto, indique date_format o una muestra de las fechas para detectarlo")
+        if not date_format.startswith(_SORTABLE_DATE_FORMATS):
+            raise ValueError(f"Con fechas en texto solo se puede filtrar por rango con formatos año-mes-día, no {date_format}")
+        return value.strftime(date_format)
+    if pa.types.is_date(field_type):
+        return pa.scalar(value.date(), type=field_type)
+    return pa.scalar(value.to_pydatetime(), type=field_type)
+
+
+def dataset_filter(schema, start=None, end=None, categories=None, date_format=None, sample=None):
+    """
+    Expresión de filtro de Arrow para las fechas en [start, end) y las categorías `categories`
+    (None si no hay filtros). Si el dataset está particionado por 'year', se filtra también
+    por año para descartar particiones enteras. Las fechas en texto se comparan como texto, en
+    `date_format` o en el formato detectado en `sample` (valores de la columna 'date', ver
+    date_sample); ValueError si no hay formato o no se ordena como las fechas.
+    """
+    if date_format is None and sample is not None and _is_text(schema.field("date").type):
+        date_format = infer_date_format(sample)
+        if date_format is None:
+            raise ValueError("No se reconoce el formato de las fechas en texto; indique date_format")
+    conditions = []
+    if start is not None:
+        conditions.append(ds.field("date") >= _date_bound(start, schema.field("date").type, date_format))
+    if end is not None:
+        conditions.append(ds.field("date") < _date_bound(end, schema.field("date").type, date_format))
+    if "year" in schema.names:
+        if start is not None:
+            conditions.append(ds.field("year") >= pd.Timestamp(start).year)
+        if end is not None:
+            conditions.append(ds.field("year") <= (pd.Timestamp(end) - pd.Timedelta(1, "ns")).year)
+    if categories is not None:
+        conditions.append(ds.field("category").isin(list(categories)))
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def _filter(dataset, start, end, categories, date_format):
+    # dataset_filter con una muestra de las fechas si hay que detectar su formato
+    sample = None
+    if date_format is None and (start is not None or end is not None) and _is_text(dataset.schema.field("date").type):
+        sample = date_sample(dataset)
+    return dataset_filter(dataset.schema, start, end, categories, date_format, sample)
+
+
+def read_dataset(source, columns=COLUMNS, start=None, end=None, categories=None, date_format=None):
+    """
+    DataFrame con las columnas `columns` de `source` (ver open_dataset), solo con las filas
+    de fechas en [start, end) y de las categorías `categories`.
+    """
+    dataset = open_dataset(source)
+    expression = _filter(dataset, start, end, categories, date_format)
+    return dataset.to_table(columns=list(columns), filter=expression).to_pandas()
+
+
+def iter_dataset(source, batch_rows, columns=COLUMNS, start=None, end=None, categories=None, date_format=None):
+    """Como read_dataset, pero itera DataFrames de como mucho `batch_rows` filas (para el pipeline por bloques)."""
+    dataset = open_dataset(source)
+    expression = _filter(dataset, start, end, categories, date_format)
+    for batch in dataset.to_batches(columns=list(columns), filter=expression, batch_size=batch_rows):
+        if batch.num_rows:
+            yield batch.to_pandas()
+
+
+def write_partitioned(df, root, partition_by=("category",), sort_by="date", row_group_rows=ROW_GROUP_ROWS):
+    """
+    Escribe `df` como Parquet particionado (hive: root/category=A/part-0.parquet) para
+    reutilizarlo con read_dataset. Las filas se ordenan por `sort_by` para que las
+    estadísticas de cada grupo de filas cubran rangos estrechos. Las particiones que ya existían
+    en `root` y que reciben datos nuevos se reemplazan.
+    """
+    if sort_by is not None and sort_by in df:
+        df = df.sort_values(sort_by, kind="stable")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    ds.write_dataset(table, str(root), format="parquet", partitioning=list(partition_by), partitioning_flavor="hive",
+                     existing_data_behavior="delete_matching", max_rows_per_group=row_group_rows,
+                     min_rows_per_group=min(row_group_rows, 1 << 14))
+    return root
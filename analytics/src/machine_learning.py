@@ -1,20 +1,141 @@
-import tensorflow as tf
+import os
 
-def train_model(X_train, y_train):
-    # Define el modelo
+import numpy as np
+
+from .artifacts import ArtifactCache, fingerprint_arrays, training_key
+
+# TensorFlow se importa dentro de las funciones que lo usan: importarlo tarda varios segundos,
+# y así los módulos que importan este (o data_processing y visualization) no lo pagan
+
+# Tamaño de lote por defecto (el mismo que usa model.fit con arrays)
+DEFAULT_BATCH_SIZE = 32
+
+# Elementos del búfer de mezcla: con arrays en disco se mezclan índices (8 bytes cada uno),
+# así que un búfer grande cuesta poca memoria y la mezcla es casi uniforme
+DEFAULT_SHUFFLE_BUFFER = 1 << 20
+
+
+def build_model():
+    import tensorflow as tf
+    # Define y compila el modelo
     model = tf.keras.models.Sequential([
         tf.keras.layers.Dense(128, activation='relu'),
         tf.keras.layers.Dense(10)
     ])
-
-    # Compila el modelo
     model.compile(optimizer='adam',
                   loss=tf.keras.losses.SparseCategoricalCrossentropy(from_logits=True),
                   metrics=['accuracy'])
+    return model
+
+
+def save_arrays(directory, X, y):
+    """Guarda características y etiquetas como X.npy e y.npy para leerlas con memmap (numpy_dataset)."""
+    features_path, labels_path = os.path.join(directory, "X.npy"), os.path.join(directory, "y.npy")
+    np.save(features_path, np.asarray(X, dtype=np.float32))
+    np.save(labels_path, np.asarray(y, dtype=np.int32))
+    return features_path, labels_path
+
+
+def numpy_dataset(features_path, labels_path, batch_size=DEFAULT_BATCH_SIZE, shuffle=True,
+                  shuffle_buffer=DEFAULT_SHUFFLE_BUFFER, seed=None):
+    """
+    tf.data.Dataset de lotes (X, y) leídos de ficheros .npy abiertos con memmap, sin cargarlos
+    en memoria: se mezclan y agrupan los índices de las filas y cada lote se lee del disco en
+    paralelo (map con AUTOTUNE) mientras el modelo entrena con el anterior (prefetch).
+    """
+    import tensorflow as tf
+    X = np.load(features_path, mmap_mode="r")
+    y = np.load(labels_path, mmap_mode="r")
+
+    def read_batch(indices):
+        indices = np.sort(indices) # Lectura en orden del disco; el orden dentro del lote da igual
+        return np.asarray(X[indices], dtype=np.float32), np.asarray(y[indices], dtype=np.int32)
+
+    def load(indices):
+        features, labels = tf.numpy_function(read_batch, [indices], (tf.float32, tf.int32))
+        return tf.ensure_shape(features, (None,) + X.shape[1:]), tf.ensure_shape(labels, (None,) + y.shape[1:])
+
+    dataset = tf.data.Dataset.range(len(X))
+    if shuffle:
+        dataset = dataset.shuffle(min(shuffle_buffer, len(X)), seed=seed, reshuffle_each_iteration=True)
+    dataset = dataset.batch(batch_size).map(load, num_parallel_calls=tf.data.AUTOTUNE)
+    return dataset.prefetch(tf.data.AUTOTUNE)
+
+
+def write_tfrecords(path, X, y):
+    """Guarda características y etiquetas en un fichero TFRecord (un tf.train.Example por fila)."""
+    import tensorflow as tf
+    with tf.io.TFRecordWriter(str(path)) as writer:
+        for features, label in zip(np.asarray(X, dtype=np.float32), np.asarray(y, dtype=np.int64)):
+            example = tf.train.Example(features=tf.train.Features(feature={
+                "X": tf.train.Feature(float_list=tf.train.FloatList(value=features)),
+                "y": tf.train.Feature(int64_list=tf.train.Int64List(value=[label])),
+            }))
+            writer.write(example.SerializeToString())
+    return path
+
+
+def tfrecord_dataset(paths, n_features, batch_size=DEFAULT_BATCH_SIZE, shuffle=True, shuffle_buffer=10_000, seed=None):
+    """
+    tf.data.Dataset de lotes (X, y) de uno o varios ficheros TFRecord (write_tfrecords): los
+    ficheros se leen en paralelo, los registros se mezclan en un búfer de `shuffle_buffer`
+    ejemplos y se decodifican por lotes en paralelo, con prefetch.
+    """
+    import tensorflow as tf
+    schema = {"X": tf.io.FixedLenFeature([n_features], tf.float32), "y": tf.io.FixedLenFeature([], tf.int64)}
+
+    def parse(records):
+        examples = tf.io.parse_example(records, schema)
+        return examples["X"], tf.cast(examples["y"], tf.int32)
+
+    paths = [str(path) for path in paths] if isinstance(paths, (list, tuple)) else [str(paths)]
+    dataset = tf.data.TFRecordDataset(paths, num_parallel_reads=tf.data.AUTOTUNE)
+    if shuffle:
+        dataset = dataset.shuffle(shuffle_buffer, seed=seed, reshuffle_each_iteration=True)
+    dataset = dataset.batch(batch_size).map(parse, num_parallel_calls=tf.data.AUTOTUNE)
+    return dataset.prefetch(tf.data.AUTOTUNE)
+
+
+def train_model(X_train, y_train=None, epochs=10, batch_size=None, cache=None, data_fingerprint=None,
+                dataset_params=None):
+    """
+    Entrena el modelo con arrays en memoria (X_train, y_train) o con un tf.data.Dataset de
+    lotes (X, y) en X_train (numpy_dataset, tfrecord_dataset), que ya fija su tamaño de lote.
+
+    Con `cache` (ArtifactCache o directorio), un entrenamiento con los mismos datos,
+    hiperparámetros y arquitectura que uno anterior devuelve el modelo guardado sin entrenar.
+    La huella de los datos se calcula de los arrays. Con un Dataset hay que dar la huella en
+    `data_fingerprint` (p. ej. artifacts.fingerprint_files de sus ficheros) y, en
+    `dataset_params`, los argumentos con los que se creó (batch_size, shuffle, shuffle_buffer,
+    seed...), que no se pueden leer del Dataset; sin ambos no se usa la caché.
+    """
+    import tensorflow as tf
+    model = build_model()
+
+    key = None
+    if cache is not None:
+        cache = cache if isinstance(cache, ArtifactCache) else ArtifactCache(cache)
+        hyperparameters = {"epochs": epochs, "batch_size": batch_size}
+        if isinstance(X_train, tf.data.Dataset):
+            if dataset_params is None:
+                data_fingerprint = None
+            hyperparameters["dataset"] = dataset_params
+        elif data_fingerprint is None:
+            data_fingerprint = fingerprint_arrays(X_train, y_train)
+        if data_fingerprint is not None:
+            key = training_key(data_fingerprint, model, **hyperparameters)
+            digest = cache.lookup(key)
+            if digest is not None:
+                return cache.load(digest)
 
     # Entrena el modelo
-    model.fit(X_train, y_train, epochs=10)
+    if isinstance(X_train, tf.data.Dataset):
+        model.fit(X_train, epochs=epochs, shuffle=False) # La mezcla ya la hace el Dataset
+    else:
+        model.fit(X_train, y_train, epochs=epochs, batch_size=batch_size)
 
+    if key is not None:
+        cache.record(key, cache.save(model), **hyperparameters)
     return model
 
 # Se implementan los modelos de machine learning, dependiendo de la información
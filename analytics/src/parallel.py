@@ -0,0 +1,192 @@
+import configparser
+import io
+import os
+import shutil
+import tempfile
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .data_processing import clean_data, infer_date_format, transform_data
+from .dedup import Deduplicator, FingerprintSet, load_dedup_settings, row_fingerprints
+from .pipeline import (DEFAULT_CONFIG_PATH, WORKING_SET_FACTOR, _dtypes, _is_parquet, finalize_mean,
+                       load_memory_budget, merge_partials, partial_aggregate)
+
+# Ejecución en paralelo (varios procesos) de
+#     aggregate_data(transform_data(clean_data(df)))
+# sobre uno o varios ficheros CSV/Parquet, en dos fases:
+#  1. Reparto: la entrada se divide en tareas (rangos de bytes de los CSV, grupos de filas de los
+#     Parquet); cada proceso lee una tarea, descarta los nulos y reparte sus filas en `buckets`
+#     ficheros Arrow (feather) según el hash de `shuffle_on` (por defecto, la fila completa).
+#  2. Reducción: cada proceso toma un bucket y le aplica clean_data (deduplicación global
+#     incluida), transform_data y el agregado parcial; el proceso principal combina los parciales.
+# Dos filas duplicadas tienen el mismo hash, así que caen en el mismo bucket: deduplicar cada
+# bucket por separado equivale a deduplicar toda la entrada.
+
+# Columnas con las huellas de cada fila en los ficheros de los buckets
+FINGERPRINT_COLUMNS = ("_fingerprint_hi", "_fingerprint_lo")
+
+Task = namedtuple("Task", ["path", "start", "stop"]) # Bytes [start, stop) de un CSV o grupos de filas de un Parquet
+
+
+def load_workers(path=DEFAULT_CONFIG_PATH):
+    # Número de procesos (sección [processing], workers; 0 o sin valor: todos los núcleos)
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    workers = parser.getint("processing", "workers", fallback=0)
+    return workers if workers > 0 else os.cpu_count() or 1
+
+
+def plan_tasks(paths, task_bytes):
+    """
+    Divide los ficheros en tareas de unos `task_bytes`: rangos de bytes alineados con el inicio
+    de una línea en los CSV (sin saltos de línea dentro de campos entrecomillados) y grupos de
+    filas enteros en los Parquet.
+    """
+    tasks = []
+    for path in paths:
+        if _is_parquet(path):
+            import pyarrow.parquet as pq
+            metadata = pq.ParquetFile(path).metadata
+            start, size = 0, 0
+            for i in range(metadata.num_row_groups):
+                size += metadata.row_group(i).total_byte_size
+                if size >= task_bytes or i == metadata.num_row_groups - 1:
+                    tasks.append(Task(path, start, i + 1))
+                    start, size = i + 1, 0
+            continue
+        file_size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            f.readline() # Cabecera
+            start = f.tell()
+            while start < file_size:
+                f.seek(min(start + task_bytes, file_size))
+                f.readline()
+                stop = min(f.tell(), file_size)
+                tasks.append(Task(path, start, stop))
+                start = stop
+    return tasks
+
+
+def read_task(task):
+    """DataFrame de una tarea, con los mismos tipos que pipeline.read_chunks."""
+    if _is_parquet(task.path):
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(task.path).read_row_groups(range(task.start, task.stop)).to_pandas()
+    with open(task.path, "rb") as f:
+        names = pd.read_csv(f, nrows=0).columns.tolist()
+        f.seek(task.start)
+        data = f.read(task.stop - task.start)
+    return pd.read_csv(io.BytesIO(data), header=None, names=names, dtype=_dtypes(names))
+
+
+def bucket_of(hi, buckets):
+    """
+    Bucket de cada huella: los 32 bits altos de `hi` módulo `buckets`. BloomFilter elige la
+    palabra con `hi` módulo su número de palabras; con `hi % buckets`, las huellas de un bucket
+    solo ocuparían 1/mcd(buckets, palabras) de las palabras de su filtro.
+    """
+    return (hi >> np.uint64(32)) % np.uint64(buckets)
+
+
+def scatter_task(task, task_id, buckets, directory, shuffle_on=None):
+    """
+    Fase 1: lee la tarea, descarta las filas con nulos (la parte de clean_data que no depende de
+    otras filas) y escribe cada bucket no vacío en `directory`. Devuelve {bucket: fichero}.
+    Repartiendo por la fila completa, sus huellas viajan en el fichero para no recalcularlas.
+    """
+    df = read_task(task).dropna()
+    if df.empty:
+        return {}
+    if shuffle_on is None:
+        hi, lo = row_fingerprints(df)
+        df = df.assign(**{FINGERPRINT_COLUMNS[0]: hi, FINGERPRINT_COLUMNS[1]: lo})
+    else:
+        hi = row_fingerprints(df[shuffle_on])[0]
+    files = {}
+    for bucket, part in df.groupby(bucket_of(hi, buckets), sort=False):
+        files[int(bucket)] = os.path.join(directory, f"bucket-{int(bucket):04d}-task-{task_id:06d}.feather")
+        part.reset_index(drop=True).to_feather(files[int(bucket)], compression="uncompressed")
+    return files
+
+
+def _load(source):
+    # Fichero de un bucket (con o sin huellas) o, sin reparto, una tarea de la entrada
+    if isinstance(source, Task):
+        return read_task(source), None
+    df = pd.read_feather(source)
+    if FINGERPRINT_COLUMNS[0] not in df:
+        return df, None
+    fingerprints = df[FINGERPRINT_COLUMNS[0]].to_numpy(), df[FINGERPRINT_COLUMNS[1]].to_numpy()
+    return df.drop(columns=list(FINGERPRINT_COLUMNS)), fingerprints
+
+
+def reduce_bucket(sources, dedup_settings=None, date_format=None):
+    """Fase 2: clean_data, transform_data y agregado parcial de los ficheros (o tareas) de un bucket."""
+    partial = None
+    with Deduplicator(FingerprintSet(**(dedup_settings or {}))) as deduplicator:
+        for source in sources:
+            chunk, fingerprints = _load(source)
+            if fingerprints is not None:
+                # Filas ya sin nulos: clean_data se reduce a la deduplicación con las huellas recibidas
+                chunk = deduplicator(chunk, fingerprints)
+            else:
+                chunk = clean_data(chunk, deduplicator)
+            if chunk.empty:
+                continue
+            date_format = date_format if date_format is not None else infer_date_format(chunk['date'])
+            chunk = transform_data(chunk, date_format)
+            partial = merge_partials(partial, partial_aggregate(chunk))
+    return partial
+
+
+def _run(executor, function, *iterables):
+    # Sin pool (un solo proceso) las funciones se ejecutan aquí mismo, sin serializar nada
+    return list(executor.map(function, *iterables) if executor is not None else map(function, *iterables))
+
+
+def run_parallel(paths, workers=None, task_bytes=None, buckets=None, shuffle_on=None, memory_budget=None,
+                 date_format=None):
+    """
+    Pipeline completo en `workers` procesos (config.ini si no se indica) sobre uno o varios
+    ficheros CSV/Parquet. Devuelve la misma Serie que aggregate_data sobre todos los datos.
+    Cada proceso lee a la vez una tarea de `task_bytes` (por defecto, su parte del presupuesto
+    de memoria) y deduplica con su parte del límite de huellas de config.ini.
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    workers = workers if workers is not None else load_workers()
+    buckets = buckets if buckets is not None else workers
+    if task_bytes is None:
+        memory_budget = memory_budget if memory_budget is not None else load_memory_budget()
+        task_bytes = max(1 << 20, memory_budget // (WORKING_SET_FACTOR * workers))
+    dedup_settings = load_dedup_settings()
+    if dedup_settings["max_memory_keys"] is not None:
+        dedup_settings["max_memory_keys"] //= workers
+
+    tasks = plan_tasks(paths, task_bytes)
+    if dedup_settings["spill_dir"]:
+        os.makedirs(dedup_settings["spill_dir"], exist_ok=True)
+    directory = tempfile.mkdtemp(prefix="parallel-", dir=dedup_settings["spill_dir"])
+    executor = ProcessPoolExecutor(workers) if workers > 1 else None
+    try:
+        if buckets == 1: # Un solo bucket: sin reparto, se reducen directamente las tareas
+            partials = [reduce_bucket(tasks, dedup_settings, date_format)]
+        else:
+            scattered = _run(executor, scatter_task, tasks, range(len(tasks)), [buckets] * len(tasks),
+                             [directory] * len(tasks), [shuffle_on] * len(tasks))
+            files = [[task_files[b] for task_files in scattered if b in task_files] for b in range(buckets)]
+            files = [bucket_files for bucket_files in files if bucket_files]
+            partials = _run(executor, reduce_bucket, files, [dedup_settings] * len(files), [date_format] * len(files))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        shutil.rmtree(directory, ignore_errors=True)
+
+    partial = None
+    for bucket_partial in partials:
+        if bucket_partial is not None:
+            partial = merge_partials(partial, bucket_partial)
+    return finalize_mean(partial)
@@ -0,0 +1,125 @@
+import configparser
+import os
+
+import pandas as pd
+
+from .config import DEFAULT_CONFIG_PATH
+from .data_processing import clean_data, infer_date_format, transform_data
+from .dedup import Deduplicator, deduplicator_from_config
+
+# Pipeline por bloques (out-of-core) equivalente a
+#     aggregate_data(transform_data(clean_data(df)))
+# para ficheros que no caben en memoria: se leen CSV/Parquet por bloques de filas, cada
+# bloque se limpia y transforma con las mismas funciones y la media por categoría se
+# calcula con agregados parciales combinables (suma y recuento por categoría).
+
+DEFAULT_MEMORY_BUDGET = 512 * 1024 * 1024
+
+# Tipos fijos al leer: con inferencia por bloque, un bloque con nulos leería 'value' como
+# float y otro como int, y la misma fila no se reconocería como duplicada entre bloques
+DTYPES = {"date": "object", "category": "object", "value": "float64"}
+
+# Copias intermedias por bloque (dropna, to_datetime, huellas de filas...) respecto al tamaño leído
+WORKING_SET_FACTOR = 4
+
+
+def load_memory_budget(path=DEFAULT_CONFIG_PATH):
+    # Presupuesto de memoria del pipeline (sección [processing], memory_budget_mb)
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    if parser.has_option("processing", "memory_budget_mb"):
+        return parser.getint("processing", "memory_budget_mb") * 1024 * 1024
+    return DEFAULT_MEMORY_BUDGET
+
+
+def _is_parquet(path):
+    return str(path).endswith((".parquet", ".pq"))
+
+
+def _dtypes(columns=None):
+    return {c: t for c, t in DTYPES.items() if columns is None or c in columns}
+
+
+def estimate_chunk_rows(path, memory_budget, sample_rows=10_000, columns=None):
+    """Filas por bloque para que el bloque y sus copias intermedias quepan en el presupuesto."""
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+        sample = next(pq.ParquetFile(path).iter_batches(batch_size=sample_rows, columns=columns), None)
+        sample = sample.to_pandas() if sample is not None else pd.DataFrame()
+    else:
+        sample = pd.read_csv(path, nrows=sample_rows, usecols=columns, dtype=_dtypes(columns))
+    if sample.empty:
+        return sample_rows
+    bytes_per_row = sample.memory_usage(deep=True, index=True).sum() / len(sample)
+    return max(1, int(memory_budget / (bytes_per_row * WORKING_SET_FACTOR)))
+
+
+def read_chunks(paths, chunk_rows, columns=None):
+    """Itera DataFrames de como mucho `chunk_rows` filas de uno o varios ficheros CSV/Parquet."""
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    for path in paths:
+        if _is_parquet(path):
+            import pyarrow.parquet as pq
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=columns):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(path, chunksize=chunk_rows, usecols=columns, dtype=_dtypes(columns))
+
+
+def partial_aggregate(df, by="category", column="value"):
+    """Agregado parcial de un bloque: suma y recuento de `column` por grupo."""
+    return df.groupby(by)[column].agg(["sum", "count"])
+
+
+def merge_partials(left, right):
+    """Combina dos agregados parciales (la operación es asociativa y conmutativa)."""
+    if left is None:
+        return right
+    return left.add(right, fill_value=0)
+
+
+def finalize_mean(partial, column="value"):
+    """Media por grupo a partir del agregado parcial combinado (misma forma que aggregate_data)."""
+    if partial is None: # Sin filas
+        return pd.Series(dtype="float64", name=column, index=pd.Index([], name="category"))
+    mean = partial["sum"] / partial["count"]
+    mean.name = column
+    return mean.sort_index()
+
+
+def process_chunks(chunks, deduplicate=None, date_format=None):
+    """
+    Aplica clean_data y transform_data a cada bloque y acumula la media por categoría.
+    Devuelve la misma Serie que aggregate_data sobre el DataFrame completo: los duplicados se
+    eliminan entre todos los bloques con `deduplicate` (por defecto un dedup.Deduplicator).
+    """
+    deduplicate = deduplicate if deduplicate is not None else Deduplicator()
+    partial = None
+    for chunk in chunks:
+        chunk = clean_data(chunk, deduplicate)
+        if chunk.empty:
+            continue
+        # Formato de fecha detectado una vez, con el primer bloque; transform_data no modifica el bloque
+        date_format = date_format if date_format is not None else infer_date_format(chunk['date'])
+        chunk = transform_data(chunk, date_format)
+        partial = merge_partials(partial, partial_aggregate(chunk))
+    return finalize_mean(partial)
+
+
+def run_pipeline(paths, memory_budget=None, chunk_rows=None, deduplicate=None, date_format=None):
+    """
+    Pipeline completo por bloques sobre uno o varios ficheros CSV/Parquet.
+    El tamaño de bloque se estima a partir del presupuesto de memoria (config.ini) si no se indica;
+    la deduplicación usa el límite de memoria y el directorio de volcado de config.ini.
+    Sin `date_format`, el formato de las fechas se detecta con el primer bloque.
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    if chunk_rows is None:
+        memory_budget = memory_budget if memory_budget is not None else load_memory_budget()
+        chunk_rows = estimate_chunk_rows(paths[0], memory_budget)
+    if deduplicate is not None:
+        return process_chunks(read_chunks(paths, chunk_rows), deduplicate, date_format)
+    with deduplicator_from_config() as deduplicate:
+        return process_chunks(read_chunks(paths, chunk_rows), deduplicate, date_format)
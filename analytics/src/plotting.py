@@ -1 +1,166 @@
+import io
 
+import numpy as np
+
+# Dibujo de gráficas sin pantalla y sin el estado global de pyplot, para servidores e
+# informes por lotes: cada Renderer tiene su propia figura (matplotlib.figure.Figure con el
+# lienzo Agg), que reutiliza de una gráfica a la siguiente, y devuelve los bytes PNG/SVG.
+# render_many reparte muchas gráficas entre varios procesos, cada uno con su Renderer.
+# Las series temporales largas se reducen con LTTB antes de dibujarlas, así que el coste de
+# dibujar no depende del número de puntos. matplotlib se importa al crear el primer Renderer.
+
+# Puntos como máximo de una serie temporal dibujada (más de los píxeles de ancho de la figura)
+MAX_POINTS = 2_000
+
+
+def lttb(x, y, threshold):
+    """
+    Índices de los `threshold` puntos que conserva Largest-Triangle-Three-Buckets (Steinarsson,
+    2013) de la serie (x, y), con x ordenada: el primero, el último y, de cada uno de los
+    threshold - 2 tramos intermedios, el que forma el triángulo de mayor área con el punto
+    elegido en el tramo anterior y la media del siguiente. Conserva picos y valles.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64) # Tramos [edges[i], edges[i+1]) y el último punto
+    sizes = np.diff(np.append(edges, n))
+    mean_x = (np.add.reduceat(x, edges) / sizes).tolist()
+    mean_y = (np.add.reduceat(y, edges) / sizes).tolist()
+    edges = edges.tolist()
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    selected_x, selected_y = float(x[0]), float(y[0])
+    for i in range(threshold - 2):
+        start, stop = edges[i], edges[i + 1]
+        # Doble del área con el punto elegido (xa, ya) y la media del tramo siguiente (xm, ym):
+        # |(xa - xm)·y + (ym - ya)·x - ((xa - xm)·ya + (ym - ya)·xa)|
+        p, q = selected_x - mean_x[i + 1], mean_y[i + 1] - selected_y
+        area = p * y[start:stop]
+        area += q * x[start:stop]
+        area -= p * selected_y + q * selected_x
+        selected = start + int(np.abs(area, out=area).argmax())
+        indices[i + 1] = selected
+        selected_x, selected_y = float(x[selected]), float(y[selected])
+    return indices
+
+
+def time_series_points(df, max_points=MAX_POINTS):
+    """(date, value) de df ordenados por fecha, sin nulos y reducidos con LTTB a `max_points` puntos si hay más."""
+    import pandas as pd
+    dates, values = df['date'], df['value'].to_numpy(dtype="float64")
+    valid = dates.notna().to_numpy() & ~np.isnan(values)
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        dates = dates.to_numpy(dtype="datetime64[ns]")
+        position = dates.view(np.int64)
+    elif pd.api.types.is_numeric_dtype(dates):
+        dates = position = dates.to_numpy(dtype="float64")
+    else:
+        dates = dates.to_numpy()
+        position = np.arange(len(dates)) # Texto: en el orden de los datos
+    if not valid.all():
+        dates, values, position = dates[valid], values[valid], position[valid]
+    if len(position) > 1 and np.any(position[1:] < position[:-1]):
+        order = np.argsort(position, kind="stable")
+        dates, values, position = dates[order], values[order], position[order]
+    if len(values) > max_points:
+        keep = lttb(position, values, max_points)
+        dates, values = dates[keep], values[keep]
+    return dates, values
+
+
+def draw_time_series(ax, df, max_points=MAX_POINTS):
+    """Líneas de value frente a date en `ax` (ver time_series_points)."""
+    ax.plot(*time_series_points(df, max_points))
+
+
+def draw_bars(ax, df):
+    """Barras de la media de value por category en `ax` (las medias de aggregate_data)."""
+    means = df.groupby('category')['value'].mean()
+    ax.bar(means.index.astype(str), means.to_numpy())
+    ax.set_xlabel('category')
+    ax.set_ylabel('value')
+
+
+# Tipos de gráfica de Renderer.render
+CHARTS = {'time_series': draw_time_series, 'bars': draw_bars}
+
+
+class Renderer:
+    """
+    Dibuja gráficas (CHARTS) en una sola figura que se limpia y reutiliza entre gráficas, sin
+    pyplot: render(kind, df, fmt='png'|'svg', title=None, max_points=MAX_POINTS) devuelve los
+    bytes (max_points solo se aplica a las series temporales).
+    Entre dos series temporales seguidas con fechas (o números) no se limpian los ejes
+    (ax.clear() cuesta más que dibujar una serie reducida): solo se cambian los datos de la
+    línea y los límites. Con fechas en texto sí, porque el eje guarda las categorías de la serie.
+    """
+
+    def __init__(self, figsize=(8, 4.5), dpi=100):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot()
+        self._line = None # Línea de la última gráfica si era una serie temporal
+
+    def render(self, kind, df, fmt="png", title=None, max_points=MAX_POINTS):
+        if kind not in CHARTS:
+            raise ValueError(f"Tipo de gráfica desconocido: {kind!r} (disponibles: {', '.join(CHARTS)})")
+        if kind == 'time_series':
+            points = time_series_points(df, max_points)
+            x_kind = points[0].dtype.kind
+            # Fechas o números del mismo tipo que la línea anterior: las unidades del eje x siguen valiendo
+            if self._line is not None and x_kind in "Mf" and self._line.get_xdata().dtype.kind == x_kind:
+                self._line.set_data(*points)
+                self.ax.relim()
+                self.ax.autoscale_view()
+            else:
+                self.ax.clear()
+                self._line, = self.ax.plot(*points)
+        else:
+            self.ax.clear()
+            CHARTS[kind](self.ax, df)
+            self._line = None
+        self.ax.set_title(title or "")
+        buffer = io.BytesIO()
+        self.figure.savefig(buffer, format=fmt)
+        return buffer.getvalue()
+
+
+def render_chart(kind, df, fmt="png", **options):
+    """Bytes de una sola gráfica (ver Renderer.render)."""
+    return Renderer().render(kind, df, fmt, **options)
+
+
+_renderer = None # Renderer de cada proceso de render_many
+
+
+def _init_worker(figsize, dpi):
+    global _renderer
+    _renderer = Renderer(figsize, dpi)
+
+
+def _render(chart):
+    return _renderer.render(**chart)
+
+
+def render_many(charts, workers=None, figsize=(8, 4.5), dpi=100):
+    """
+    Bytes de muchas gráficas, en el mismo orden: `charts` son diccionarios con los argumentos
+    de Renderer.render (kind, df, y opcionalmente fmt, title...). Con workers > 1 (por defecto
+    workers de config.ini) se dibujan en varios procesos, cada uno con su propia figura.
+    """
+    charts = list(charts)
+    if workers is None:
+        from .parallel import load_workers
+        workers = load_workers()
+    workers = max(1, min(workers, len(charts)))
+    if workers == 1:
+        renderer = Renderer(figsize, dpi)
+        return [renderer.render(**chart) for chart in charts]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(figsize, dpi)) as executor:
+        return list(executor.map(_render, charts, chunksize=max(1, len(charts) // (workers * 4))))
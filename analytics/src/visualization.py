@@ -1,14 +1,30 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
+import os
+import sys
+
+# matplotlib y seaborn se importan la primera vez que se dibuja (tardan ~1 s entre los dos)
+
+def _pyplot():
+    # Importa pyplot; sin pantalla (servidor, trabajos por lotes, tests) y sin un backend elegido
+    # con MPLBACKEND se usa Agg, que dibuja en memoria sin abrir ventanas
+    import matplotlib
+    headless = sys.platform.startswith("linux") and not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+    if headless and "MPLBACKEND" not in os.environ and "matplotlib.pyplot" not in sys.modules:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
 
 def plot_data(df):
     # Crea un gráfico de barras
+    plt = _pyplot()
+    import seaborn as sns
     sns.barplot(x='category', y='value', data=df)
     plt.show()
 
 def plot_time_series(df):
-    # Crea un gráfico de líneas
-    plt.plot(df['date'], df['value'])
+    # Crea un gráfico de líneas (reducido con LTTB si la serie es larga; ver plotting.py)
+    from .plotting import draw_time_series
+    plt = _pyplot()
+    draw_time_series(plt.gca(), df)
     plt.show()
 
 # Se crean las gráficas necesarias para poder analizar de mejor manera la información de los usuarios.
@@ -0,0 +1,91 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from src.artifacts import ArtifactCache, fingerprint_arrays, fingerprint_files
+from src.machine_learning import build_model, numpy_dataset, save_arrays, train_model
+
+
+@pytest.fixture
+def training_data():
+    rng = np.random.default_rng(0)
+    return rng.random((64, 10), dtype=np.float32), rng.integers(0, 2, 64).astype(np.int32)
+
+
+def test_entrenamiento_identico_se_carga_de_la_cache(training_data, tmp_path, monkeypatch):
+    """
+    Prueba que repetir train_model con los mismos datos e hiperparámetros carga el modelo de la
+    caché sin entrenar, y que con otros hiperparámetros o datos se entrena de nuevo.
+    """
+    X_train, y_train = training_data
+    first = train_model(X_train, y_train, epochs=1, cache=tmp_path)
+
+    calls = []
+    fit = tf.keras.Model.fit
+    monkeypatch.setattr(tf.keras.Model, 'fit', lambda self, *args, **kwargs: calls.append(1) or fit(self, *args, **kwargs))
+    again = train_model(X_train, y_train, epochs=1, cache=ArtifactCache(tmp_path))
+    assert calls == []
+    np.testing.assert_allclose(again.predict(X_train[:4]), first.predict(X_train[:4]), rtol=1e-5, atol=1e-5)
+
+    train_model(X_train, y_train, epochs=2, cache=tmp_path)
+    train_model(X_train[::-1], y_train, epochs=1, cache=tmp_path)
+    assert len(calls) == 2
+    assert len(os.listdir(tmp_path / 'runs')) == 3
+
+
+def test_versiones_por_contenido(training_data, tmp_path):
+    """Prueba que la versión de un modelo depende solo de su arquitectura y pesos."""
+    X_train, _ = training_data
+    model = build_model()
+    model(X_train[:1])
+    cache = ArtifactCache(tmp_path)
+    digest = cache.save(model)
+    assert cache.save(model) == digest
+    assert len(os.listdir(tmp_path / 'models')) == 1
+
+    loaded = ArtifactCache(tmp_path).load(digest)
+    np.testing.assert_allclose(loaded.predict(X_train), model.predict(X_train), rtol=1e-5, atol=1e-5)
+    assert ArtifactCache(tmp_path).save(loaded) == digest
+    with pytest.raises(KeyError):
+        cache.load('0' * 64)
+    assert fingerprint_arrays(X_train) != fingerprint_arrays(X_train.astype(np.float64))
+
+
+def test_dataset_con_sus_parametros_en_la_clave(training_data, tmp_path, monkeypatch):
+    """
+    Prueba que con un Dataset la caché solo se usa si se dan sus parámetros, que forman parte de
+    la clave (otro tamaño de lote entrena de nuevo), y que el modelo cargado es un objeto nuevo.
+    """
+    paths = save_arrays(tmp_path, *training_data)
+    fingerprint = fingerprint_files(*paths)
+    calls = []
+    fit = tf.keras.Model.fit
+    monkeypatch.setattr(tf.keras.Model, 'fit', lambda self, *args, **kwargs: calls.append(1) or fit(self, *args, **kwargs))
+    cache = ArtifactCache(tmp_path / 'cache')
+
+    train_model(numpy_dataset(*paths, batch_size=32), epochs=1, cache=cache, data_fingerprint=fingerprint)
+    assert os.listdir(tmp_path / 'cache' / 'runs') == []
+    for batch_size in (32, 8, 32):
+        params = {"batch_size": batch_size, "seed": 1}
+        train_model(numpy_dataset(*paths, batch_size=batch_size, seed=1), epochs=1, cache=cache,
+                    data_fingerprint=fingerprint, dataset_params=params)
+    assert len(calls) == 3
+    assert len(os.listdir(tmp_path / 'cache' / 'runs')) == 2
+
+    digest = cache.lookup(os.path.splitext(os.listdir(tmp_path / 'cache' / 'runs')[0])[0])
+    first, second = cache.load(digest), cache.load(digest)
+    assert first is not second
+    first.set_weights([np.zeros_like(w) for w in first.get_weights()])
+    assert np.any(cache.load(digest).get_weights()[0])
+
+
+def test_importar_sin_tensorflow():
+    """Prueba que importar machine_learning, data_processing y pipeline no importa TensorFlow."""
+    code = ("import sys; import src.machine_learning, src.data_processing, src.pipeline; "
+            "sys.exit('tensorflow' in sys.modules)")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    assert subprocess.run([sys.executable, '-c', code], cwd=root).returncode == 0
@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.data_processing import clean_data
+from src.dedup import BloomFilter, Deduplicator, FingerprintSet, first_occurrences, row_fingerprints
+
+
+def generate_rows(rows, seed=0, values=50):
+    """Filas sintéticas con muchos duplicados (pocas combinaciones posibles) y algunos nulos."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'date': rng.choice(['2023-01-01', '2023-01-02', '2023-01-03', None], rows),
+        'category': rng.choice(list('ABCD'), rows),
+        'value': rng.integers(0, values, rows).astype(float),
+    })
+    df.loc[rng.choice(rows, rows // 20, replace=False), 'value'] = None
+    return df
+
+
+def deduplicate_in_chunks(df, deduplicator, chunk_rows):
+    chunks = [deduplicator(df.iloc[start:start + chunk_rows]) for start in range(0, len(df), chunk_rows)]
+    return pd.concat(chunks)
+
+
+def test_deduplicacion_global_igual_a_drop_duplicates():
+    """Prueba que deduplicar por bloques da las mismas filas, en el mismo orden, que drop_duplicates."""
+    df = generate_rows(20_000)
+    deduplicator = Deduplicator()
+    result = deduplicate_in_chunks(df, deduplicator, 1_500)
+    expected = df.drop_duplicates()
+    pd.testing.assert_frame_equal(result, expected)
+    assert deduplicator.stats['rows_seen'] == len(df)
+    assert deduplicator.stats['rows_dropped'] == len(df) - len(expected)
+    assert deduplicator.stats['unique_rows'] == len(fingerprints_of(expected))
+
+
+def fingerprints_of(df):
+    hi, lo = row_fingerprints(df)
+    return set(zip(hi.tolist(), lo.tolist()))
+
+
+def test_volcado_a_disco_con_memoria_acotada(tmp_path):
+    """Prueba que con un límite de huellas en memoria se vuelca a disco sin cambiar el resultado."""
+    df = generate_rows(20_000, seed=1, values=1_000)
+    with Deduplicator(FingerprintSet(max_memory_keys=500, spill_dir=str(tmp_path))) as deduplicator:
+        result = deduplicate_in_chunks(df, deduplicator, 700)
+        assert deduplicator.stats['spilled_runs'] > 1
+        assert deduplicator.fingerprints.memory_keys <= 500
+        assert os.listdir(tmp_path)
+    pd.testing.assert_frame_equal(result, df.drop_duplicates())
+    assert not os.listdir(tmp_path) # close() borra los tramos volcados
+
+
+def test_colisiones_de_64_bits():
+    """Prueba que huellas con el mismo `hi` y distinto `lo` se tratan como filas distintas."""
+    hi = np.array([7, 7, 3, 7, 7], dtype=np.uint64)
+    lo = np.array([1, 2, 5, 1, 2], dtype=np.uint64)
+    assert sorted(first_occurrences(hi, lo).tolist()) == [0, 1, 2]
+
+    fingerprints = FingerprintSet()
+    fingerprints.add(hi[:3], lo[:3])
+    found = fingerprints.contains(np.array([7, 7, 7, 3], dtype=np.uint64), np.array([2, 1, 9, 5], dtype=np.uint64))
+    assert found.tolist() == [True, True, False, True]
+
+
+def test_filtro_de_bloom_sin_falsos_negativos():
+    """Prueba que el filtro de Bloom nunca descarta una huella añadida y descarta casi todas las demás."""
+    rng = np.random.default_rng(0)
+    hi, lo = rng.integers(0, 2**63, (2, 20_000), dtype=np.uint64)
+    bloom = BloomFilter(10_000)
+    bloom.add(hi[:10_000], lo[:10_000])
+    assert bloom.might_contain(hi[:10_000], lo[:10_000]).all()
+    assert bloom.might_contain(hi[10_000:], lo[10_000:]).mean() < 0.05
+
+
+def test_clean_data_con_deduplicador():
+    """Prueba que clean_data elimina los duplicados de bloques anteriores si recibe un deduplicador."""
+    deduplicator = Deduplicator()
+    first = pd.DataFrame({'date': ['2023-01-01', None], 'category': ['A', 'B'], 'value': [1.0, 2.0]})
+    second = pd.DataFrame({'date': ['2023-01-01', '2023-01-02'], 'category': ['A', 'A'], 'value': [1.0, 1.0]})
+    assert len(clean_data(first, deduplicator)) == 1
+    assert clean_data(second, deduplicator)['date'].tolist() == ['2023-01-02']
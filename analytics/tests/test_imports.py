@@ -0,0 +1,31 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(code, env=None):
+    return subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, env=env)
+
+
+@pytest.mark.parametrize('module', ['config', 'data_processing', 'visualization', 'machine_learning', 'artifacts', 'inference', 'plotting'])
+def test_importar_sin_dependencias_pesadas(module):
+    """Prueba que importar el módulo no importa pandas, TensorFlow, matplotlib ni seaborn."""
+    code = (f"import sys, src.{module}; "
+            "print(' '.join(m for m in ('pandas', 'tensorflow', 'matplotlib', 'seaborn') if m in sys.modules))")
+    result = run(code)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == []
+
+
+def test_backend_sin_pantalla():
+    """Prueba que sin pantalla ni MPLBACKEND las gráficas usan el backend Agg (sin ventanas)."""
+    env = {k: v for k, v in os.environ.items() if k not in ('DISPLAY', 'WAYLAND_DISPLAY', 'MPLBACKEND')}
+    code = ("import pandas as pd, matplotlib; from src.visualization import plot_time_series; "
+            "plot_time_series(pd.DataFrame({'date': [1, 2], 'value': [3.0, 4.0]})); print(matplotlib.get_backend())")
+    result = run(code, env)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().lower() == 'agg'
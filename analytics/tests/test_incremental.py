@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_processing import clean_data, transform_data
+from src.incremental import IncrementalAggregator
+
+from test_pipeline import generate_events, in_memory_result
+
+
+def split(df, parts):
+    return [df.iloc[i::parts].reset_index(drop=True) for i in range(parts)]
+
+
+def test_ingesta_incremental_igual_al_recalculo(tmp_path):
+    """
+    Prueba que ingerir los lotes en sesiones distintas (reabriendo el estado) da la misma media
+    que el cálculo completo, con duplicados repartidos entre lotes, y que repetir un lote no lo cuenta dos veces.
+    """
+    df = generate_events(30_000)
+    batches = split(df, 3)
+    for i, batch in enumerate(batches):
+        with IncrementalAggregator(tmp_path / 'state') as aggregator:
+            assert aggregator.ingest(batch, batch_id=f'lote-{i}')
+    with IncrementalAggregator(tmp_path / 'state') as aggregator:
+        assert not aggregator.ingest(batches[0], batch_id='lote-0')
+        assert aggregator.batches == ['lote-0', 'lote-1', 'lote-2']
+        pd.testing.assert_series_equal(aggregator.mean(), in_memory_result(df))
+
+
+def test_agrupacion_por_categoria_y_anio(tmp_path):
+    """
+    Prueba varianza, mínimo, máximo y cuantiles por (category, year) frente al cálculo completo;
+    los cuantiles, con el error relativo configurado respecto a interpolation='lower'.
+    """
+    df = generate_events(20_000, seed=1)
+    options = dict(by=('category', 'year'), variance=True, extremes=True, quantiles=(0.5, 0.9), relative_accuracy=0.01)
+    for batch in split(df, 4):
+        with IncrementalAggregator(tmp_path / 'state', **options) as aggregator:
+            aggregator.ingest(batch)
+    with IncrementalAggregator(tmp_path / 'state', **options) as aggregator:
+        result = aggregator.result()
+
+    grouped = transform_data(clean_data(df)).groupby(['category', 'year'])['value']
+    expected = grouped.agg(['count', 'mean', 'var', 'min', 'max'])
+    pd.testing.assert_frame_equal(result[expected.columns], expected, check_dtype=False)
+    for q in (0.5, 0.9):
+        exact = grouped.quantile(q, interpolation='lower')
+        assert np.all(np.abs(result[f'q{q:g}'] - exact) <= 0.01 * np.abs(exact))
+
+
+def test_ingesta_de_ficheros_y_compactacion(tmp_path, monkeypatch):
+    """
+    Prueba que ingest_files salta los ficheros ya ingeridos, que las huellas se compactan al
+    superar max_fingerprint_files y que otra configuración sobre el mismo estado da error.
+    """
+    monkeypatch.setattr(IncrementalAggregator, 'max_fingerprint_files', 2)
+    df = generate_events(20_000, seed=2)
+    paths = []
+    for i, batch in enumerate(split(df, 5)):
+        paths.append(tmp_path / f'events-{i}.csv')
+        batch.to_csv(paths[-1], index=False)
+
+    with IncrementalAggregator(tmp_path / 'state') as aggregator:
+        assert aggregator.ingest_files(paths[:3], chunk_rows=1_000) == paths[:3]
+    with IncrementalAggregator(tmp_path / 'state') as aggregator:
+        assert aggregator.ingest_files(paths, chunk_rows=1_000) == paths[3:]
+        assert len(aggregator._deduplicator.fingerprints.files) <= 2
+        pd.testing.assert_series_equal(aggregator.mean(), in_memory_result(df))
+    assert len(list((tmp_path / 'state').glob('fingerprints-*'))) <= 2
+
+    with pytest.raises(ValueError):
+        IncrementalAggregator(tmp_path / 'state', variance=True)
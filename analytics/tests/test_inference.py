@@ -0,0 +1,88 @@
+import threading
+
+import numpy as np
+import pytest
+
+from src.inference import BatchPredictor, load_model
+from src.machine_learning import build_model
+
+
+@pytest.fixture
+def model():
+    model = build_model()
+    model(np.zeros((1, 10), dtype=np.float32))
+    return model
+
+
+def test_peticiones_concurrentes_en_lotes(model):
+    """
+    Prueba que las peticiones de una fila desde varios hilos se agrupan en lotes y que cada una
+    recibe la salida de su fila.
+    """
+    X = np.random.default_rng(0).random((200, 10), dtype=np.float32)
+    expected = model(X).numpy()
+    results = [None] * len(X)
+
+    def client(rows):
+        for i in rows:
+            results[i] = predictor.predict(X[i], timeout=30)
+
+    with BatchPredictor(model, max_batch_size=32, max_wait_ms=20) as predictor:
+        threads = [threading.Thread(target=client, args=(range(k, len(X), 8),)) for k in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        metrics = predictor.metrics()
+
+    np.testing.assert_allclose(np.stack(results), expected, rtol=1e-5, atol=1e-5)
+    assert metrics['requests'] == 200
+    assert metrics['batches'] < 200
+    assert metrics['mean_batch_size'] > 1
+    assert metrics['latency_p50_ms'] <= metrics['latency_p99_ms']
+
+
+def test_lote_incompleto_y_modelo_guardado(model, tmp_path):
+    """
+    Prueba que una petición sola se calcula al vencer max_wait_ms sin esperar a llenar el lote,
+    con el modelo cargado desde disco, y que submit falla tras cerrar.
+    """
+    path = tmp_path / 'model.keras'
+    model.save(path)
+    row = np.ones(10, dtype=np.float32)
+    predictor = BatchPredictor(load_model(path), max_batch_size=1000, max_wait_ms=5)
+    np.testing.assert_allclose(predictor.predict(row, timeout=30), model(row[None]).numpy()[0], rtol=1e-5, atol=1e-5)
+    assert predictor.metrics()['batches'] == 1
+    predictor.close()
+    with pytest.raises(RuntimeError):
+        predictor.submit(row)
+
+
+def test_cierre_concurrente_y_errores(model):
+    """
+    Prueba que una petición que compite con close() o se responde o se rechaza (nunca se queda
+    esperando), y que las peticiones de lotes fallidos cuentan en metrics().
+    """
+    predictor = BatchPredictor(model, max_batch_size=8, max_wait_ms=1)
+    with pytest.raises(Exception):
+        predictor.predict(np.zeros(3), timeout=30) # Fila con otro número de características
+    assert predictor.metrics()['errors'] == 1
+
+    futures, start = [], threading.Event()
+
+    def client():
+        start.wait()
+        while True:
+            try:
+                futures.append(predictor.submit(np.zeros(10)))
+            except RuntimeError:
+                return
+
+    threads = [threading.Thread(target=client) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    start.set()
+    predictor.close()
+    for thread in threads:
+        thread.join()
+    assert all(future.result(timeout=30) is not None for future in futures)
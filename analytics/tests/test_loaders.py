@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.loaders import date_sample, dataset_filter, iter_dataset, open_dataset, read_dataset, write_partitioned
+
+
+def generate_wide(rows, seed=0):
+    """Eventos con columnas que no usa data_processing.py, ordenados por fecha."""
+    rng = np.random.default_rng(seed)
+    dates = pd.to_datetime('2020-01-01') + pd.to_timedelta(np.sort(rng.integers(0, 1500, rows)), unit='D')
+    return pd.DataFrame({
+        'date': dates.strftime('%Y-%m-%d'),
+        'category': rng.choice(list('ABCD'), rows),
+        'value': rng.random(rows),
+        'user_agent': rng.choice(['a' * 50, 'b' * 50], rows),
+        'session': rng.integers(0, 10 ** 9, rows),
+    })
+
+
+def expected(df, start, end, categories):
+    mask = (df['date'] >= start) & (df['date'] < end) & df['category'].isin(categories)
+    return df.loc[mask, ['date', 'category', 'value']].reset_index(drop=True)
+
+
+def test_lectura_parquet_con_filtros(tmp_path):
+    """
+    Prueba que de un Parquet ancho se leen solo date, category y value con los filtros de fecha
+    y categoría, y que el filtro de fechas descarta grupos de filas por sus estadísticas.
+    """
+    df = generate_wide(50_000)
+    path = tmp_path / 'events.parquet'
+    df.to_parquet(path, row_group_size=5_000)
+
+    result = read_dataset(path, start='2021-01-01', end='2021-07-01', categories=['A', 'C'])
+    pd.testing.assert_frame_equal(result, expected(df, '2021-01-01', '2021-07-01', ['A', 'C']), check_dtype=False)
+
+    dataset = open_dataset(path)
+    fragment = next(iter(dataset.get_fragments()))
+    selected = fragment.split_by_row_group(dataset_filter(dataset.schema, start='2021-01-01', end='2021-07-01', sample=date_sample(dataset)))
+    assert 0 < len(list(selected)) < pq.ParquetFile(path).num_row_groups
+
+    chunks = list(iter_dataset(path, 1_000, start='2021-01-01', end='2021-07-01', categories=['A', 'C']))
+    assert max(len(chunk) for chunk in chunks) <= 1_000
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), result)
+
+
+def test_lectura_arrow_ipc_con_memmap(tmp_path):
+    """Prueba la lectura de un fichero Arrow IPC con fechas como timestamp y filtro de fechas."""
+    df = generate_wide(10_000, seed=1).assign(date=lambda frame: pd.to_datetime(frame['date']))
+    path = tmp_path / 'events.arrow'
+    with pa.ipc.new_file(str(path), pa.Schema.from_pandas(df, preserve_index=False)) as writer:
+        writer.write_table(pa.Table.from_pandas(df, preserve_index=False))
+
+    result = read_dataset(path, start='2022-01-01', end='2023-01-01', categories=list('ABCD'))
+    pd.testing.assert_frame_equal(result, expected(df, '2022-01-01', '2023-01-01', list('ABCD')), check_dtype=False)
+
+
+def test_escritura_particionada_y_relectura(tmp_path):
+    """
+    Prueba que write_partitioned escribe una partición por año, que se descartan al filtrar por
+    fechas, y que reescribir una partición la reemplaza.
+    """
+    df = generate_wide(20_000, seed=2)
+    df['year'] = df['date'].str[:4].astype('int32')
+    write_partitioned(df[['date', 'category', 'value', 'year']], tmp_path / 'out', partition_by=('year',))
+    assert sorted(p.name for p in (tmp_path / 'out').iterdir()) == [f'year={y}' for y in range(2020, 2025)]
+
+    dataset = open_dataset(tmp_path / 'out')
+    expression = dataset_filter(dataset.schema, start='2021-03-01', end='2022-01-01', sample=date_sample(dataset))
+    assert len(list(dataset.get_fragments(filter=expression))) == 1
+    result = read_dataset(tmp_path / 'out', start='2021-03-01', end='2022-01-01', categories=['B'])
+    pd.testing.assert_frame_equal(result, expected(df, '2021-03-01', '2022-01-01', ['B']), check_dtype=False)
+
+    write_partitioned(df[df['year'] == 2021][['date', 'category', 'value', 'year']].head(10), tmp_path / 'out',
+                      partition_by=('year',))
+    assert len(read_dataset(tmp_path / 'out', start='2021-01-01', end='2022-01-01')) == 10
+    assert len(read_dataset(tmp_path / 'out')) == (df['year'] != 2021).sum() + 10
+
+
+def test_formato_de_fechas_en_texto_detectado(tmp_path):
+    """
+    Prueba que el formato de las fechas en texto se detecta con una muestra de los datos: un
+    formato año/mes/día se filtra por rango y uno día/mes/año (no ordenable) lanza un error.
+    """
+    df = generate_wide(5_000, seed=3)
+    dates = pd.to_datetime(df['date'])
+    df['date'] = dates.dt.strftime('%Y/%m/%d')
+    df.to_parquet(tmp_path / 'ymd.parquet')
+    result = read_dataset(tmp_path / 'ymd.parquet', start='2021-01-01', end='2021-07-01', categories=['A'])
+    assert len(result) == ((dates >= '2021-01-01') & (dates < '2021-07-01') & (df['category'] == 'A')).sum()
+
+    df['date'] = dates.dt.strftime('%d/%m/%Y')
+    df.to_parquet(tmp_path / 'dmy.parquet')
+    with pytest.raises(ValueError):
+        read_dataset(tmp_path / 'dmy.parquet', start='2021-01-01')
+    assert len(read_dataset(tmp_path / 'dmy.parquet', categories=['A'])) == (df['category'] == 'A').sum()
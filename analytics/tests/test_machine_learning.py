@@ -6,6 +6,7 @@ import tensorflow as tf
 # Suponiendo que el archivo a probar está en la misma estructura de proyecto
 # en la carpeta 'src'
 from src.machine_learning import train_model # Importar la función train_model mostrada en las fuentes
+from src.machine_learning import numpy_dataset, save_arrays, tfrecord_dataset, write_tfrecords
 
 # fixture para crear datos de ejemplo para las pruebas de ML
 @pytest.fixture
@@ -54,6 +55,41 @@ def test_train_model_produces_a_trained_model(sample_training_data):
         pytest.fail(f"La predicción falló después del entrenamiento: {e}")
 
 
+def test_numpy_dataset_recorre_todas_las_filas(sample_training_data, tmp_path):
+    """
+    Prueba que numpy_dataset (memmap) devuelve lotes del tamaño pedido, mezclados, con cada
+    fila exactamente una vez por época y sus etiquetas correspondientes.
+    """
+    X_train, y_train = sample_training_data
+    y_train = np.arange(100, dtype=np.int32) # Etiqueta = número de fila
+    X_train[:, 0] = y_train
+    dataset = numpy_dataset(*save_arrays(tmp_path, X_train, y_train), batch_size=16, seed=0)
+
+    batches = list(dataset.as_numpy_iterator())
+    assert [len(labels) for _, labels in batches] == [16] * 6 + [4]
+    labels = np.concatenate([labels for _, labels in batches])
+    features = np.concatenate([features for features, _ in batches])
+    assert sorted(labels) == list(range(100))
+    assert not np.array_equal(labels, np.arange(100))
+    np.testing.assert_array_equal(features[:, 0], labels)
+
+def test_train_model_con_tfrecord(sample_training_data, tmp_path):
+    """
+    Prueba que los TFRecord se leen con las mismas filas que se escribieron y que train_model
+    acepta un tf.data.Dataset.
+    """
+    X_train, y_train = sample_training_data
+    path = write_tfrecords(tmp_path / 'train.tfrecord', X_train, y_train)
+    dataset = tfrecord_dataset(path, n_features=10, batch_size=25, shuffle=False)
+
+    features, labels = next(dataset.as_numpy_iterator())
+    np.testing.assert_array_equal(features, X_train[:25])
+    np.testing.assert_array_equal(labels, y_train[:25])
+
+    model = train_model(dataset, epochs=1)
+    assert model.predict(X_train[:1]).shape == (1, 10)
+
+
 # Se realizan pruebas unitarias para los modelos de aprendizaje automático.
 # Se utiliza pytest para ejecutar las pruebas.
 # Se utilizan assertions para verificar que las funciones retornan objetos correctos y son utilizables.
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.dedup import BloomFilter
+from src.parallel import bucket_of, plan_tasks, read_task, run_parallel
+from src.pipeline import DTYPES
+from test_pipeline import generate_events, in_memory_result
+
+
+@pytest.fixture
+def events(tmp_path):
+    df = generate_events(30_000, seed=5)
+    path = tmp_path / 'events.csv'
+    df.to_csv(path, index=False)
+    return df.astype(DTYPES), path
+
+
+def test_tareas_cubren_el_csv_sin_cortar_lineas(events):
+    """Prueba que los rangos de bytes cubren todas las filas del CSV, cada una una sola vez."""
+    df, path = events
+    tasks = plan_tasks([path], task_bytes=64 * 1024)
+    assert len(tasks) > 5
+    parts = pd.concat([read_task(task) for task in tasks], ignore_index=True)
+    pd.testing.assert_frame_equal(parts, df.reset_index(drop=True))
+
+
+@pytest.mark.parametrize('shuffle_on', [None, ['category']])
+def test_paralelo_igual_al_de_memoria(events, shuffle_on):
+    """
+    Prueba que el pipeline en varios procesos (duplicados repartidos entre tareas distintas)
+    produce el mismo resultado que el pipeline en memoria.
+    """
+    df, path = events
+    result = run_parallel(path, workers=2, task_bytes=64 * 1024, buckets=3, shuffle_on=shuffle_on)
+    pd.testing.assert_series_equal(result, in_memory_result(df))
+
+
+def test_paralelo_parquet_y_un_proceso(tmp_path):
+    """Prueba tareas por grupos de filas de Parquet junto a un CSV, y un solo proceso (sin pool ni reparto)."""
+    df = generate_events(10_000, seed=6)
+    paths = [tmp_path / 'a.parquet', tmp_path / 'b.csv']
+    df.iloc[:6_000].to_parquet(paths[0], index=False, row_group_size=1_000)
+    df.iloc[6_000:].to_csv(paths[1], index=False)
+    assert len(plan_tasks(paths[:1], task_bytes=1)) == 6
+    result = run_parallel(paths, workers=1, task_bytes=16 * 1024)
+    pd.testing.assert_series_equal(result, in_memory_result(df.astype(DTYPES)))
+
+
+def test_filtro_de_bloom_de_un_bucket():
+    """
+    Prueba que el reparto en buckets no se correlaciona con la palabra del filtro de Bloom: el
+    filtro de un bucket (con un número de palabras múltiplo del de buckets) mantiene ~2% de
+    falsos positivos.
+    """
+    rng = np.random.default_rng(1)
+    hi, lo = rng.integers(0, 2**63, (2, 120_000), dtype=np.uint64)
+    in_bucket = bucket_of(hi, 8) == 0
+    hi, lo = hi[in_bucket], lo[in_bucket]
+    bloom = BloomFilter(6_400) # 1000 palabras
+    bloom.add(hi[:6_400], lo[:6_400])
+    assert bloom.might_contain(hi[6_400:], lo[6_400:]).mean() < 0.05
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_processing import aggregate_data, clean_data, transform_data
+from src.pipeline import DTYPES, estimate_chunk_rows, merge_partials, partial_aggregate, read_chunks, run_pipeline, process_chunks
+
+
+def generate_events(rows, seed=0):
+    """
+    Genera eventos sintéticos con nulos y con filas duplicadas repartidas por todo el
+    fichero (de modo que caen en bloques distintos).
+    """
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'date': pd.to_datetime('2020-01-01') + pd.to_timedelta(rng.integers(0, 1500, rows), unit='D'),
+        'category': rng.choice(list('ABCDEFGH'), rows),
+        'value': rng.integers(0, 1000, rows).astype(float),
+    })
+    df['date'] = df['date'].dt.strftime('%Y-%m-%d')
+    df.loc[rng.choice(rows, rows // 50, replace=False), 'value'] = None
+    df.loc[rng.choice(rows, rows // 50, replace=False), 'date'] = None
+    duplicates = df.sample(rows // 10, random_state=seed)
+    return pd.concat([df, duplicates]).sample(frac=1, random_state=seed + 1).reset_index(drop=True)
+
+
+@pytest.fixture
+def events_csv(tmp_path):
+    path = tmp_path / 'events.csv'
+    generate_events(60_000).to_csv(path, index=False)
+    return path
+
+
+def in_memory_result(df):
+    return aggregate_data(transform_data(clean_data(df)))
+
+
+def test_pipeline_por_bloques_igual_al_de_memoria(events_csv):
+    """
+    Prueba que el pipeline por bloques, con un presupuesto de memoria menor que los datos,
+    produce el mismo resultado que el pipeline en memoria.
+    """
+    budget = 256 * 1024
+    full = pd.read_csv(events_csv, dtype=DTYPES)
+    assert full.memory_usage(deep=True).sum() > 10 * budget
+
+    chunk_rows = estimate_chunk_rows(events_csv, budget)
+    chunks = list(read_chunks(events_csv, chunk_rows))
+    assert len(chunks) > 10
+    assert max(chunk.memory_usage(deep=True).sum() for chunk in chunks) <= budget
+
+    expected = in_memory_result(full)
+    pd.testing.assert_series_equal(run_pipeline(events_csv, memory_budget=budget), expected)
+
+
+def test_pipeline_parquet_y_varios_ficheros(tmp_path):
+    """Prueba la lectura de Parquet por lotes y de varios ficheros como un único flujo."""
+    df = generate_events(20_000, seed=3)
+    half = len(df) // 2
+    paths = [tmp_path / 'a.parquet', tmp_path / 'b.csv']
+    df.iloc[:half].to_parquet(paths[0], index=False)
+    df.iloc[half:].to_csv(paths[1], index=False)
+    result = run_pipeline(paths, chunk_rows=1_000)
+    pd.testing.assert_series_equal(result, in_memory_result(df.astype(DTYPES)))
+
+
+def test_agregados_parciales_combinables():
+    """Prueba que la combinación de agregados parciales da la media global."""
+    left = partial_aggregate(pd.DataFrame({'category': ['A', 'B'], 'value': [1.0, 4.0]}))
+    right = partial_aggregate(pd.DataFrame({'category': ['A', 'C'], 'value': [3.0, 5.0]}))
+    merged = merge_partials(left, right)
+    assert merged.loc['A', 'sum'] == 4.0 and merged.loc['A', 'count'] == 2
+    assert process_chunks([]).empty
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+import pytest
+
+from src.plotting import Renderer, lttb, render_chart, render_many
+
+
+def time_series(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'date': pd.date_range('2020-01-01', periods=rows, freq='min'),
+        'value': rng.normal(size=rows).cumsum(),
+    })
+
+
+def test_lttb_conserva_extremos():
+    """Prueba que LTTB conserva el primer y el último punto y un pico aislado."""
+    y = np.zeros(10_000)
+    y[4_321] = 100.0
+    indices = lttb(np.arange(len(y)), y, 100)
+    assert len(indices) == 100
+    assert indices[0] == 0 and indices[-1] == len(y) - 1
+    assert np.all(np.diff(indices) > 0)
+    assert 4_321 in indices
+    np.testing.assert_array_equal(lttb(np.arange(50), np.arange(50), 100), np.arange(50))
+
+
+def test_renderer_devuelve_bytes_sin_pyplot():
+    """
+    Prueba que Renderer devuelve PNG y SVG reutilizando la figura, con series largas reducidas,
+    sin dejar figuras en pyplot.
+    """
+    renderer = Renderer()
+    long_series = time_series(200_000)
+    png = renderer.render('time_series', long_series, title='serie')
+    assert png.startswith(b'\x89PNG')
+    assert len(renderer.ax.lines[0].get_xdata()) == 2_000
+    bars = pd.DataFrame({'category': list('ABCAB'), 'value': [1.0, 2.0, 3.0, 3.0, 4.0]})
+    svg = renderer.render('bars', bars, fmt='svg')
+    assert b'<svg' in svg
+    assert len(renderer.ax.patches) == 3 and not renderer.ax.lines
+    assert render_chart('time_series', long_series, title='serie') == png
+
+    other = time_series(3_000, seed=1)
+    renderer.render('time_series', long_series)
+    assert renderer.render('time_series', other) == render_chart('time_series', other)
+    assert plt.get_fignums() == []
+
+
+def test_render_many_en_procesos():
+    """Prueba que render_many da las mismas imágenes, en orden, con uno o varios procesos."""
+    charts = [{'kind': 'time_series', 'df': time_series(5_000, seed), 'title': str(seed)} for seed in range(6)]
+    sequential = render_many(charts, workers=1)
+    assert len(set(sequential)) == 6
+    assert render_many(charts, workers=2) == sequential
+
+
+def test_renderer_con_fechas_en_texto_y_opciones():
+    """
+    Prueba que dos series seguidas con fechas en texto no acumulan las categorías del eje x, y
+    que max_points se acepta con cualquier tipo de gráfica (solo reduce las series temporales).
+    """
+    renderer = Renderer()
+    first = time_series(500).assign(date=lambda frame: frame['date'].dt.strftime('%Y-%m-%d %H:%M'))
+    second = time_series(300, seed=1).assign(date=lambda frame: frame['date'].dt.strftime('%d/%m %H:%M'))
+    renderer.render('time_series', first)
+    assert renderer.render('time_series', second) == render_chart('time_series', second)
+    assert renderer.ax.get_xlim()[1] < 400
+
+    bars = pd.DataFrame({'category': list('ABCAB'), 'value': [1.0, 2.0, 3.0, 3.0, 4.0]})
+    assert renderer.render('bars', bars, max_points=100) == render_chart('bars', bars)
+    renderer.render('time_series', time_series(5_000), max_points=100)
+    assert len(renderer.ax.lines[0].get_xdata()) == 100
+    with pytest.raises(ValueError):
+        renderer.render('pie', bars)
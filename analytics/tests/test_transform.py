@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_processing import CALENDAR_FIELDS, infer_date_format, transform_data
+
+
+@pytest.fixture
+def dates_df():
+    rng = np.random.default_rng(0)
+    dates = pd.date_range('2020-01-01', periods=400).strftime('%Y-%m-%d').to_numpy(dtype=object)
+    df = pd.DataFrame({'date': rng.choice(dates, 5_000), 'value': rng.random(5_000)})
+    df.loc[::97, 'date'] = None
+    return df
+
+
+def test_igual_que_to_datetime(dates_df):
+    """Prueba que las fechas y los campos de calendario coinciden con to_datetime y .dt, nulos incluidos."""
+    result = transform_data(dates_df, fields=tuple(CALENDAR_FIELDS))
+    expected = pd.to_datetime(dates_df['date'])
+    pd.testing.assert_series_equal(result['date'], expected)
+    for field, derive in CALENDAR_FIELDS.items():
+        pd.testing.assert_series_equal(result[field], derive(expected).rename(field), check_dtype=False)
+    clean = transform_data(dates_df.dropna())
+    assert clean['year'].dtype == pd.to_datetime(dates_df['date'].dropna()).dt.year.dtype
+
+
+def test_no_modifica_la_entrada_salvo_inplace(dates_df):
+    """Prueba que transform_data no modifica el DataFrame recibido salvo con inplace=True."""
+    original = dates_df.copy()
+    transform_data(dates_df)
+    pd.testing.assert_frame_equal(dates_df, original)
+    assert transform_data(dates_df, inplace=True) is dates_df
+    assert 'year' in dates_df and pd.api.types.is_datetime64_any_dtype(dates_df['date'])
+
+
+def test_formato_explicito_y_detectado():
+    """Prueba la detección del formato con el primer valor y un formato explícito (día primero)."""
+    assert infer_date_format(pd.Series([None, '2023/01/31 10:30:00'])) == '%Y/%m/%d %H:%M:%S'
+    df = pd.DataFrame({'date': ['31/01/2023', '01/02/2024', '31/01/2023']})
+    result = transform_data(df, date_format='%d/%m/%Y', fields=('year', 'month'))
+    assert result['month'].tolist() == [1, 2, 1]
+    assert result['year'].tolist() == [2023, 2024, 2023]
@@ -0,0 +1,163 @@
+# alphapp.xyz/content/benchmarks/bench_asgi.py
+
+"""
+Prueba de carga de la API de contenidos: aplicación Flask (servidor WSGI con hilos)
+frente a la aplicación ASGI (uvicorn), ambas sobre el mismo archivo SQLite.
+Abre N conexiones concurrentes con keep-alive que alternan GET /articles/<id> y
+GET /articles?limit=20, y mide solicitudes por segundo y latencias p50/p99.
+
+Uso (desde el directorio del servicio; la parte ASGI requiere uvicorn):
+    python -m benchmarks.bench_asgi
+    python -m benchmarks.bench_asgi --connections 1000 --requests 20
+"""
+
+import argparse
+import asyncio
+import datetime
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from src.database import build_engine, create_session_factory
+from src.models import Article, Base
+
+SERVERS = {
+    "Flask (WSGI, hilos)": [sys.executable, "-c",
+        "import sys; from werkzeug.serving import run_simple; from src.views import app; "
+        "run_simple('127.0.0.1', int(sys.argv[1]), app, threaded=True)"],
+    "ASGI (uvicorn)": [sys.executable, "-m", "uvicorn", "src.asgi:app", "--host", "127.0.0.1",
+                       "--log-level", "warning", "--backlog", "4096", "--no-access-log", "--port"],
+}
+
+
+def seed_database(path, count):
+    """Crea la base de datos SQLite con `count` artículos."""
+    engine = build_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    session = create_session_factory(engine)()
+    base = datetime.datetime(2024, 1, 1)
+    session.add_all([
+        Article(title=f"Artículo {i}", content="Contenido " * 20, author_id=i % 50, publication_date=base + datetime.timedelta(minutes=i))
+        for i in range(count)
+    ])
+    session.commit()
+    engine.dispose()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_listening(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"El servidor no escucha en el puerto {port}")
+
+
+async def read_response(reader):
+    """Lee una respuesta HTTP/1.1 con Content-Length; devuelve (estado, cerrar conexión)."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Conexión cerrada por el servidor")
+    length, close = 0, False
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        name = name.strip().lower()
+        if name == "content-length":
+            length = int(value)
+        elif name == "connection" and value.strip().lower() == "close":
+            close = True
+    await reader.readexactly(length)
+    return int(status_line.split()[1]), close
+
+
+async def connection_worker(port, paths, requests, latencies, errors, start_event):
+    await start_event.wait()
+    reader = writer = None
+    for _ in range(requests):
+        path = random.choice(paths)
+        started = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+            await writer.drain()
+            status, close = await read_response(reader)
+            if status != 200:
+                raise RuntimeError(f"Estado {status}")
+            latencies.append(time.perf_counter() - started)
+            if close:
+                writer.close()
+                writer = None
+        except Exception:
+            errors.append(path)
+            if writer is not None:
+                writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def run_load(port, connections, requests, article_count):
+    paths = [f"/articles/{random.randint(1, article_count)}" for _ in range(200)] + ["/articles?limit=20"] * 200
+    latencies, errors = [], []
+    start_event = asyncio.Event()
+    workers = [asyncio.create_task(connection_worker(port, paths, requests, latencies, errors, start_event)) for _ in range(connections)]
+    started = time.perf_counter()
+    start_event.set()
+    await asyncio.gather(*workers)
+    return latencies, errors, time.perf_counter() - started
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=20, help="Solicitudes por conexión")
+    parser.add_argument("--articles", type=int, default=10_000)
+    args = parser.parse_args()
+
+    # Cada conexión concurrente necesita un descriptor de archivo en el cliente
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (min(hard, max(soft, args.connections * 2 + 256)), hard))
+
+    print(f"{args.connections} conexiones x {args.requests} solicitudes, {args.articles} artículos en SQLite")
+    print(f"{'servidor':>22} {'sol/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'errores':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, "contents.db")
+        seed_database(database, args.articles)
+        env = {**os.environ, "CONTENT_DATABASE_URL": f"sqlite:///{database}"}
+        for name, command in SERVERS.items():
+            port = free_port()
+            server = subprocess.Popen(command + [str(port)], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                wait_until_listening(port)
+                latencies, errors, elapsed = asyncio.run(run_load(port, args.connections, args.requests, args.articles))
+            finally:
+                server.terminate()
+                server.wait()
+            print(f"{name:>22} {len(latencies) / elapsed:>10.0f} {percentile(latencies, 0.5) * 1e3:>9.1f} "
+                  f"{percentile(latencies, 0.99) * 1e3:>9.1f} {len(errors):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# alphapp.xyz/content/benchmarks/bench_authors.py
+
+"""
+Benchmark de la expansión de autores de una página de artículos contra un servicio de
+usuarios local sustituto (HTTP, con latencia simulada por solicitud): una llamada por
+artículo (N+1) frente a una llamada por lotes y frente a la caché con TTL ya caliente.
+
+Uso (desde el directorio del servicio):
+    python -m benchmarks.bench_authors
+    python -m benchmarks.bench_authors --page-size 100 --latency-ms 5
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from src.authors import AuthorResolver, HttpUserSource, expand_authors
+
+
+def start_users_service(latency):
+    """Servicio de usuarios sustituto: GET /users?ids=... con `latency` segundos por solicitud."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(latency)
+            ids = [int(i) for i in parse_qs(urlparse(self.path).query)["ids"][0].split(",")]
+            body = json.dumps({"data": [{"id": i, "username": f"usuario{i}"} for i in ids]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--authors", type=int, default=1000, help="Autores distintos en el catálogo")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="Latencia simulada por solicitud")
+    parser.add_argument("--pages", type=int, default=20)
+    args = parser.parse_args()
+
+    server = start_users_service(args.latency_ms / 1000)
+    source = HttpUserSource(f"http://127.0.0.1:{server.server_port}")
+    rng = random.Random(5)
+    pages = [
+        [{"id": i, "author_id": rng.randrange(1, args.authors + 1)} for i in range(args.page_size)]
+        for _ in range(args.pages)
+    ]
+
+    def n_plus_one(page):
+        return [{**article, "author": source.fetch_many([article["author_id"]]).get(article["author_id"])} for article in page]
+
+    cached_resolver = AuthorResolver(source)
+    for page in pages:
+        expand_authors(page, cached_resolver) # Calienta la caché
+    strategies = {
+        "una llamada por artículo": n_plus_one,
+        "por lotes, sin caché": lambda page: expand_authors(page, AuthorResolver(source)),
+        "por lotes, caché caliente": lambda page: expand_authors(page, cached_resolver),
+    }
+    print(f"Página de {args.page_size} artículos, latencia {args.latency_ms} ms por solicitud")
+    print(f"{'estrategia':>28} {'ms por página':>14}")
+    for name, expand in strategies.items():
+        started = time.perf_counter()
+        for page in pages:
+            expand(page)
+        print(f"{name:>28} {(time.perf_counter() - started) / len(pages) * 1e3:>14.2f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
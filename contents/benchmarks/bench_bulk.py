@@ -0,0 +1,77 @@
+# alphapp.xyz/content/benchmarks/bench_bulk.py
+
+"""
+Benchmark de importación de artículos: un POST /articles por artículo frente a
+una única solicitud POST /articles/bulk (lista JSON y NDJSON), usando el cliente
+de prueba de Flask. Con --sqlite se usa el repositorio SQL sobre un archivo SQLite.
+
+Uso (desde el directorio del servicio):
+    python -m benchmarks.bench_bulk
+    python -m benchmarks.bench_bulk --count 10000 --sqlite
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import src.views as views
+from src.database import build_engine, create_session_factory
+from src.models import Base
+from src.repository import IndexedContentRepository
+from src.sql_repository import SqlAlchemyContentRepository
+
+
+def make_repository(use_sqlite, directory, name):
+    if not use_sqlite:
+        return IndexedContentRepository()
+    engine = build_engine(f"sqlite:///{os.path.join(directory, name)}.db")
+    Base.metadata.create_all(engine)
+    return SqlAlchemyContentRepository(create_session_factory(engine))
+
+
+def articles(count):
+    return [{"title": f"Artículo {i}", "content": "Contenido " * 20, "tags": ["importado"]} for i in range(count)]
+
+
+def per_request(client, payloads):
+    for payload in payloads:
+        assert client.post("/articles", json=payload).status_code == 201
+
+
+def bulk_json(client, payloads):
+    response = client.post("/articles/bulk", json=[{"op": "create", "data": p} for p in payloads])
+    assert response.get_json()["summary"]["created"] == len(payloads)
+
+
+def bulk_ndjson(client, payloads):
+    body = "\n".join(json.dumps({"op": "create", "data": p}) for p in payloads)
+    response = client.post("/articles/bulk", data=body, content_type="application/x-ndjson")
+    assert response.get_json()["summary"]["created"] == len(payloads)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=10_000)
+    parser.add_argument("--sqlite", action="store_true", help="Usar el repositorio SQL sobre SQLite")
+    args = parser.parse_args()
+
+    payloads = articles(args.count)
+    timings = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, run in (("POST /articles x N", per_request), ("bulk JSON", bulk_json), ("bulk NDJSON", bulk_ndjson)):
+            views.content_repository = make_repository(args.sqlite, directory, name.split()[1])
+            with views.app.test_client() as client:
+                start = time.perf_counter()
+                run(client, payloads)
+                timings[name] = time.perf_counter() - start
+
+    baseline = timings["POST /articles x N"]
+    print(f"{args.count} artículos ({'SQLite' if args.sqlite else 'memoria'})")
+    for name, seconds in timings.items():
+        print(f"{name:>20}: {seconds:8.3f} s  ({baseline / seconds:6.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
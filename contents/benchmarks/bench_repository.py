@@ -0,0 +1,102 @@
+# alphapp.xyz/content/benchmarks/bench_repository.py
+
+"""
+Micro-benchmark de latencia por operación del repositorio de artículos.
+Compara el recorrido lineal de la lista original con el repositorio indexado
+para GET, PUT y DELETE por ID con 10k, 100k y 1M artículos.
+
+Uso (desde el directorio del servicio):
+    python -m benchmarks.bench_repository
+    python -m benchmarks.bench_repository --sizes 10000 100000
+"""
+
+import argparse
+import datetime
+import random
+import time
+
+from src.repository import IndexedContentRepository
+
+
+class LinearContentRepository:
+    """Réplica del repositorio original basado en una lista (recorridos O(n))."""
+    def __init__(self, articles):
+        self._articles = list(articles)
+
+    def get_article_by_id(self, article_id):
+        for article in self._articles:
+            if article["id"] == article_id:
+                return article
+        return None
+
+    def update_article(self, article_id, update_data):
+        for article in self._articles:
+            if article["id"] == article_id:
+                article.update(update_data)
+                return article
+        return None
+
+    def delete_article(self, article_id):
+        initial_count = len(self._articles)
+        self._articles = [article for article in self._articles if article["id"] != article_id]
+        return len(self._articles) < initial_count
+
+
+def generate_articles(count):
+    """Genera `count` artículos sintéticos."""
+    base = datetime.datetime(2020, 1, 1)
+    return [
+        {
+            "id": i,
+            "title": f"Artículo {i}",
+            "content": "Contenido",
+            "author_id": i % 1000,
+            "author": f"Autor ID {i % 1000}",
+            "publication_date": base + datetime.timedelta(seconds=i),
+            "tags": [f"tag{i % 50}", f"tag{i % 7}"],
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def time_per_op(operation, ids):
+    """Devuelve la latencia media por operación en microsegundos."""
+    start = time.perf_counter()
+    for article_id in ids:
+        operation(article_id)
+    return (time.perf_counter() - start) / len(ids) * 1e6
+
+
+def run(size, ops, linear_ops):
+    articles = generate_articles(size)
+    rng = random.Random(size)
+    results = {}
+    for name, factory, count in (
+        ("lineal", lambda: LinearContentRepository([dict(a) for a in articles]), linear_ops),
+        ("indexado", lambda: IndexedContentRepository(articles), ops),
+    ):
+        repository = factory()
+        ids = rng.sample(range(1, size + 1), count)
+        results[name] = (
+            time_per_op(repository.get_article_by_id, ids),
+            time_per_op(lambda i: repository.update_article(i, {"title": "Nuevo"}), ids),
+            time_per_op(repository.delete_article, ids),
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--ops", type=int, default=10_000, help="Operaciones sobre el repositorio indexado")
+    parser.add_argument("--linear-ops", type=int, default=20, help="Operaciones sobre el repositorio lineal")
+    args = parser.parse_args()
+
+    print(f"{'artículos':>10} {'repositorio':>12} {'GET µs':>10} {'PUT µs':>10} {'DELETE µs':>10}")
+    for size in args.sizes:
+        for name, (get_us, put_us, delete_us) in run(size, min(args.ops, size), min(args.linear_ops, size)).items():
+            print(f"{size:>10} {name:>12} {get_us:>10.2f} {put_us:>10.2f} {delete_us:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# alphapp.xyz/content/benchmarks/bench_search.py
+
+"""
+Benchmark del índice de búsqueda: latencia de consulta (p50/p99) con 1M de artículos
+sintéticos para términos raros, intermedios, frecuentes y consultas de dos términos,
+frente al filtrado por subcadena que recorría todos los artículos. También mide la
+construcción del índice y su carga desde disco tras un reinicio.
+
+Uso (desde el directorio del servicio):
+    python -m benchmarks.bench_search
+    python -m benchmarks.bench_search --articles 100000
+"""
+
+import argparse
+import itertools
+import random
+import resource
+import tempfile
+import time
+
+from src.search import SearchIndex
+
+VOCABULARY = 50_000
+
+
+def synthetic_articles(count, seed=7):
+    """Artículos con palabras de un vocabulario con distribución de Zipf."""
+    rng = random.Random(seed)
+    words = [f"palabra{i}" for i in range(VOCABULARY)]
+    cumulative = list(itertools.accumulate(1 / (rank + 1) for rank in range(VOCABULARY)))
+    for article_id in range(1, count + 1):
+        sample = rng.choices(words, cum_weights=cumulative, k=48)
+        yield {"id": article_id, "title": " ".join(sample[:6]), "content": " ".join(sample[6:]), "tags": sample[:1]}
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    return ordered[len(ordered) // 2], ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--articles", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=200, help="Consultas por tipo")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = SearchIndex(directory, segment_size=250_000)
+        start = time.perf_counter()
+        index.rebuild(synthetic_articles(args.articles))
+        build = time.perf_counter() - start
+        index.close()
+        start = time.perf_counter()
+        index = SearchIndex(directory)
+        load = time.perf_counter() - start
+        print(f"{args.articles} artículos: construcción {build:.1f} s, carga desde disco {load:.1f} s, "
+              f"RSS máx. {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB")
+
+        rng = random.Random(11)
+        kinds = {
+            "término raro": lambda: f"palabra{rng.randrange(10_000, VOCABULARY)}",
+            "término intermedio": lambda: f"palabra{rng.randrange(100, 1_000)}",
+            "término frecuente": lambda: f"palabra{rng.randrange(0, 10)}",
+            "dos términos": lambda: f"palabra{rng.randrange(10, 1_000)} palabra{rng.randrange(1_000, 10_000)}",
+        }
+        print(f"{'consulta':>20} {'p50 ms':>9} {'p99 ms':>9} {'resultados':>11}")
+        for name, make_query in kinds.items():
+            timings, matches = [], 0
+            for _ in range(args.queries):
+                query = make_query()
+                started = time.perf_counter()
+                matches += len(index.top(query, 21))
+                timings.append(time.perf_counter() - started)
+            p50, p99 = percentiles(timings)
+            print(f"{name:>20} {p50 * 1e3:>9.2f} {p99 * 1e3:>9.2f} {matches / args.queries:>11.1f}")
+
+        # Camino anterior: subcadena sin distinguir mayúsculas sobre todos los artículos
+        articles = [(a["title"].casefold(), a["content"].casefold()) for a in synthetic_articles(args.articles)]
+        timings = []
+        for _ in range(5):
+            needle = f"palabra{rng.randrange(10_000, VOCABULARY)}"
+            started = time.perf_counter()
+            [i for i, (title, content) in enumerate(articles) if needle in title or needle in content]
+            timings.append(time.perf_counter() - started)
+        print(f"{'subcadena (antes)':>20} {percentiles(timings)[0] * 1e3:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
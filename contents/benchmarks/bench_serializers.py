@@ -0,0 +1,59 @@
+# alphapp.xyz/content/benchmarks/bench_serializers.py
+
+"""
+Benchmark de serialización de artículos: serializador campo a campo con .get() y
+json estándar (camino original) frente al esquema compilado codificado a bytes
+(orjson si está instalado), para 1, 100 y 10k artículos.
+
+Uso (desde el directorio del servicio):
+    python -m benchmarks.bench_serializers
+"""
+
+import argparse
+import datetime
+import json
+import timeit
+
+import src.serializers as serializers
+from src.views import ConceptualArticleSerializer
+
+
+def legacy_serialize(article):
+    """Serialización original de ConceptualArticleSerializer."""
+    return {
+        "id": article.get("id"),
+        "title": article.get("title"),
+        "content": article.get("content"),
+        "author": article.get("author"),
+        "publication_date": article.get("publication_date").isoformat() if article.get("publication_date") else None,
+        "tags": article.get("tags", [])
+    }
+
+
+def legacy_path(articles):
+    return json.dumps([legacy_serialize(article) for article in articles]).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10_000])
+    args = parser.parse_args()
+
+    serializer = ConceptualArticleSerializer()
+    base = datetime.datetime(2024, 1, 1)
+    backend = "orjson" if serializers.orjson is not None else "json"
+    print(f"{'artículos':>10} {'original µs':>14} {'compilado µs':>14} {'aceleración':>12}  (backend: {backend})")
+    for size in args.sizes:
+        articles = [
+            {"id": i, "title": f"Artículo {i}", "content": "Contenido del artículo. " * 10, "author": f"Autor {i % 100}",
+             "publication_date": base + datetime.timedelta(minutes=i), "tags": ["tecnología", "ejemplo"]}
+            for i in range(size)
+        ]
+        number = max(1, 100_000 // size)
+        legacy = timeit.timeit(lambda: legacy_path(articles), number=number) / number * 1e6
+        compiled = timeit.timeit(lambda: serializers.dumps(serializer.serialize_many(articles)), number=number) / number * 1e6
+        print(f"{size:>10} {legacy:>14.1f} {compiled:>14.1f} {legacy / compiled:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
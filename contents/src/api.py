@@ -0,0 +1,275 @@
+# alphapp.xyz/content/src/api.py
+
+"""
+Lógica de los endpoints de artículos compartida por la aplicación Flask (views.py) y la
+aplicación ASGI (asgi.py): validación de la entrada, solicitudes condicionales, caché de
+cuerpos, expansión de autores y códigos de estado.
+
+Los manejadores de ArticleApi no dependen del framework ni de si el repositorio es síncrono
+o asíncrono: son generadores que ceden el resultado de cada llamada al repositorio (o al
+resolvedor de autores) y reciben el valor, y devuelven una ApiResponse. run_sync los
+ejecuta con un repositorio síncrono (el valor cedido ya es el resultado) y run_async con uno
+asíncrono (el valor cedido es una corrutina que se espera). Cada aplicación solo traduce su
+solicitud (args, cabeceras condicionales y cuerpo JSON) y convierte la ApiResponse a su
+respuesta.
+"""
+
+import datetime
+
+from .authors import AuthorResolver, StaticUserSource, author_resolver_from_config, parse_expand, with_authors
+from .conditional import PreconditionFailed, article_etag, collection_etag, expected_version, is_not_modified, last_modified, representation_etag
+from .pagination import clamp_limit, cursor_for, parse_list_params
+from .repository import IndexedContentRepository, VersionConflictError
+from .serializers import dumps
+
+
+# Simulación conceptual de interacción con la base de datos/modelos (modo en memoria de
+# ambas aplicaciones), apoyada en el repositorio en memoria con índices definido en repository.py
+class ConceptualContentRepository(IndexedContentRepository):
+    """Simula la interacción con la capa de datos."""
+    def __init__(self):
+        # Simulación de una base de datos en memoria
+        super().__init__([
+            {"id": 1, "title": "Artículo de Prueba 1", "content": "Contenido del artículo 1.", "author_id": 101, "author": "Autor Ejemplo 1", "publication_date": datetime.datetime.utcnow() - datetime.timedelta(days=5), "tags": ["tecnología", "ejemplo"]},
+            {"id": 2, "title": "Artículo de Prueba 2", "content": "Contenido del artículo 2.", "author_id": 102, "author": "Autor Ejemplo 2", "publication_date": datetime.datetime.utcnow() - datetime.timedelta(days=2), "tags": ["programación", "ejemplo"]}
+        ])
+
+
+def create_author_resolver():
+    """
+    Crea el resolvedor de autores para ?expand=author: el servicio de usuarios configurado en
+    [authors] o, si no hay URL, los autores de ejemplo del repositorio simulado.
+    """
+    resolver = author_resolver_from_config()
+    if resolver is None:
+        resolver = AuthorResolver(StaticUserSource({
+            101: {"id": 101, "username": "Autor Ejemplo 1"},
+            102: {"id": 102, "username": "Autor Ejemplo 2"},
+        }))
+    return resolver
+
+
+class ApiResponse:
+    """Respuesta de un manejador: cuerpo JSON en bytes, código de estado y cabeceras ETag/Last-Modified."""
+
+    def __init__(self, body=b"", status=200, etag=None, last_modified=None):
+        self.body = body
+        self.status = status
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+def json_response(data, status=200):
+    """Respuesta JSON codificada con el backend rápido de serializers.dumps."""
+    return ApiResponse(dumps(data), status)
+
+
+def message(text, status):
+    return json_response({"message": text}, status)
+
+
+def article_response(body, article, status=200):
+    """Respuesta de un artículo con su ETag y Last-Modified (body vacío para 304/412 sin cuerpo propio)."""
+    return ApiResponse(body, status, article_etag(article), last_modified(article))
+
+
+def precondition_failed(article):
+    """Respuesta 412 cuando If-Match no coincide con la versión actual del artículo."""
+    body = dumps({"message": "El artículo ha sido modificado por otra solicitud"})
+    if article is None:
+        return ApiResponse(body, 412) # Precondition Failed
+    return article_response(body, article, 412)
+
+
+def run_sync(handler):
+    """Ejecuta un manejador de ArticleApi con un repositorio síncrono."""
+    try:
+        result = next(handler)
+        while True:
+            result = handler.send(result)
+    except StopIteration as stop:
+        return stop.value
+
+
+async def run_async(handler):
+    """Ejecuta un manejador de ArticleApi con un repositorio asíncrono (espera cada corrutina cedida)."""
+    try:
+        awaitable = next(handler)
+        while True:
+            try:
+                result = await awaitable
+            except Exception as error:
+                awaitable = handler.throw(error) # La excepción se lanza en el manejador, donde se cedió la llamada
+            else:
+                awaitable = handler.send(result)
+    except StopIteration as stop:
+        return stop.value
+
+
+class ArticleApi:
+    """
+    Manejadores de /articles, /articles/<id> y /tags sobre `repository`.
+    `authors` (authors.AuthorResolver) habilita ?expand=author; sin él, la expansión responde 400.
+    Con `is_async` el repositorio es asíncrono y los manejadores se ejecutan con run_async.
+    """
+
+    def __init__(self, repository, serializer, cache=None, authors=None, is_async=False):
+        self.repository = repository
+        self.serializer = serializer
+        self.cache = cache
+        self.authors = authors
+        self.is_async = is_async
+
+    def encoded_article(self, article):
+        """
+        Devuelve el cuerpo JSON codificado de un artículo, usando la caché de respuestas
+        (entrada por ID marcada con el ETag) para no volver a serializar artículos sin cambios.
+        """
+        if self.cache is None:
+            return dumps(self.serializer.serialize(article))
+        body = self.cache.get(article["id"], article_etag(article))
+        if body is None:
+            body = dumps(self.serializer.serialize(article))
+            self.cache.set(article["id"], article_etag(article), body)
+        return body
+
+    def parse_expand(self, args):
+        """Relaciones pedidas en `expand`; ValueError si no existen o no hay resolvedor de autores."""
+        expand = parse_expand(args)
+        if expand and self.authors is None:
+            raise ValueError("La expansión de autores no está configurada")
+        return expand
+
+    def resolve_authors(self, articles):
+        """Autores de los artículos en una sola resolución por lotes (corrutina si is_async)."""
+        author_ids = [article.get("author_id") for article in articles]
+        return self.authors.resolve_async(author_ids) if self.is_async else self.authors.resolve(author_ids)
+
+    # --- Manejadores ---
+
+    def list_articles(self, request):
+        # Parámetros de paginación (por cursor), filtrado y búsqueda
+        try:
+            list_params = parse_list_params(request.args)
+            expand = self.parse_expand(request.args)
+        except ValueError as e:
+            return message(str(e), 400) # Bad Request
+
+        # Solo la página solicitada; el filtrado y el orden se resuelven en el repositorio
+        try:
+            page, has_more = yield self.repository.list_articles(**list_params)
+        except ValueError as e: # Cursor de otro tipo de listado (por ejemplo, de una búsqueda)
+            return message(str(e), 400)
+
+        # ETag de la página: 304 sin serializar si el cliente ya la tiene
+        etag = collection_etag(page, {**list_params, "has_more": has_more})
+        if "author" in expand:
+            # Todos los autores de la página en una sola llamada al servicio de usuarios
+            page = with_authors(page, (yield self.resolve_authors(page)))
+            etag = representation_etag(etag, [article["author"] for article in page])
+        if is_not_modified(request, etag):
+            return ApiResponse(status=304, etag=etag)
+
+        response = json_response({
+            "data": self.serializer.serialize_many(page),
+            "pagination": {
+                "limit": list_params["limit"],
+                "has_more": has_more,
+                "next_cursor": cursor_for(page[-1]) if has_more else None
+            }
+        })
+        response.etag = etag
+        return response
+
+    def list_tags(self, request):
+        # Nube de etiquetas: etiquetas en uso con su número de artículos
+        try:
+            limit = clamp_limit(request.args.get("limit"))
+        except ValueError:
+            return message("El parámetro 'limit' debe ser un entero", 400)
+        return json_response({"data": (yield self.repository.tag_counts(limit))})
+
+    def create_article(self, data):
+        # Deserializar y validar los datos entrantes
+        deserialized_data = self.serializer.deserialize(data) if isinstance(data, dict) else None
+        if deserialized_data is None:
+            return message("Datos de entrada no válidos", 400)
+        try:
+            new_article = yield self.repository.create_article(deserialized_data)
+        except Exception as e:
+            print(f"Error al crear artículo: {e}")
+            return message("Error interno al crear artículo", 500)
+        # Cuerpo del nuevo artículo (y entrada en la caché), con código 201 Created
+        return ApiResponse(self.encoded_article(new_article), 201)
+
+    def get_article(self, request, article_id):
+        try:
+            expand = self.parse_expand(request.args)
+        except ValueError as e:
+            return message(str(e), 400)
+        article = yield self.repository.get_article_by_id(article_id)
+        if article is None:
+            return message("Artículo no encontrado", 404)
+
+        if "author" in expand:
+            # Representación con el autor expandido: no usa la caché de cuerpos y su ETag incluye al autor
+            [expanded] = with_authors([article], (yield self.resolve_authors([article])))
+            etag = representation_etag(article_etag(article), expanded["author"])
+            if is_not_modified(request, etag):
+                return ApiResponse(status=304, etag=etag)
+            return ApiResponse(dumps(self.serializer.serialize(expanded)), 200, etag)
+
+        # GET condicional (If-None-Match / If-Modified-Since): 304 sin serializar
+        if is_not_modified(request, article_etag(article), last_modified(article)):
+            return article_response(b"", article, 304)
+        # Cuerpo JSON del artículo, servido desde la caché si no ha cambiado
+        return article_response(self.encoded_article(article), article)
+
+    def update_article(self, request, article_id, data):
+        article = yield self.repository.get_article_by_id(article_id)
+        if article is None:
+            return message("Artículo no encontrado", 404)
+        # Concurrencia optimista: If-Match debe coincidir con el ETag actual
+        try:
+            version = expected_version(request, article)
+        except PreconditionFailed:
+            return precondition_failed(article)
+
+        # Solo los campos permitidos para actualizar (actualización parcial)
+        update_data = self.serializer.deserialize_update(data) if isinstance(data, dict) else {}
+        if update_data is None:
+            return message("Datos de entrada no válidos", 400)
+        if not update_data:
+            return message("No hay campos válidos para actualizar", 400)
+        try:
+            updated_article = yield self.repository.update_article(article_id, update_data, expected_version=version)
+        except VersionConflictError:
+            return precondition_failed((yield self.repository.get_article_by_id(article_id)))
+        except Exception as e:
+            print(f"Error al actualizar artículo: {e}")
+            return message("Error interno al actualizar artículo", 500)
+        if updated_article is None:
+            return message("Artículo no encontrado", 404) # Eliminado entre la lectura y la actualización
+        # Cuerpo del artículo actualizado, que reemplaza su entrada en la caché (write-through)
+        return article_response(self.encoded_article(updated_article), updated_article)
+
+    def delete_article(self, request, article_id):
+        article = yield self.repository.get_article_by_id(article_id)
+        if article is None:
+            return message("Artículo no encontrado", 404)
+        try:
+            version = expected_version(request, article)
+        except PreconditionFailed:
+            return precondition_failed(article)
+        try:
+            is_deleted = yield self.repository.delete_article(article_id, expected_version=version)
+        except VersionConflictError:
+            return precondition_failed((yield self.repository.get_article_by_id(article_id)))
+        except Exception as e:
+            print(f"Error al eliminar artículo: {e}")
+            return message("Error interno al eliminar artículo", 500)
+        if not is_deleted:
+            return message("Artículo no encontrado", 404)
+        if self.cache is not None:
+            self.cache.invalidate(article_id)
+        return message(f"Artículo con ID {article_id} eliminado", 200)
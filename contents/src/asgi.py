@@ -0,0 +1,152 @@
+# alphapp.xyz/content/src/asgi.py
+
+"""
+Variante ASGI de la API de contenidos: expone las mismas rutas /articles,
+/articles/<id> y /tags que la aplicación Flask (views.py), pero las llamadas al repositorio
+son corrutinas, de modo que un worker atiende otras solicitudes mientras espera
+al almacenamiento.
+
+Los manejadores son los de la aplicación Flask (api.ArticleApi, ejecutados con
+api.run_async); aquí solo se leen las solicitudes del protocolo ASGI y se envían las
+respuestas. En modo en memoria se sirve el mismo repositorio simulado que en Flask.
+La exportación en streaming y /articles/bulk siguen disponibles solo en la aplicación Flask.
+
+Uso (desde el directorio del servicio):
+    uvicorn src.asgi:app --workers 4
+"""
+
+import json
+import os
+import re
+from urllib.parse import parse_qsl
+
+from werkzeug.http import http_date, parse_date, parse_etags, quote_etag
+
+from .api import ArticleApi, ConceptualContentRepository, create_author_resolver, message, run_async
+from .async_repository import AsyncRepositoryAdapter, AsyncSqlAlchemyContentRepository
+from .cache import cache_from_config
+from .database import DATABASE_URL_ENV, async_engine_from_config, create_async_session_factory
+from .search import search_index_from_config
+from .serializers import ConceptualArticleSerializer
+
+_ARTICLE_PATH = re.compile(r"^/articles/(\d+)$")
+
+
+class Request:
+    """Solicitud HTTP leída de un scope ASGI, con las cabeceras condicionales ya interpretadas."""
+
+    def __init__(self, scope, body):
+        self.method = scope["method"]
+        self.path = scope["path"]
+        self.args = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))
+        self.headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope["headers"]}
+        self.body = body
+
+    @property
+    def if_none_match(self):
+        return parse_etags(self.headers.get("if-none-match"))
+
+    @property
+    def if_match(self):
+        return parse_etags(self.headers.get("if-match"))
+
+    @property
+    def if_modified_since(self):
+        return parse_date(self.headers.get("if-modified-since"))
+
+    def json(self):
+        """Cuerpo JSON de la solicitud, o None si no es JSON válido."""
+        try:
+            return json.loads(self.body)
+        except ValueError:
+            return None
+
+
+def response_headers(response):
+    """Cabeceras ASGI de una api.ApiResponse."""
+    headers = [(b"content-type", b"application/json")] if response.body else []
+    if response.etag is not None:
+        headers.append((b"etag", quote_etag(response.etag).encode("latin-1")))
+    if response.last_modified is not None:
+        headers.append((b"last-modified", http_date(response.last_modified).encode("latin-1")))
+    headers.append((b"content-length", str(len(response.body)).encode("latin-1")))
+    return headers
+
+
+def create_async_content_repository():
+    """
+    Crea el repositorio asíncrono: SQLAlchemy asíncrono si CONTENT_DATABASE_URL está
+    definida (el driver se sustituye por su equivalente asíncrono), con el índice de búsqueda
+    configurado, o, en caso contrario, el repositorio simulado en memoria de la aplicación Flask.
+    """
+    if os.environ.get(DATABASE_URL_ENV):
+        return AsyncSqlAlchemyContentRepository(create_async_session_factory(async_engine_from_config()),
+                                                search_index=search_index_from_config())
+    return AsyncRepositoryAdapter(ConceptualContentRepository())
+
+
+class ContentApplication:
+    """
+    Aplicación ASGI con las rutas de artículos de la API de contenidos.
+    `authors` (authors.AuthorResolver) habilita ?expand=author; sin él, la expansión responde 400.
+    """
+
+    def __init__(self, repository, cache=None, serializer=None, authors=None):
+        self.repository = repository
+        self.api = ArticleApi(repository, serializer or ConceptualArticleSerializer(), cache, authors, is_async=True)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        body = b""
+        while True:
+            event = await receive()
+            body += event.get("body", b"")
+            if not event.get("more_body"):
+                break
+        response = await self.dispatch(Request(scope, body))
+        await send({"type": "http.response.start", "status": response.status, "headers": response_headers(response)})
+        await send({"type": "http.response.body", "body": response.body})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            event = await receive()
+            if event["type"] == "lifespan.startup":
+                if hasattr(self.repository, "load_search_index"):
+                    await self.repository.load_search_index() # Índice en memoria del worker (ver views.create_content_repository)
+                await send({"type": "lifespan.startup.complete"})
+            elif event["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def dispatch(self, request):
+        """Encamina la solicitud a su manejador (404/405 si no existe la ruta o el método)."""
+        api = self.api
+        if request.path == "/articles":
+            handlers = {"GET": lambda: api.list_articles(request), "POST": lambda: api.create_article(request.json())}
+        elif request.path == "/tags":
+            handlers = {"GET": lambda: api.list_tags(request)}
+        else:
+            match = _ARTICLE_PATH.match(request.path)
+            if match is None:
+                return message("Recurso no encontrado", 404)
+            article_id = int(match.group(1))
+            handlers = {
+                "GET": lambda: api.get_article(request, article_id),
+                "PUT": lambda: api.update_article(request, article_id, request.json()),
+                "DELETE": lambda: api.delete_article(request, article_id),
+            }
+        handler = handlers.get(request.method)
+        if handler is None:
+            return message("Método no permitido", 405)
+        try:
+            return await run_async(handler())
+        except Exception as e:
+            print(f"Error al atender {request.method} {request.path}: {e}")
+            return message("Error interno del servidor", 500)
+
+
+app = ContentApplication(create_async_content_repository(), cache=cache_from_config(), authors=create_author_resolver())
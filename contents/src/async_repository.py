@@ -0,0 +1,161 @@
+# alphapp.xyz/content/src/async_repository.py
+
+"""
+Repositorios asíncronos de artículos para la aplicación ASGI (asgi.py).
+Exponen las mismas operaciones que los repositorios síncronos como corrutinas,
+de modo que un worker no queda bloqueado mientras espera al almacenamiento:
+
+- AsyncSqlAlchemyContentRepository: SQLAlchemy asíncrono (aiosqlite en local, asyncpg en producción),
+  con las mismas consultas que SqlAlchemyContentRepository.
+- AsyncRepositoryAdapter: envuelve un repositorio en memoria, cuyas operaciones no esperan E/S.
+"""
+
+import datetime
+
+from sqlalchemy import select
+
+from .models import Article
+from .repository import VersionConflictError
+from .sql_repository import (
+    _ARTICLE_COLUMNS, SEARCH_REFRESH_INTERVAL, SearchRefresh, _chunks, append_ranked, attach_tags, check_cursor,
+    delete_statement, list_statement, new_article, ranked_chunks, row_to_article, search_statement, set_article_tags,
+    tag_counts_statement, tags_statement, update_statement,
+)
+
+
+class AsyncRepositoryAdapter:
+    """
+    Adapta un repositorio síncrono en memoria (IndexedContentRepository) a la interfaz asíncrona.
+    Sus operaciones son O(1)/O(log n) sin E/S, por lo que se ejecutan directamente en el bucle de eventos.
+    """
+
+    def __init__(self, repository):
+        self.repository = repository
+
+    async def get_article_by_id(self, article_id):
+        return self.repository.get_article_by_id(article_id)
+
+    async def list_articles(self, limit, cursor=None, tags=None, author_id=None, search=None):
+        return self.repository.list_articles(limit, cursor=cursor, tags=tags, author_id=author_id, search=search)
+
+    async def tag_counts(self, limit=None):
+        return self.repository.tag_counts(limit)
+
+    async def create_article(self, article_data):
+        return self.repository.create_article(article_data)
+
+    async def update_article(self, article_id, update_data, expected_version=None):
+        return self.repository.update_article(article_id, update_data, expected_version=expected_version)
+
+    async def delete_article(self, article_id, expected_version=None):
+        return self.repository.delete_article(article_id, expected_version=expected_version)
+
+
+class AsyncSqlAlchemyContentRepository:
+    """
+    Repositorio de artículos sobre SQLAlchemy asíncrono.
+    Recibe una fábrica de sesiones asíncronas (ver database.create_async_session_factory);
+    cada operación usa su propia sesión y devuelve la conexión al pool al terminar.
+    Las etiquetas se escriben con las mismas funciones síncronas que el repositorio SQL
+    (sql_repository.set_article_tags) a través de AsyncSession.run_sync.
+    El índice de búsqueda opcional se usa y se mantiene como en SqlAlchemyContentRepository.
+    """
+
+    def __init__(self, session_factory, search_index=None, search_refresh_interval=SEARCH_REFRESH_INTERVAL):
+        self._session_factory = session_factory
+        self._search_index = search_index
+        self._search_refresh = SearchRefresh(search_index, search_refresh_interval) if search_index is not None else None
+
+    async def _fetch(self, statement):
+        async with self._session_factory() as session:
+            articles = [row_to_article(row) for row in await session.execute(statement)]
+            for chunk in _chunks(articles):
+                attach_tags(chunk, await session.execute(tags_statement([article["id"] for article in chunk])))
+        return articles
+
+    async def get_article_by_id(self, article_id):
+        rows = await self._fetch(select(*_ARTICLE_COLUMNS).where(Article.id == article_id))
+        return rows[0] if rows else None # None si no se encuentra
+
+    async def load_search_index(self):
+        """Indexa todos los artículos de la base de datos (al arrancar el worker)."""
+        await self.refresh_search_index(force=True)
+
+    async def refresh_search_index(self, force=False):
+        """Ver SqlAlchemyContentRepository.refresh_search_index."""
+        statement = self._search_refresh.begin(force) if self._search_refresh is not None else None
+        if statement is None:
+            return
+        articles = None
+        try:
+            articles = await self._fetch(statement)
+        finally:
+            self._search_refresh.end(articles)
+
+    async def list_articles(self, limit, cursor=None, tags=None, author_id=None, search=None):
+        """Ver SqlAlchemyContentRepository.list_articles."""
+        if search and self._search_index is not None:
+            return await self._search_articles(limit, cursor, tags, author_id, search)
+        check_cursor(cursor, ranked=False)
+        page = await self._fetch(list_statement(limit, cursor, author_id, search, tags))
+        return page[:limit], len(page) > limit
+
+    async def _search_articles(self, limit, cursor, tags, author_id, search):
+        """Ver SqlAlchemyContentRepository._search_articles."""
+        check_cursor(cursor, ranked=True)
+        await self.refresh_search_index()
+        page = []
+        for chunk in ranked_chunks(self._search_index, search, cursor, limit + 1):
+            append_ranked(page, chunk, await self._fetch(search_statement([article_id for _, article_id in chunk], tags, author_id)))
+            if len(page) > limit:
+                break
+        return page[:limit], len(page) > limit
+
+    async def tag_counts(self, limit=None):
+        """Ver SqlAlchemyContentRepository.tag_counts."""
+        async with self._session_factory() as session:
+            rows = await session.execute(tag_counts_statement(limit))
+            return [{"name": name, "article_count": count} for name, count in rows]
+
+    async def create_article(self, article_data):
+        article = new_article(article_data, datetime.datetime.utcnow())
+        tags = list(dict.fromkeys(article_data.get("tags") or []))
+        async with self._session_factory() as session:
+            session.add(article)
+            await session.flush()
+            await session.run_sync(set_article_tags, {article.id: tags})
+            await session.commit() # Si falla, el contexto de la sesión hace rollback
+        created = {**row_to_article(article), "tags": tags}
+        if self._search_refresh is not None:
+            self._search_refresh.add(created)
+        return created
+
+    async def update_article(self, article_id, update_data, expected_version=None):
+        async with self._session_factory() as session:
+            result = await session.execute(update_statement(article_id, update_data, expected_version))
+            if result.rowcount > 0 and "tags" in update_data:
+                await session.run_sync(set_article_tags, {article_id: update_data["tags"]})
+            await session.commit()
+        if result.rowcount == 0:
+            if expected_version is not None and await self.get_article_by_id(article_id) is not None:
+                raise VersionConflictError(article_id)
+            return None # No encontrado
+        updated = await self.get_article_by_id(article_id)
+        if self._search_refresh is not None and updated is not None:
+            self._search_refresh.add(updated)
+        return updated
+
+    async def delete_article(self, article_id, expected_version=None):
+        async with self._session_factory() as session:
+            # Ver SqlAlchemyContentRepository.delete_article
+            await session.run_sync(set_article_tags, {article_id: []})
+            result = await session.execute(delete_statement(article_id, expected_version))
+            if result.rowcount == 0:
+                await session.rollback()
+            else:
+                await session.commit()
+        if result.rowcount == 0 and expected_version is not None and await self.get_article_by_id(article_id) is not None:
+            raise VersionConflictError(article_id)
+        if self._search_refresh is not None and result.rowcount > 0:
+            self._search_refresh.remove(article_id)
+        return result.rowcount > 0 # True si se eliminó algo
@@ -0,0 +1,185 @@
+# alphapp.xyz/content/src/authors.py
+
+"""
+Expansión de autores (?expand=author) para los endpoints de artículos.
+Los artículos solo guardan `author_id`; los datos del autor viven en el servicio de usuarios.
+En lugar de una llamada por artículo, se reúnen los `author_id` de toda la página, se piden
+en una única llamada por lotes y los resultados se guardan en una caché con TTL, de modo que
+los autores frecuentes no vuelven a pedirse en cada solicitud.
+
+Fuentes de usuarios intercambiables (cualquier objeto con `fetch_many(ids) -> {id: autor}`):
+- HttpUserSource: servicio de usuarios, GET {users_url}/users?ids=1,2,3.
+- StaticUserSource: diccionario en memoria (sustituto local para desarrollo y pruebas).
+"""
+
+import asyncio
+import configparser
+import json
+import threading
+import time
+import urllib.parse
+import urllib.request
+from collections import OrderedDict
+from itertools import islice
+
+from .cache import CacheStats
+from .database import DEFAULT_CONFIG_PATH
+
+EXPANDABLE = frozenset({"author"}) # Relaciones que admite el parámetro `expand`
+
+
+def parse_expand(args):
+    """Conjunto de relaciones pedidas en `expand` (separadas por comas). ValueError si alguna no existe."""
+    expand = {name.strip() for name in args.get("expand", "").split(",") if name.strip()}
+    unknown = expand - EXPANDABLE
+    if unknown:
+        raise ValueError(f"No se puede expandir: {', '.join(sorted(unknown))}")
+    return expand
+
+
+def public_author(user):
+    """Campos públicos de un usuario que se incluyen en el artículo expandido."""
+    return {"id": user["id"], "username": user.get("username")}
+
+
+class HttpUserSource:
+    """
+    Cliente por lotes del servicio de usuarios: GET {base_url}/users?ids=1,2,3 responde
+    {"data": [{"id": ..., "username": ...}, ...]} (los IDs inexistentes se omiten).
+    Los lotes se limitan a `max_batch` IDs para no exceder la longitud de la URL.
+    """
+
+    def __init__(self, base_url, timeout=2.0, max_batch=100):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_batch = max_batch
+
+    def fetch_many(self, ids):
+        ids = list(ids)
+        users = {}
+        for start in range(0, len(ids), self.max_batch):
+            query = urllib.parse.urlencode({"ids": ",".join(map(str, ids[start:start + self.max_batch]))})
+            with urllib.request.urlopen(f"{self.base_url}/users?{query}", timeout=self.timeout) as response:
+                payload = json.loads(response.read())
+            for user in payload.get("data", []):
+                users[user["id"]] = public_author(user)
+        return users
+
+
+class StaticUserSource:
+    """Fuente de usuarios en memoria ({id: usuario}), sustituto local del servicio de usuarios."""
+
+    def __init__(self, users):
+        self.users = dict(users)
+
+    def fetch_many(self, ids):
+        return {user_id: public_author(self.users[user_id]) for user_id in ids if user_id in self.users}
+
+
+class AuthorResolver:
+    """
+    Resuelve autores por lotes con una caché LRU con TTL (segura entre hilos).
+    Los autores inexistentes también se guardan (como None) para no repetir la consulta.
+    Si la fuente falla, los autores no resueltos se devuelven como None sin guardarse,
+    de modo que el artículo se sirve igualmente y se reintenta en la siguiente solicitud.
+    """
+
+    def __init__(self, source, ttl=300, max_entries=10_000, clock=time.monotonic):
+        self.source = source
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries = OrderedDict() # author_id -> (autor o None, instante de expiración)
+        self._lock = threading.Lock()
+        self.stats = CacheStats()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def cached(self, author_ids):
+        """Autores presentes en la caché y lista de IDs que hay que pedir a la fuente."""
+        found, missing = {}, []
+        now = self._clock()
+        with self._lock:
+            for author_id in author_ids:
+                entry = self._entries.get(author_id)
+                if entry is not None and entry[1] > now:
+                    self._entries.move_to_end(author_id)
+                    found[author_id] = entry[0]
+                    self.stats.hits += 1
+                else:
+                    missing.append(author_id)
+                    self.stats.misses += 1
+        return found, missing
+
+    def fetch(self, author_ids):
+        """Pide los autores a la fuente en una sola llamada y los guarda en la caché."""
+        try:
+            fetched = self.source.fetch_many(author_ids)
+        except (OSError, ValueError) as e:
+            print(f"Error al obtener autores del servicio de usuarios: {e}")
+            return dict.fromkeys(author_ids)
+        authors = {author_id: fetched.get(author_id) for author_id in author_ids}
+        expires_at = self._clock() + self.ttl
+        with self._lock:
+            for author_id, author in authors.items():
+                self._entries[author_id] = (author, expires_at)
+                self._entries.move_to_end(author_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+        return authors
+
+    def resolve(self, author_ids):
+        """Diccionario author_id -> autor (o None) para los IDs dados, con a lo sumo una llamada a la fuente."""
+        found, missing = self.cached(dict.fromkeys(author_ids))
+        if missing:
+            found.update(self.fetch(missing))
+        return found
+
+    async def resolve_async(self, author_ids):
+        """Como `resolve`, pero la llamada a la fuente (bloqueante) se hace en un hilo aparte."""
+        found, missing = self.cached(dict.fromkeys(author_ids))
+        if missing:
+            found.update(await asyncio.to_thread(self.fetch, missing))
+        return found
+
+    def invalidate(self, author_id):
+        """Descarta un autor de la caché (por ejemplo, tras cambiar su nombre de usuario)."""
+        with self._lock:
+            self._entries.pop(author_id, None)
+
+
+def with_authors(articles, authors):
+    """Copias de los artículos con `author` sustituido por los datos del autor (o None)."""
+    return [{**article, "author": authors.get(article.get("author_id"))} for article in articles]
+
+
+def expand_authors(articles, resolver):
+    """Expande los autores de una página de artículos con una única resolución por lotes."""
+    articles = list(articles)
+    return with_authors(articles, resolver.resolve(article.get("author_id") for article in articles))
+
+
+def iter_expanded(articles, resolver, batch_size=500):
+    """Expande los autores de un iterable de artículos (streaming) por lotes de `batch_size`."""
+    articles = iter(articles)
+    while True:
+        batch = list(islice(articles, batch_size))
+        if not batch:
+            return
+        yield from expand_authors(batch, resolver)
+
+
+def author_resolver_from_config(path=DEFAULT_CONFIG_PATH):
+    """
+    Crea el resolvedor de autores a partir de la sección [authors] del archivo de configuración.
+    Devuelve None si no se ha configurado la URL del servicio de usuarios.
+    """
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    if not parser.has_section("authors") or not parser["authors"].get("users_url"):
+        return None
+    section = parser["authors"]
+    source = HttpUserSource(section["users_url"], timeout=section.getfloat("timeout", 2.0), max_batch=section.getint("max_batch", 100))
+    return AuthorResolver(source, ttl=section.getint("ttl", 300), max_entries=section.getint("max_entries", 10_000))
@@ -0,0 +1,126 @@
+# alphapp.xyz/content/src/bulk.py
+
+"""
+Operaciones masivas (bulk) sobre artículos para el endpoint POST /articles/bulk.
+Las operaciones llegan como una lista JSON o como un flujo NDJSON (una operación por línea):
+
+    {"op": "create", "data": {"title": "...", "content": "...", "tags": [...]}}
+    {"op": "update", "id": 5, "data": {"title": "..."}}
+    {"op": "delete", "id": 5}
+
+Todas se validan en una sola pasada y las válidas se aplican en un único lote
+(una transacción en el repositorio SQL). El resultado es una entrada por operación.
+"""
+
+import json
+
+from .serializers import normalize_tags
+
+MAX_BULK_OPERATIONS = 50_000 # Número máximo de operaciones por solicitud
+
+
+class BulkRequestError(ValueError):
+    """Error en el cuerpo de una solicitud masiva (no en una operación concreta)."""
+
+
+def iter_lines(stream, chunk_size=64 * 1024):
+    """
+    Genera las líneas de un flujo binario leyéndolo por bloques.
+    Es mucho más rápido que iterar el flujo de la solicitud línea a línea.
+    """
+    pending = b""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
+
+def parse_ndjson(lines):
+    """Genera las operaciones de un flujo NDJSON, ignorando las líneas vacías."""
+    for number, line in enumerate(lines, start=1):
+        if isinstance(line, bytes):
+            try:
+                line = line.decode("utf-8")
+            except UnicodeDecodeError:
+                raise BulkRequestError(f"Línea {number} no es UTF-8 válido")
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            raise BulkRequestError(f"Línea {number} no es JSON válido")
+
+
+def plan_bulk_operations(operations, serializer):
+    """
+    Valida las operaciones en una sola pasada.
+    Devuelve (creates, updates, deletes, results): las listas de operaciones válidas con
+    su posición original y la lista de resultados, ya rellenada para las operaciones no válidas.
+    """
+    creates, updates, deletes, results = [], [], [], []
+    for index, operation in enumerate(operations):
+        if index >= MAX_BULK_OPERATIONS:
+            raise BulkRequestError(f"Se admiten como máximo {MAX_BULK_OPERATIONS} operaciones por solicitud")
+        results.append(None)
+        op = operation.get("op") if isinstance(operation, dict) else None
+        fields = (operation.get("data") or {}) if op in ("create", "update") else None
+        if fields is not None and not isinstance(fields, dict):
+            results[index] = {"index": index, "status": 400, "message": "El campo 'data' debe ser un objeto"}
+            continue
+        if fields is not None and "tags" in fields and normalize_tags(fields["tags"]) is None:
+            results[index] = {"index": index, "status": 400, "message": "Las etiquetas deben ser una lista de nombres válidos"}
+            continue
+        if op == "create":
+            data = serializer.deserialize(fields)
+            if data is None:
+                results[index] = {"index": index, "status": 400, "message": "Faltan título o contenido (texto no vacío)"}
+                continue
+            creates.append((index, data))
+        elif op in ("update", "delete"):
+            article_id = operation.get("id")
+            if not isinstance(article_id, int) or isinstance(article_id, bool):
+                results[index] = {"index": index, "status": 400, "message": "El campo 'id' debe ser un entero"}
+                continue
+            if op == "delete":
+                deletes.append((index, article_id))
+                continue
+            data = serializer.deserialize_update(fields)
+            if data is None:
+                results[index] = {"index": index, "status": 400, "message": "El título y el contenido deben ser texto no vacío"}
+                continue
+            if not data:
+                results[index] = {"index": index, "status": 400, "message": "No hay campos válidos para actualizar"}
+                continue
+            updates.append((index, article_id, data))
+        else:
+            results[index] = {"index": index, "status": 400, "message": "Operación no válida; se espera 'create', 'update' o 'delete'"}
+    return creates, updates, deletes, results
+
+
+def apply_bulk_operations(repository, creates, updates, deletes, results):
+    """
+    Aplica las operaciones válidas en un único lote del repositorio y completa `results`.
+    Orden de aplicación: primero las creaciones, después las actualizaciones y por último los borrados.
+    Devuelve (results, summary).
+    """
+    created_ids, updated, deleted = repository.bulk_apply(
+        [data for _, data in creates],
+        [(article_id, data) for _, article_id, data in updates],
+        [article_id for _, article_id in deletes],
+    )
+    summary = {"created": len(created_ids), "updated": 0, "deleted": 0, "not_found": 0,
+               "invalid": len(results) - len(creates) - len(updates) - len(deletes)}
+    for (index, _), article_id in zip(creates, created_ids):
+        results[index] = {"index": index, "status": 201, "id": article_id}
+    for key, items, flags in (("updated", updates, updated), ("deleted", deletes, deleted)):
+        for item, found in zip(items, flags):
+            index, article_id = item[0], item[1]
+            results[index] = {"index": index, "status": 200 if found else 404, "id": article_id}
+            summary[key if found else "not_found"] += 1
+    return results, summary
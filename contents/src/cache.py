@@ -0,0 +1,191 @@
+# alphapp.xyz/content/src/cache.py
+
+"""
+Caché de respuestas serializadas de artículos para el microservicio de gestión de contenidos.
+Guarda el cuerpo JSON ya codificado de cada artículo (una entrada por ID, marcada con el ETag
+del artículo), de modo que GET /articles/<id> no vuelve a serializar un artículo que no ha
+cambiado. Las escrituras, también las masivas, actualizan (write-through) o invalidan la entrada.
+
+El almacenamiento es intercambiable:
+- InProcessCacheBackend: LRU en el proceso, con límite en bytes y TTL.
+- RedisCacheBackend: compartido entre workers a través de un cliente con la API de redis
+  (get/set/delete); el límite de memoria lo aplica la política maxmemory del servidor.
+"""
+
+import configparser
+import threading
+import time
+from collections import OrderedDict
+
+from .database import DEFAULT_CONFIG_PATH
+
+
+class CacheStats:
+    """Contadores de aciertos, fallos y expulsiones de la caché."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stale(self):
+        # Un acierto del almacenamiento con un valor obsoleto cuenta como fallo
+        self.hits -= 1
+        self.misses += 1
+
+    def as_dict(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+class InProcessCacheBackend:
+    """
+    Caché LRU en memoria del proceso con límite de tamaño en bytes y TTL.
+    Es segura para servidores con varios hilos.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, ttl=300, clock=time.monotonic):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict() # clave -> (valor, instante de expiración)
+        self._size = 0
+        self._lock = threading.Lock()
+        self.stats = CacheStats()
+
+    @property
+    def size_bytes(self):
+        return self._size
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= self._clock():
+                self._remove(key)
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key, value):
+        if len(value) > self.max_bytes:
+            return # Un valor mayor que la caché completa no se guarda
+        expires_at = self._clock() + self.ttl if self.ttl else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires_at)
+            self._size += len(value)
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.stats.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remove(self, key):
+        value, _ = self._entries.pop(key)
+        self._size -= len(value)
+
+
+class RedisCacheBackend:
+    """
+    Caché compartida entre workers sobre Redis (o cualquier cliente con su API).
+    Las expulsiones por memoria las gestiona el servidor (maxmemory-policy allkeys-lru),
+    por lo que aquí solo se cuentan aciertos y fallos.
+    """
+
+    def __init__(self, client, ttl=300, prefix="contents:"):
+        self._client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.stats = CacheStats()
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        import redis # Dependencia opcional, solo necesaria con este backend
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def get(self, key):
+        value = self._client.get(self.prefix + key)
+        if value is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return value
+
+    def set(self, key, value):
+        self._client.set(self.prefix + key, value, ex=self.ttl or None)
+
+    def delete(self, key):
+        self._client.delete(self.prefix + key)
+
+
+class ArticleResponseCache:
+    """
+    Caché de cuerpos JSON codificados de artículos: una entrada por ID, guardada junto con la
+    marca (`token`, el ETag) del artículo del que se generó. get solo devuelve el cuerpo si la
+    marca coincide con la del artículo actual, de modo que nunca se sirve un cuerpo obsoleto
+    aunque otro worker no haya invalidado todavía su entrada; invalidate borra la entrada del
+    ID sin necesidad de conocer su versión (p. ej. tras un borrado masivo).
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    @staticmethod
+    def _key(article_id):
+        return f"article:{article_id}"
+
+    def get(self, article_id, token):
+        value = self.backend.get(self._key(article_id))
+        if value is None:
+            return None
+        stored, _, body = value.partition(b"\n")
+        if stored != str(token).encode("utf-8"):
+            self.backend.stats.stale() # Entrada de otra versión (u otro artículo con el mismo ID)
+            return None
+        return body
+
+    def set(self, article_id, token, body):
+        self.backend.set(self._key(article_id), str(token).encode("utf-8") + b"\n" + body)
+
+    def invalidate(self, article_id):
+        self.backend.delete(self._key(article_id))
+
+    def stats(self):
+        return self.backend.stats.as_dict()
+
+
+def cache_from_config(path=DEFAULT_CONFIG_PATH):
+    """
+    Crea la caché de artículos a partir de la sección [cache] del archivo de configuración
+    (backend = memory | redis | none). Devuelve None si la caché está desactivada.
+    """
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    if not parser.has_section("cache"):
+        return ArticleResponseCache(InProcessCacheBackend())
+    section = parser["cache"]
+    backend = section.get("backend", "memory")
+    ttl = section.getint("ttl", 300)
+    if backend == "none":
+        return None
+    if backend == "redis":
+        return ArticleResponseCache(RedisCacheBackend.from_url(section.get("redis_url"), ttl=ttl))
+    return ArticleResponseCache(InProcessCacheBackend(max_bytes=section.getint("max_bytes", 64 * 1024 * 1024), ttl=ttl))
@@ -0,0 +1,79 @@
+# alphapp.xyz/content/src/conditional.py
+
+"""
+Solicitudes condicionales HTTP para los endpoints de artículos.
+Los ETag se derivan de la versión y la fecha de modificación de cada artículo (y, para los
+listados, de los de todos los artículos de la página), de modo que se pueden comparar sin
+serializar nada:
+
+- If-None-Match / If-Modified-Since en GET -> 304 Not Modified.
+- If-Match en PUT/DELETE -> 412 Precondition Failed si el artículo cambió (concurrencia optimista).
+"""
+
+import datetime
+import hashlib
+
+
+def article_etag(article):
+    """
+    ETag fuerte (sin comillas) de un artículo: ID, versión y fecha de modificación (con
+    microsegundos). La fecha distingue a un artículo nuevo que reutiliza el ID de uno
+    eliminado, que también empieza en la versión 1.
+    """
+    updated_at = article.get("updated_at")
+    stamp = updated_at.strftime("%Y%m%d%H%M%S%f") if updated_at is not None else "0"
+    return f"{article['id']}-{article['version']}-{stamp}"
+
+
+def collection_etag(articles, params):
+    """ETag fuerte de una página del listado: parámetros de la consulta y ETag de cada artículo."""
+    digest = hashlib.sha1(repr(sorted(params.items())).encode("utf-8"))
+    for article in articles:
+        digest.update(f"|{article_etag(article)}".encode("ascii"))
+    return digest.hexdigest()
+
+
+def representation_etag(etag, extra):
+    """
+    ETag de una representación ampliada (por ejemplo, con los autores expandidos): combina el
+    ETag base con los datos añadidos, que pueden cambiar sin que cambie la versión del artículo.
+    """
+    return hashlib.sha1(f"{etag}|{extra!r}".encode("utf-8")).hexdigest()
+
+
+def last_modified(article):
+    """Fecha de última modificación en UTC con precisión de segundos (formato HTTP)."""
+    updated_at = article.get("updated_at") or article.get("publication_date")
+    if updated_at is None:
+        return None
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=datetime.timezone.utc)
+    return updated_at.replace(microsecond=0)
+
+
+def is_not_modified(request, etag, modified=None):
+    """
+    Indica si un GET condicional puede responderse con 304.
+    If-None-Match tiene prioridad sobre If-Modified-Since (RFC 9110).
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if modified is not None and request.if_modified_since is not None:
+        return modified <= request.if_modified_since
+    return False
+
+
+def expected_version(request, article):
+    """
+    Versión esperada según If-Match para PUT/DELETE.
+    Devuelve None si no hay precondición y lanza PreconditionFailed si no se cumple.
+    """
+    if not request.if_match:
+        return None
+    if request.if_match.star_tag or request.if_match.contains(article_etag(article)):
+        return article["version"]
+    raise PreconditionFailed(article["id"])
+
+
+class PreconditionFailed(Exception):
+    """La cabecera If-Match no coincide con la versión actual del artículo."""
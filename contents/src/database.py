@@ -0,0 +1,150 @@
+# alphapp.xyz/content/src/database.py
+
+"""
+Configuración de la conexión a la base de datos del microservicio de gestión de contenidos.
+Crea un engine de SQLAlchemy con un pool de conexiones configurable (tamaño, desbordamiento,
+pre-ping y reciclado) y una fábrica de sesiones con ámbito (scoped_session), de modo que
+cada solicitud HTTP trabaje con su propia sesión.
+La aplicación ASGI (asgi.py) usa los equivalentes asíncronos (`build_async_engine`,
+`create_async_session_factory`) con drivers asíncronos (aiosqlite, asyncpg).
+"""
+
+import configparser
+import os
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Ruta por defecto del archivo de configuración del servicio
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "config.ini")
+
+# Variable de entorno que permite sobrescribir la URL de la base de datos
+DATABASE_URL_ENV = "CONTENT_DATABASE_URL"
+
+# Driver asíncrono equivalente a cada driver síncrono
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def build_engine(url, pool_size=10, max_overflow=20, pool_pre_ping=True, pool_recycle=1800, pool_timeout=30, echo=False):
+    """
+    Crea un engine de SQLAlchemy con pool de conexiones.
+    Para SQLite en memoria se usa un StaticPool (una única conexión compartida),
+    ya que cada conexión nueva vería una base de datos vacía.
+    """
+    url = str(url)
+    if url in ("sqlite://", "sqlite:///:memory:"):
+        return create_engine(
+            url,
+            echo=echo,
+            poolclass=StaticPool,
+            connect_args={"check_same_thread": False},
+        )
+    kwargs = {}
+    if url.startswith("sqlite"):
+        kwargs["connect_args"] = {"check_same_thread": False}
+    return create_engine(
+        url,
+        echo=echo,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_pre_ping=pool_pre_ping,
+        pool_recycle=pool_recycle,
+        pool_timeout=pool_timeout,
+        **kwargs,
+    )
+
+
+def load_database_config(path=DEFAULT_CONFIG_PATH):
+    """
+    Lee las secciones [database] y [pool] del archivo de configuración.
+    Devuelve la URL de conexión y los parámetros del pool para `build_engine`.
+    La variable de entorno CONTENT_DATABASE_URL tiene prioridad sobre el archivo.
+    """
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    url = os.environ.get(DATABASE_URL_ENV)
+    if url is None and parser.has_option("database", "url"):
+        url = parser.get("database", "url")
+    if url is None and parser.has_section("database"):
+        database = parser["database"]
+        url = URL.create(
+            "postgresql+psycopg2",
+            username=database.get("user"),
+            password=database.get("password"),
+            host=database.get("host"),
+            port=database.getint("port"),
+            database=database.get("database"),
+        ).render_as_string(hide_password=False)
+    pool = parser["pool"] if parser.has_section("pool") else {}
+    pool_options = {}
+    if pool:
+        pool_options = {
+            "pool_size": pool.getint("pool_size", 10),
+            "max_overflow": pool.getint("max_overflow", 20),
+            "pool_pre_ping": pool.getboolean("pool_pre_ping", True),
+            "pool_recycle": pool.getint("pool_recycle", 1800),
+            "pool_timeout": pool.getint("pool_timeout", 30),
+        }
+    return url, pool_options
+
+
+def engine_from_config(path=DEFAULT_CONFIG_PATH):
+    """Crea el engine a partir del archivo de configuración del servicio."""
+    url, pool_options = load_database_config(path)
+    return build_engine(url, **pool_options)
+
+
+def create_session_factory(engine):
+    """
+    Crea una fábrica de sesiones con ámbito por hilo/solicitud.
+    `expire_on_commit=False` evita recargar los atributos tras cada commit.
+    """
+    return scoped_session(sessionmaker(bind=engine, expire_on_commit=False))
+
+
+def async_url(url):
+    """Convierte una URL con driver síncrono en la del driver asíncrono equivalente."""
+    url = make_url(str(url))
+    drivername = ASYNC_DRIVERS.get(url.drivername, url.drivername)
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+def build_async_engine(url, pool_size=10, max_overflow=20, pool_pre_ping=True, pool_recycle=1800, pool_timeout=30, echo=False):
+    """
+    Crea un engine asíncrono de SQLAlchemy con pool de conexiones (ver `build_engine`).
+    La URL puede indicar el driver síncrono; se sustituye por el asíncrono equivalente.
+    """
+    url = async_url(url)
+    if make_url(url).database in (None, "", ":memory:"):
+        return create_async_engine(url, echo=echo, poolclass=StaticPool)
+    return create_async_engine(
+        url,
+        echo=echo,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_pre_ping=pool_pre_ping,
+        pool_recycle=pool_recycle,
+        pool_timeout=pool_timeout,
+    )
+
+
+def async_engine_from_config(path=DEFAULT_CONFIG_PATH):
+    """Crea el engine asíncrono a partir del archivo de configuración del servicio."""
+    url, pool_options = load_database_config(path)
+    return build_async_engine(url, **pool_options)
+
+
+def create_async_session_factory(engine):
+    """
+    Crea una fábrica de sesiones asíncronas; cada operación del repositorio abre
+    y cierra su propia sesión, de modo que no hay estado ligado a la tarea.
+    """
+    return async_sessionmaker(engine, expire_on_commit=False)
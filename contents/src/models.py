@@ -7,7 +7,7 @@ como artículos, y se utilizan con un ORM (Object-Relational Mapping)
 para interactuar con la base de datos.
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey # Basado en ejemplos de modelos [1, 2]
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, Table # Basado en ejemplos de modelos [1, 2]
 from sqlalchemy.orm import relationship # Basado en ejemplos de modelos [2]
 from sqlalchemy.ext.declarative import declarative_base # Basado en ejemplos de modelos [1, 2]
 import datetime # Necesario para tipos DateTime [2]
@@ -15,6 +15,42 @@ import datetime # Necesario para tipos DateTime [2]
 # Se utiliza declarative_base() para definir la base para los modelos declarativos [1, 2]
 Base = declarative_base()
 
+TAG_NAME_LENGTH = 64 # Longitud máxima del nombre de una etiqueta
+
+# Tabla de relación muchos a muchos entre artículos y etiquetas.
+# `position` conserva el orden en que se indicaron las etiquetas del artículo;
+# el índice (tag_id, article_id) resuelve "artículos con la etiqueta X" sin recorrer la tabla.
+article_tags = Table(
+    'article_tags',
+    Base.metadata,
+    Column('article_id', Integer, ForeignKey('articles.id'), primary_key=True),
+    Column('tag_id', Integer, ForeignKey('tags.id'), primary_key=True),
+    Column('position', Integer, nullable=False, default=0),
+    Index('ix_article_tags_tag_id_article_id', 'tag_id', 'article_id'),
+)
+
+
+class Tag(Base):
+    """
+    Etiqueta única para organizar artículos.
+    `article_count` es un contador mantenido por el repositorio en la misma transacción
+    que las asociaciones, de modo que la nube de etiquetas no necesita agregar article_tags.
+    """
+    __tablename__ = 'tags'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(TAG_NAME_LENGTH), nullable=False, unique=True) # El índice único sirve para buscar por nombre
+    article_count = Column(Integer, nullable=False, default=0)
+
+    # Índice para listar las etiquetas más usadas
+    __table_args__ = (
+        Index('ix_tags_article_count', 'article_count'),
+    )
+
+    def __repr__(self):
+        return f"<Tag(id={self.id}, name='{self.name}', article_count={self.article_count})>"
+
+
 # Ejemplo de modelo para representar un artículo [3]
 # Este modelo sigue el esquema de datos descrito para un artículo [3]
 class Article(Base):
@@ -28,15 +64,28 @@ class Article(Base):
     id = Column(Integer, primary_key=True) # Identificador único del artículo [3]
     title = Column(String(255), nullable=False) # Título del artículo [3]
     content = Column(Text, nullable=False) # Contenido principal del artículo (usando Text para contenido largo) [2, 3]
-    author_id = Column(Integer, ForeignKey('users.id')) # Identificador del autor (ForeignKey a la tabla de usuarios, asumiendo que existe una tabla 'users' en el servicio de usuarios) [2, 3]
+    # Identificador del autor. La tabla 'users' vive en la base de datos propia del servicio de usuarios,
+    # por lo que no se declara una ForeignKey (no existe en esta base de datos); se indexa para los filtros por autor.
+    author_id = Column(Integer, index=True)
     publication_date = Column(DateTime, default=datetime.datetime.utcnow) # Fecha de publicación (usando DateTime) [2, 3]
-    # Los tags podrían gestionarse a través de una tabla de relación muchos a muchos,
-    # pero para simplificar, se omite aquí o se podría usar un tipo de dato de array si la DB lo soporta.
-    # tags = Column(ARRAY(String)) # Ejemplo conceptual para tags, si la DB soporta arrays
+    version = Column(Integer, nullable=False, default=1) # Versión del artículo, se incrementa en cada actualización
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow) # Última modificación (cabecera Last-Modified)
+    # Etiquetas a través de la tabla de relación article_tags (en el orden indicado por el autor).
+    # Solo lectura: el repositorio escribe las asociaciones y los contadores con sentencias por lotes.
+    tags = relationship('Tag', secondary=article_tags, order_by=article_tags.c.position, viewonly=True)
 
     # Relación con el autor (asumiendo un modelo User en otro microservicio/contexto o en la misma DB si la arquitectura lo permite) [2, 3]
     # author = relationship('User') # Esta línea requeriría que el modelo User esté definido o importado
 
+    # Índice compuesto para la paginación por cursor sobre (publication_date, id) e índice de
+    # updated_at para leer los artículos modificados (puesta al día del índice de búsqueda de cada worker).
+    # En SQLite, AUTOINCREMENT impide reutilizar el ID de un artículo eliminado (cachés y ETag por ID).
+    __table_args__ = (
+        Index('ix_articles_publication_date_id', 'publication_date', 'id'),
+        Index('ix_articles_updated_at', 'updated_at'),
+        {'sqlite_autoincrement': True},
+    )
+
     def __repr__(self):
         """
         Representación del objeto Article para depuración.
@@ -0,0 +1,106 @@
+# alphapp.xyz/content/src/pagination.py
+
+"""
+Utilidades de paginación por cursor (keyset) para los listados de artículos.
+Los listados se ordenan por (publication_date, id) de forma descendente y el cursor
+codifica la clave del último artículo devuelto, de modo que la página siguiente
+empieza justo después sin usar OFFSET. Los resultados de búsqueda se ordenan por
+relevancia y su clave es (score, id).
+"""
+
+import base64
+import datetime
+
+DEFAULT_LIMIT = 20 # Tamaño de página por defecto
+MAX_LIMIT = 100 # Límite máximo de artículos por página
+
+
+def clamp_limit(limit):
+    """Ajusta el parámetro `limit` al rango [1, MAX_LIMIT]."""
+    if limit is None:
+        return DEFAULT_LIMIT
+    return max(1, min(int(limit), MAX_LIMIT))
+
+
+def encode_cursor(position, article_id):
+    """
+    Codifica la clave (publication_date, id) o, en una búsqueda, (score, id)
+    como un cursor opaco para la API.
+    """
+    if isinstance(position, float):
+        raw = f"~{position!r}|{article_id}"
+    else:
+        raw = f"{position.isoformat()}|{article_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Decodifica un cursor generado por `encode_cursor`.
+    Devuelve la tupla (publication_date, id) o (score, id), o lanza ValueError si el cursor no es válido.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        position, id_part = raw.rsplit("|", 1)
+        if position.startswith("~"):
+            return (float(position[1:]), int(id_part))
+        date = datetime.datetime.fromisoformat(position)
+        if date.tzinfo is not None: # encode_cursor nunca genera fechas con zona horaria (no se comparan con las guardadas)
+            raise ValueError("fecha con zona horaria")
+        return (date, int(id_part))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Cursor de paginación no válido: {cursor!r}") from e
+
+
+def sort_key(article):
+    """Clave del artículo en el orden del listado: (score, id) en búsquedas, si no (publication_date, id)."""
+    if "score" in article:
+        return (article["score"], article["id"])
+    return (article.get("publication_date") or datetime.datetime.min, article["id"])
+
+
+def cursor_for(article):
+    """Cursor que apunta justo después de `article` en el orden del listado."""
+    return encode_cursor(*sort_key(article))
+
+
+def parse_list_params(args):
+    """
+    Convierte los parámetros de consulta de GET /articles en argumentos de
+    `list_articles`. Lanza ValueError si algún parámetro no es válido.
+    """
+    try:
+        limit = clamp_limit(args.get("limit"))
+    except ValueError:
+        raise ValueError("El parámetro 'limit' debe ser un entero")
+    cursor = args.get("cursor")
+    author_id = args.get("author_id")
+    if author_id is not None:
+        try:
+            author_id = int(author_id)
+        except ValueError:
+            raise ValueError("El parámetro 'author_id' debe ser un entero")
+    tags = [tag.strip() for tag in args.get("tags", "").split(",") if tag.strip()]
+    return {
+        "limit": limit,
+        "cursor": decode_cursor(cursor) if cursor else None,
+        "tags": tags or None,
+        "author_id": author_id,
+        "search": args.get("search") or None
+    }
+
+
+def iter_articles(repository, batch_size=500, **filters):
+    """
+    Recorre todos los artículos del listado (mismo orden y filtros que `list_articles`)
+    pidiendo al repositorio páginas de `batch_size` por cursor. Solo una página está
+    en memoria a la vez, de modo que el consumo no depende del tamaño del catálogo.
+    """
+    cursor = filters.pop("cursor", None)
+    while True:
+        page, has_more = repository.list_articles(limit=batch_size, cursor=cursor, **filters)
+        yield from page
+        if not has_more or not page:
+            return
+        cursor = sort_key(page[-1])
@@ -0,0 +1,385 @@
+# alphapp.xyz/content/src/repository.py
+
+"""
+Define el repositorio en memoria del microservicio de gestión de contenidos de Alphapp.
+Los artículos se guardan en un índice primario por ID (tabla hash) y se mantienen
+índices secundarios por autor, por etiqueta y por fecha de publicación, de modo que
+las lecturas, actualizaciones y eliminaciones no recorren todo el catálogo.
+
+El repositorio es seguro con servidores WSGI multihilo (por ejemplo gunicorn gthread):
+- Los IDs se asignan de forma atómica.
+- Las escrituras sobre un mismo artículo se serializan con locks por franjas, y las de
+  artículos distintos solo comparten secciones críticas breves de los índices.
+- Los artículos y el índice de fechas se publican con copia en escritura, de modo que un
+  lector ve siempre una versión completa (anterior o nueva) sin esperar a los escritores.
+"""
+
+import bisect
+import datetime
+import itertools
+import threading
+
+from .search import SearchIndex, article_terms
+
+
+class VersionConflictError(Exception):
+    """La versión del artículo no coincide con la esperada (concurrencia optimista)."""
+
+# Clave usada en el índice de fechas cuando un artículo no tiene fecha de publicación
+_MIN_DATE = datetime.datetime.min
+
+# Número de locks por franjas para las escrituras sobre artículos
+LOCK_STRIPES = 64
+
+
+def _date_key(article):
+    """Clave de ordenación (publication_date, id) del índice de fechas."""
+    return (article.get("publication_date") or _MIN_DATE, article["id"])
+
+
+class SnapshotSortedIndex:
+    """
+    Lista ordenada de claves dividida en bloques inmutables, con copia en escritura.
+
+    Cada escritura copia solo el bloque afectado y publica una instantánea nueva
+    (bloques, máximo de cada bloque, número de claves) con una única asignación;
+    los lectores recorren una instantánea consistente sin tomar ningún lock.
+    """
+
+    def __init__(self, keys=(), block_size=512):
+        self._block_size = block_size
+        self._lock = threading.Lock() # Serializa a los escritores
+        keys = sorted(keys)
+        self._publish(tuple(tuple(keys[i:i + block_size]) for i in range(0, len(keys), block_size)))
+
+    def _publish(self, blocks):
+        self._snapshot = (blocks, tuple(block[-1] for block in blocks), sum(map(len, blocks)))
+
+    def __len__(self):
+        return self._snapshot[2]
+
+    def __iter__(self):
+        return self.iter_range()
+
+    def insert(self, key):
+        with self._lock:
+            blocks, maxes, _ = self._snapshot
+            if not blocks:
+                self._publish(((key,),))
+                return
+            i = min(bisect.bisect_left(maxes, key), len(blocks) - 1)
+            block = list(blocks[i])
+            bisect.insort(block, key)
+            if len(block) > 2 * self._block_size:
+                half = len(block) // 2
+                replacement = (tuple(block[:half]), tuple(block[half:]))
+            else:
+                replacement = (tuple(block),)
+            self._publish(blocks[:i] + replacement + blocks[i + 1:])
+
+    def remove(self, key):
+        """Elimina la clave; devuelve False si no estaba en el índice."""
+        with self._lock:
+            blocks, maxes, _ = self._snapshot
+            i = bisect.bisect_left(maxes, key)
+            if i == len(blocks):
+                return False
+            block = blocks[i]
+            j = bisect.bisect_left(block, key)
+            if j == len(block) or block[j] != key:
+                return False
+            block = block[:j] + block[j + 1:]
+            self._publish(blocks[:i] + ((block,) if block else ()) + blocks[i + 1:])
+            return True
+
+    def iter_range(self, start=None, end=None):
+        """Claves en [start, end) en orden ascendente."""
+        blocks, maxes, _ = self._snapshot
+        i = 0 if start is None else bisect.bisect_left(maxes, start)
+        for block in blocks[i:]:
+            j = 0 if start is None else bisect.bisect_left(block, start)
+            start = None
+            for key in block[j:]:
+                if end is not None and key >= end:
+                    return
+                yield key
+
+    def iter_before(self, key=None):
+        """Claves estrictamente menores que `key` (o todas) en orden descendente."""
+        blocks, maxes, _ = self._snapshot
+        if not blocks:
+            return
+        if key is None:
+            i, j = len(blocks) - 1, len(blocks[-1])
+        else:
+            i = min(bisect.bisect_left(maxes, key), len(blocks) - 1)
+            j = bisect.bisect_left(blocks[i], key)
+        while i >= 0:
+            block = blocks[i]
+            for position in range(j - 1, -1, -1):
+                yield block[position]
+            i -= 1
+            j = len(blocks[i]) if i >= 0 else 0
+
+
+class IndexedContentRepository:
+    """
+    Repositorio de artículos en memoria con índices, seguro entre hilos.
+
+    - Índice primario: dict id -> artículo (búsqueda, actualización y borrado O(1)).
+    - Índices secundarios: author_id -> set(ids) y tag -> set(ids), protegidos por un lock
+      de sección crítica breve (los lectores copian el conjunto y lo sueltan enseguida).
+    - Índice de fechas: SnapshotSortedIndex de (publication_date, id).
+    - Índice de texto completo: SearchIndex (BM25) sobre título, contenido y etiquetas.
+
+    Los diccionarios de artículo publicados no se modifican nunca: una actualización
+    publica un diccionario nuevo con la versión incrementada.
+    """
+
+    def __init__(self, articles=None, search_index=None):
+        self._articles = {}
+        self._search = search_index if search_index is not None else SearchIndex()
+        self._by_author = {}
+        self._by_tag = {}
+        self._index_lock = threading.Lock()
+        self._stripes = tuple(threading.Lock() for _ in range(LOCK_STRIPES))
+        for article in articles or []:
+            article = dict(article)
+            article.setdefault("version", 1) # Versión del artículo, se incrementa en cada actualización
+            article.setdefault("updated_at", article.get("publication_date"))
+            self._articles[article["id"]] = article
+            self._index_secondary(article)
+            self._search.add(article)
+        self._by_date = SnapshotSortedIndex(map(_date_key, self._articles.values()))
+        # next() sobre itertools.count es atómico: dos hilos nunca reciben el mismo ID
+        self._ids = itertools.count(max(self._articles, default=0) + 1)
+
+    # --- Mantenimiento de índices ---
+
+    def _stripe(self, article_id):
+        """Lock de la franja a la que pertenece un artículo."""
+        return self._stripes[hash(article_id) % LOCK_STRIPES]
+
+    def _index_secondary(self, article):
+        self._by_author.setdefault(article.get("author_id"), set()).add(article["id"])
+        self._index_tags(article["id"], article.get("tags", []))
+
+    def _index_tags(self, article_id, tags):
+        for tag in tags:
+            self._by_tag.setdefault(tag, set()).add(article_id)
+
+    def _unindex_tags(self, article_id, tags):
+        for tag in tags:
+            ids = self._by_tag.get(tag)
+            if ids is not None:
+                ids.discard(article_id)
+                if not ids:
+                    del self._by_tag[tag]
+
+    def _unindex_secondary(self, article):
+        article_id = article["id"]
+        ids = self._by_author.get(article.get("author_id"))
+        if ids is not None:
+            ids.discard(article_id)
+            if not ids:
+                del self._by_author[article.get("author_id")]
+        self._unindex_tags(article_id, article.get("tags", []))
+
+    def _lookup(self, ids):
+        """Artículos vigentes para los IDs dados (omite los eliminados entretanto)."""
+        articles = self._articles
+        return [article for article in map(articles.get, ids) if article is not None]
+
+    # --- Interfaz del repositorio ---
+
+    def get_all_articles(self):
+        return list(self._articles.values())
+
+    def get_article_by_id(self, article_id):
+        return self._articles.get(article_id) # None si no se encuentra
+
+    def get_articles_by_author(self, author_id):
+        """Devuelve los artículos de un autor usando el índice secundario."""
+        with self._index_lock:
+            ids = sorted(self._by_author.get(author_id, ()))
+        return self._lookup(ids)
+
+    def get_articles_by_tag(self, tag):
+        """Devuelve los artículos que tienen una etiqueta usando el índice secundario."""
+        with self._index_lock:
+            ids = sorted(self._by_tag.get(tag, ()))
+        return self._lookup(ids)
+
+    def tag_counts(self, limit=None):
+        """
+        Etiquetas con su número de artículos, de la más a la menos usada (nube de etiquetas).
+        Los contadores son los tamaños de los conjuntos del índice secundario.
+        """
+        with self._index_lock:
+            counts = [(tag, len(ids)) for tag, ids in self._by_tag.items()]
+        counts.sort(key=lambda item: (-item[1], item[0]))
+        return [{"name": tag, "article_count": count} for tag, count in counts[:limit]]
+
+    def get_articles_by_date(self, start=None, end=None):
+        """
+        Devuelve los artículos publicados en [start, end), ordenados por fecha.
+        La búsqueda del rango es O(log n) sobre el índice de fechas.
+        """
+        keys = self._by_date.iter_range(None if start is None else (start,), None if end is None else (end,))
+        return self._lookup(article_id for _, article_id in keys)
+
+    def _candidate_ids(self, tags=None, author_id=None):
+        """
+        Intersección de los índices secundarios para los filtros dados.
+        Devuelve None si no hay filtros indexados (cualquier artículo es candidato).
+        """
+        if author_id is None and not tags:
+            return None
+        with self._index_lock:
+            sets = []
+            if author_id is not None:
+                sets.append(self._by_author.get(author_id, set()))
+            for tag in tags or []:
+                sets.append(self._by_tag.get(tag, set()))
+            sets.sort(key=len)
+            return set(sets[0]).intersection(*sets[1:])
+
+    def list_articles(self, limit, cursor=None, tags=None, author_id=None, search=None):
+        """
+        Devuelve una página de artículos ordenada por (publication_date, id) descendente
+        y un indicador de si quedan más artículos.
+
+        `cursor` es la clave (publication_date, id) del último artículo de la página
+        anterior; solo se materializan los `limit` artículos de la página solicitada.
+        `tags` exige todas las etiquetas indicadas. Con `search` la página contiene los
+        artículos que incluyen todos los términos buscados, ordenados por relevancia.
+        """
+        candidates = self._candidate_ids(tags, author_id)
+        if search:
+            return self._search_articles(limit, cursor, candidates, search)
+        if cursor is not None and isinstance(cursor[0], float):
+            raise ValueError("El cursor corresponde a una búsqueda")
+        articles = self._articles
+
+        if candidates is not None and len(candidates) * 8 < len(self._by_date):
+            # Filtro selectivo: ordenar solo los candidatos es más barato que recorrer el índice
+            keys = sorted(map(_date_key, self._lookup(candidates)), reverse=True)
+            if cursor is not None:
+                keys = [key for key in keys if key < cursor]
+            ordered_ids = (article_id for _, article_id in keys)
+        else:
+            ordered_ids = (article_id for _, article_id in self._by_date.iter_before(cursor))
+
+        page = []
+        for article_id in ordered_ids:
+            if candidates is not None and article_id not in candidates:
+                continue
+            article = articles.get(article_id)
+            if article is None:
+                continue # Eliminado mientras se recorría la instantánea
+            if len(page) == limit:
+                return page, True
+            page.append(article)
+        return page, False
+
+    def _search_articles(self, limit, cursor, candidates, search):
+        """
+        Página de resultados de búsqueda ordenada por relevancia (BM25) descendente.
+        Cada artículo se devuelve como copia con su puntuación en "score"; el cursor
+        es la clave (score, id) del último resultado de la página anterior.
+        """
+        if cursor is not None and not isinstance(cursor[0], float):
+            raise ValueError("El cursor no corresponde a una búsqueda")
+        page = []
+        for score, article_id in self._search.top(search, limit + 1, after=cursor, candidates=candidates):
+            article = self._articles.get(article_id)
+            if article is not None:
+                page.append({**article, "score": score})
+        return page[:limit], len(page) > limit
+
+    def create_article(self, article_data):
+        # article_data vendría deserializado de la entrada
+        now = datetime.datetime.utcnow()
+        new_article = {
+            "id": next(self._ids),
+            "title": article_data["title"],
+            "content": article_data["content"],
+            "author_id": article_data.get("author_id", 1), # Usar author_id del data o un valor por defecto
+            "author": f"Autor ID {article_data.get('author_id', 1)}", # Simulado: Generar nombre de autor
+            "publication_date": now, # Fecha actual al crear
+            "tags": list(article_data.get("tags", [])),
+            "version": 1,
+            "updated_at": now
+        }
+        # Entrada del índice de búsqueda calculada antes de guardar nada: si falla, no queda
+        # una escritura a medias
+        terms = article_terms(new_article)
+        # La franja del nuevo ID impide que un borrado concurrente lo vea a medio indexar
+        with self._stripe(new_article["id"]):
+            with self._index_lock:
+                self._index_secondary(new_article)
+            self._by_date.insert(_date_key(new_article))
+            self._articles[new_article["id"]] = new_article
+            self._search.add(new_article, terms)
+        return new_article
+
+    def update_article(self, article_id, update_data, expected_version=None):
+        with self._stripe(article_id):
+            article = self._articles.get(article_id)
+            if article is None:
+                return None # No encontrado
+            if expected_version is not None and article["version"] != expected_version:
+                raise VersionConflictError(article_id)
+            # Copia en escritura: los lectores siguen viendo el diccionario anterior completo
+            updated = dict(article)
+            # Actualizar solo los campos presentes en update_data
+            if "title" in update_data:
+                updated["title"] = update_data["title"]
+            if "content" in update_data:
+                updated["content"] = update_data["content"]
+            if "tags" in update_data:
+                updated["tags"] = list(update_data["tags"])
+            # Entrada del índice de búsqueda antes de modificar nada (ver create_article)
+            terms = article_terms(updated) if update_data.keys() & {"title", "content", "tags"} else None
+            if "tags" in update_data:
+                with self._index_lock:
+                    self._unindex_tags(article_id, article.get("tags", []))
+                    self._index_tags(article_id, updated["tags"])
+            updated["version"] = article["version"] + 1
+            updated["updated_at"] = datetime.datetime.utcnow()
+            # author_id y publication_date no son actualizables vía API, por lo que
+            # los índices de autor y de fechas no cambian.
+            self._articles[article_id] = updated
+            if terms is not None:
+                self._search.add(updated, terms)
+            return updated
+
+    def delete_article(self, article_id, expected_version=None):
+        with self._stripe(article_id):
+            article = self._articles.get(article_id)
+            if article is None:
+                return False
+            if expected_version is not None and article["version"] != expected_version:
+                raise VersionConflictError(article_id)
+            del self._articles[article_id]
+            with self._index_lock:
+                self._unindex_secondary(article)
+            self._by_date.remove(_date_key(article))
+            self._search.remove(article_id)
+            return True # True si se eliminó algo
+
+    def bulk_apply(self, creates, updates, deletes):
+        """
+        Aplica un lote de operaciones: `creates` (datos de artículos nuevos),
+        `updates` (pares (id, datos)) y `deletes` (ids), en ese orden.
+        Devuelve (ids creados, indicadores de actualización, indicadores de borrado),
+        alineados con las listas de entrada.
+        Antes de aplicar nada se calculan las entradas del índice de búsqueda de todos los datos
+        recibidos, de modo que un dato que no se puede indexar falla sin dejar el lote a medias.
+        """
+        for data in itertools.chain(creates, (data for _, data in updates)):
+            article_terms(data)
+        created_ids = [self.create_article(data)["id"] for data in creates]
+        updated = [self.update_article(article_id, data) is not None for article_id, data in updates]
+        deleted = [self.delete_article(article_id) for article_id in deletes]
+        return created_ids, updated, deleted
@@ -0,0 +1,475 @@
+# alphapp.xyz/content/src/search.py
+
+"""
+Índice invertido de texto completo para la búsqueda de artículos (GET /articles?search=).
+
+- Tokenización: minúsculas, plegado de acentos (artículo -> articulo, niño -> nino) y
+  eliminación de palabras vacías frecuentes del español.
+- Ranking BM25 sobre título, contenido y etiquetas (título y etiquetas pesan el doble).
+  Una consulta con varios términos exige que aparezcan todos.
+- Estructura por segmentos, como en Lucene: los documentos nuevos entran en un segmento en
+  memoria que, al llenarse, se escribe a disco como segmento inmutable; los borrados se marcan
+  y se purgan al fusionar segmentos. Las listas de postings son arrays compactos de enteros.
+- Si numpy está instalado, los segmentos inmutables se puntúan de forma vectorizada (los
+  términos frecuentes tienen cientos de miles de postings); si no, se recorren en Python.
+- Persistencia: con `path`, cada cambio se añade a un registro (write-ahead log) y los segmentos
+  y borrados se guardan en disco, de modo que al reiniciar un worker el índice se carga sin
+  volver a tokenizar los artículos.
+
+Los archivos del índice los escribe y los lee solo el propio servicio (formato pickle);
+cada directorio de índice debe tener un único proceso escritor. Por eso las aplicaciones, con
+varios workers, usan un índice en memoria por worker (ver search_index_from_config).
+"""
+
+import bisect
+import configparser
+import heapq
+import json
+import math
+import os
+import pickle
+import re
+import threading
+import unicodedata
+from array import array
+
+from .database import DEFAULT_CONFIG_PATH
+
+try:
+    import numpy # Puntuación vectorizada de los segmentos inmutables (opcional)
+except ImportError:
+    numpy = None
+
+# Palabras vacías del español que no se indexan (demasiado frecuentes para discriminar)
+STOPWORDS = frozenset("""
+a al algo como con cual de del desde donde e el ella ellos en entre era es esa ese eso esta este esto
+ha hay la las le les lo los mas me mi mucho muy ni no nos o para pero poco por que quien se sin
+sobre su sus tambien te todo tu un una uno unos y ya
+""".split())
+
+TITLE_WEIGHT = 2 # Peso de los términos del título y de las etiquetas frente al contenido
+MAX_TF = 65535 # Frecuencia máxima almacenable por término y documento (array 'H')
+
+_TOKEN = re.compile(r"\w+")
+_COMBINING = re.compile("[\u0300-\u036f]") # Diacríticos combinables (tildes, diéresis, virgulilla)
+
+
+def fold(text):
+    """Pasa el texto a minúsculas y elimina los acentos y diacríticos."""
+    text = text.casefold()
+    if text.isascii():
+        return text
+    return _COMBINING.sub("", unicodedata.normalize("NFKD", text))
+
+
+def tokenize(text):
+    """Lista de términos indexables de un texto."""
+    return [token for token in _TOKEN.findall(fold(text)) if token not in STOPWORDS]
+
+
+def article_terms(article):
+    """Frecuencias ponderadas de los términos de un artículo y longitud del documento."""
+    terms = {}
+    for token in tokenize(article.get("title") or ""):
+        terms[token] = terms.get(token, 0) + TITLE_WEIGHT
+    for tag in article.get("tags") or []:
+        for token in tokenize(tag):
+            terms[token] = terms.get(token, 0) + TITLE_WEIGHT
+    for token in tokenize(article.get("content") or ""):
+        terms[token] = terms.get(token, 0) + 1
+    return terms, sum(terms.values())
+
+
+class _Segment:
+    """
+    Conjunto de documentos con numeración local: IDs de artículo, longitudes y postings
+    term -> (array de números de documento, array de frecuencias), ordenados por número.
+    """
+
+    def __init__(self, name=None):
+        self.name = name
+        self.ids = array("q")
+        self.lengths = array("I")
+        self.postings = {}
+        self.deleted = set()
+        self._vectors = {} # Vistas numpy de los arrays (solo en segmentos inmutables)
+
+    def __len__(self):
+        return len(self.ids) - len(self.deleted)
+
+    def append(self, article_id, length, terms):
+        docnum = len(self.ids)
+        self.ids.append(article_id)
+        self.lengths.append(length)
+        for term, tf in terms.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = (array("I"), array("H"))
+            postings[0].append(docnum)
+            postings[1].append(min(tf, MAX_TF))
+        return docnum
+
+    def vectors(self, term=None):
+        """
+        Vistas numpy (sin copia) de los IDs y longitudes o, con `term`, de sus postings.
+        Solo para segmentos inmutables: un array con vistas exportadas no puede crecer.
+        """
+        vectors = self._vectors.get(term)
+        if vectors is None:
+            arrays = (self.ids, self.lengths) if term is None else self.postings[term]
+            vectors = self._vectors[term] = tuple(numpy.frombuffer(a, dtype=a.typecode) for a in arrays)
+        return vectors
+
+    def documents(self):
+        """Documentos vivos como (article_id, longitud, {término: frecuencia})."""
+        terms = [{} for _ in self.ids]
+        for term, (docnums, tfs) in self.postings.items():
+            for docnum, tf in zip(docnums, tfs):
+                terms[docnum][term] = tf
+        for docnum, article_id in enumerate(self.ids):
+            if docnum not in self.deleted:
+                yield article_id, self.lengths[docnum], terms[docnum]
+
+    def dump(self, path):
+        """Escribe el segmento a disco de forma atómica."""
+        data = {
+            "ids": self.ids.tobytes(),
+            "lengths": self.lengths.tobytes(),
+            "postings": {term: (d.tobytes(), t.tobytes()) for term, (d, t) in self.postings.items()},
+        }
+        _atomic_write(path, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+
+    @classmethod
+    def load(cls, path, name):
+        with open(path, "rb") as file:
+            data = pickle.load(file)
+        segment = cls(name)
+        segment.ids.frombytes(data["ids"])
+        segment.lengths.frombytes(data["lengths"])
+        for term, (docnums, tfs) in data["postings"].items():
+            postings = segment.postings[term] = (array("I"), array("H"))
+            postings[0].frombytes(docnums)
+            postings[1].frombytes(tfs)
+        return segment
+
+
+def _atomic_write(path, payload):
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as file:
+        file.write(payload)
+    os.replace(temporary, path)
+
+
+class SearchIndex:
+    """
+    Índice invertido segmentado con ranking BM25.
+    Sin `path` vive solo en memoria; con `path` se persiste en ese directorio.
+    Las operaciones están protegidas por un lock (el índice es seguro entre hilos).
+    """
+
+    def __init__(self, path=None, segment_size=50_000, max_segments=8, k1=1.2, b=0.75):
+        self.path = path
+        self.segment_size = segment_size
+        self.max_segments = max_segments
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._segments = [] # Segmentos inmutables (persistidos si hay path)
+        self._buffer = _Segment() # Segmento en memoria con los documentos recientes
+        self._locations = {} # article_id -> (segmento, número de documento)
+        self._total_length = 0
+        self._next_segment = 1
+        self._log = None
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+            self._load()
+            self._log = open(self._log_path, "ab")
+
+    # --- Consulta ---
+
+    def __len__(self):
+        return len(self._locations)
+
+    def __contains__(self, article_id):
+        return article_id in self._locations
+
+    def _document_frequency(self, term):
+        # Como en Lucene, los documentos borrados cuentan hasta que se fusiona su segmento
+        return sum(len(s.postings[term][0]) for s in self._all_segments() if term in s.postings)
+
+    def _all_segments(self):
+        return self._segments + [self._buffer]
+
+    def ranked(self, query, after=None, candidates=None):
+        """
+        Artículos que contienen todos los términos de la consulta como lista de
+        (puntuación, article_id) en orden descendente. `after` es la clave (puntuación, id)
+        del último resultado de la página anterior y `candidates` restringe los IDs.
+        """
+        return sorted(self._matches(query, after, candidates, None), reverse=True)
+
+    def top(self, query, limit, after=None, candidates=None):
+        """Los `limit` primeros resultados de `ranked`, sin ordenar el resto de coincidencias."""
+        return heapq.nlargest(limit, self._matches(query, after, candidates, limit))
+
+    def _matches(self, query, after, candidates, limit):
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        with self._lock:
+            count = len(self._locations)
+            if count == 0:
+                return []
+            average_length = self._total_length / count
+            idf = {}
+            for term in terms:
+                df = self._document_frequency(term)
+                if df == 0:
+                    return []
+                idf[term] = math.log(1 + (count - df + 0.5) / (df + 0.5))
+            # norm(d) = k1 * (1 - b + b * |d| / avgdl) = base + slope * |d|
+            k1 = self.k1
+            base, slope = k1 * (1 - self.b), k1 * self.b / average_length
+            results = []
+            for segment in self._all_segments():
+                lists = [(idf[term] * (k1 + 1), term, segment.postings.get(term)) for term in terms]
+                if any(postings is None for _, _, postings in lists):
+                    continue
+                # Se recorre la lista de postings más corta y se buscan los demás términos por bisección
+                lists.sort(key=lambda item: len(item[2][0]))
+                if numpy is not None and segment is not self._buffer:
+                    results.extend(self._vector_matches(segment, lists, base, slope, after, candidates, limit))
+                    continue
+                (weight, _, (docnums, tfs)), others = lists[0], lists[1:]
+                ids, lengths, deleted = segment.ids, segment.lengths, segment.deleted
+                if not others and not deleted and candidates is None:
+                    # Camino rápido para un único término sin filtros
+                    matches = [(weight * tf / (tf + (base + slope * lengths[docnum])), ids[docnum]) for docnum, tf in zip(docnums, tfs)]
+                    results.extend(matches if after is None else [key for key in matches if key < after])
+                    continue
+                for docnum, tf in zip(docnums, tfs):
+                    if docnum in deleted:
+                        continue
+                    article_id = ids[docnum]
+                    if candidates is not None and article_id not in candidates:
+                        continue
+                    norm = base + slope * lengths[docnum]
+                    score = weight * tf / (tf + norm)
+                    for term_weight, _, (other_docnums, other_tfs) in others:
+                        j = bisect.bisect_left(other_docnums, docnum)
+                        if j == len(other_docnums) or other_docnums[j] != docnum:
+                            break
+                        tf = other_tfs[j]
+                        score += term_weight * tf / (tf + norm)
+                    else:
+                        if after is None or (score, article_id) < after:
+                            results.append((score, article_id))
+        return results
+
+    @staticmethod
+    def _vector_matches(segment, lists, base, slope, after, candidates, limit):
+        """
+        Coincidencias de un segmento inmutable puntuadas con numpy. Las operaciones se hacen
+        en el mismo orden que en el recorrido en Python, así que las puntuaciones (y los
+        cursores basados en ellas) coinciden exactamente. Con `limit` solo se devuelven los
+        resultados con puntuación igual o mayor que la del `limit`-ésimo (empates incluidos).
+        """
+        ids, lengths = segment.vectors()
+        (weight, term, _), others = lists[0], lists[1:]
+        docnums, tfs = segment.vectors(term)
+        norms = base + slope * lengths[docnums]
+        scores = weight * tfs / (tfs + norms)
+        for term_weight, term, _ in others:
+            other_docnums, other_tfs = segment.vectors(term)
+            docnums, mine, theirs = numpy.intersect1d(docnums, other_docnums, assume_unique=True, return_indices=True)
+            norms, scores, tfs = norms[mine], scores[mine], other_tfs[theirs]
+            scores += term_weight * tfs / (tfs + norms)
+        keep = None
+        if segment.deleted:
+            keep = ~numpy.isin(docnums, numpy.fromiter(segment.deleted, dtype=docnums.dtype, count=len(segment.deleted)))
+        article_ids = ids[docnums]
+        if candidates is not None:
+            mask = numpy.isin(article_ids, numpy.fromiter(candidates, dtype=article_ids.dtype, count=len(candidates)))
+            keep = mask if keep is None else keep & mask
+        if after is not None:
+            mask = (scores < after[0]) | ((scores == after[0]) & (article_ids < after[1]))
+            keep = mask if keep is None else keep & mask
+        if keep is not None:
+            scores, article_ids = scores[keep], article_ids[keep]
+        if limit is not None and len(scores) > limit:
+            keep = scores >= numpy.partition(scores, len(scores) - limit)[len(scores) - limit]
+            scores, article_ids = scores[keep], article_ids[keep]
+        return zip(scores.tolist(), article_ids.tolist())
+
+    # --- Mantenimiento incremental ---
+
+    def add(self, article, terms=None):
+        """
+        Indexa un artículo (o reemplaza su versión anterior). `terms` es el resultado de
+        article_terms(article) si ya se ha calculado (antes de guardar el artículo).
+        """
+        terms, length = terms if terms is not None else article_terms(article)
+        with self._lock:
+            self._write_log(("add", article["id"], length, terms))
+            self._add(article["id"], length, terms)
+            if len(self._buffer.ids) >= self.segment_size:
+                self._seal_buffer()
+
+    def remove(self, article_id):
+        """Elimina un artículo del índice; devuelve False si no estaba indexado."""
+        with self._lock:
+            if article_id not in self._locations:
+                return False
+            self._write_log(("remove", article_id))
+            self._remove(article_id)
+            return True
+
+    def _add(self, article_id, length, terms):
+        self._remove(article_id)
+        docnum = self._buffer.append(article_id, length, terms)
+        self._locations[article_id] = (self._buffer, docnum)
+        self._total_length += length
+
+    def _remove(self, article_id):
+        location = self._locations.pop(article_id, None)
+        if location is not None:
+            segment, docnum = location
+            segment.deleted.add(docnum)
+            self._total_length -= segment.lengths[docnum]
+
+    def rebuild(self, articles):
+        """Reconstruye el índice completo a partir de un iterable de artículos."""
+        with self._lock:
+            obsolete = self._segments
+            self._segments, self._buffer, self._locations, self._total_length = [], _Segment(), {}, 0
+            for article in articles:
+                terms, length = article_terms(article)
+                self._add(article["id"], length, terms)
+                if len(self._buffer.ids) >= self.segment_size:
+                    self._seal_buffer()
+            self._seal_buffer(obsolete)
+
+    # --- Segmentos y persistencia ---
+
+    @property
+    def _log_path(self):
+        return os.path.join(self.path, "wal.log")
+
+    @property
+    def _manifest_path(self):
+        return os.path.join(self.path, "manifest.json")
+
+    def _segment_path(self, name):
+        return os.path.join(self.path, f"{name}.seg")
+
+    def _write_log(self, record):
+        if self._log is not None:
+            pickle.dump(record, self._log, protocol=pickle.HIGHEST_PROTOCOL)
+            self._log.flush()
+
+    def _seal_buffer(self, obsolete=()):
+        """Convierte el segmento en memoria en un segmento inmutable (fusionando si hay demasiados)."""
+        obsolete = list(obsolete)
+        if self._buffer.ids and not self._buffer.deleted:
+            # Sin borrados el segmento en memoria se sella tal cual, sin copiarlo
+            self._buffer.name = self._new_segment_name()
+            self._segments.append(self._buffer)
+        elif len(self._buffer):
+            self._segments.append(self._compacted([self._buffer]))
+        self._buffer = _Segment()
+        if len(self._segments) > self.max_segments:
+            obsolete += self._segments
+            merged = self._compacted(self._segments)
+            self._segments = [merged] if len(merged) else []
+        self._persist(obsolete)
+
+    def _new_segment_name(self):
+        self._next_segment += 1
+        return f"segment-{self._next_segment - 1:06d}"
+
+    def _compacted(self, segments):
+        """Nuevo segmento con los documentos vivos de `segments` (purga los borrados)."""
+        merged = _Segment(self._new_segment_name())
+        for segment in segments:
+            for article_id, length, terms in segment.documents():
+                self._locations[article_id] = (merged, merged.append(article_id, length, terms))
+        return merged
+
+    def _persist(self, obsolete=()):
+        """
+        Escribe los segmentos nuevos, los borrados y el manifiesto; después reescribe el registro
+        con los documentos que siguen en memoria y elimina los segmentos obsoletos.
+        """
+        if self.path is None:
+            return
+        for segment in self._segments:
+            if not os.path.exists(self._segment_path(segment.name)):
+                segment.dump(self._segment_path(segment.name))
+        manifest = {
+            "next_segment": self._next_segment,
+            "segments": [segment.name for segment in self._segments],
+            "deleted": {segment.name: sorted(segment.deleted) for segment in self._segments if segment.deleted},
+        }
+        _atomic_write(self._manifest_path, json.dumps(manifest).encode("utf-8"))
+        self._log.close()
+        with open(self._log_path, "wb") as log:
+            for article_id, length, terms in self._buffer.documents():
+                pickle.dump(("add", article_id, length, terms), log, protocol=pickle.HIGHEST_PROTOCOL)
+        self._log = open(self._log_path, "ab")
+        for segment in obsolete:
+            if segment not in self._segments and os.path.exists(self._segment_path(segment.name)):
+                os.remove(self._segment_path(segment.name))
+
+    def _load(self):
+        """Carga los segmentos del manifiesto y reaplica el registro de cambios pendientes."""
+        if os.path.exists(self._manifest_path):
+            with open(self._manifest_path, "rb") as file:
+                manifest = json.loads(file.read())
+            self._next_segment = manifest["next_segment"]
+            for name in manifest["segments"]:
+                segment = _Segment.load(self._segment_path(name), name)
+                segment.deleted = set(manifest["deleted"].get(name, ()))
+                self._segments.append(segment)
+                for docnum, article_id in enumerate(segment.ids):
+                    if docnum not in segment.deleted:
+                        self._locations[article_id] = (segment, docnum)
+                        self._total_length += segment.lengths[docnum]
+        if os.path.exists(self._log_path):
+            with open(self._log_path, "rb") as log:
+                while True:
+                    try:
+                        record = pickle.load(log)
+                    except (EOFError, pickle.UnpicklingError):
+                        break # Fin del registro (o última escritura incompleta)
+                    if record[0] == "add":
+                        self._add(*record[1:])
+                    else:
+                        self._remove(record[1])
+
+    def flush(self):
+        """Persiste el estado actual: sella el segmento en memoria y guarda los borrados."""
+        with self._lock:
+            self._seal_buffer()
+
+    def close(self):
+        with self._lock:
+            if self._log is not None:
+                self.flush()
+                self._log.close()
+                self._log = None
+
+
+def search_index_from_config(path=DEFAULT_CONFIG_PATH):
+    """
+    Crea el índice de búsqueda de un worker a partir de la sección [search] del archivo de
+    configuración (enabled = true). El índice vive en memoria: cada worker lo construye con los
+    artículos de la base de datos y lo pone al día con las escrituras de los demás (ver
+    sql_repository.SearchRefresh), de modo que varios workers nunca escriben los mismos archivos.
+    Devuelve None si la búsqueda con índice no está activada.
+    """
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    if not parser.getboolean("search", "enabled", fallback=False):
+        return None
+    section = parser["search"]
+    return SearchIndex(segment_size=section.getint("segment_size", 50_000), max_segments=section.getint("max_segments", 8))
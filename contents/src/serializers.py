@@ -8,6 +8,15 @@ y, opcionalmente, de deserializar los datos de entrada de la API a formatos util
 por la lógica de negocio.
 """
 
+import json
+
+try:
+    import orjson # Backend JSON rápido (opcional)
+except ImportError:
+    orjson = None
+
+from .models import TAG_NAME_LENGTH
+
 # Importar los modelos necesarios desde models.py
 # Aunque models.py ya define el modelo Article, aquí lo conceptualizamos
 # para demostrar cómo el serializador interactúa con él.
@@ -26,6 +35,115 @@ class ConceptualArticleModel:
         self.publication_date = publication_date
         self.tags = tags if tags is not None else []
 
+# --- Serialización compilada a partir de un esquema ---
+# El esquema de cada serializador se compila una sola vez a una función Python generada,
+# que construye el diccionario de salida sin recorrer el esquema en cada artículo.
+# Las listas se codifican directamente a bytes con orjson si está instalado,
+# o con la librería estándar json en caso contrario.
+
+# Tipos de campo admitidos por el esquema
+VALUE = "value" # Se copia tal cual
+DATETIME = "datetime" # Se convierte a cadena ISO 8601 (None se mantiene)
+LIST = "list" # Lista; si falta, se usa una lista vacía
+
+
+def _isoformat(value):
+    """Convierte un datetime a ISO 8601."""
+    return value.isoformat()
+
+
+def _memoized_isoformat():
+    """
+    _isoformat con memoria de las conversiones ya hechas, para una sola llamada a
+    serialize_many (la memoria se libera con la lista, no crece con el catálogo).
+    """
+    converted = {}
+    def isoformat(value):
+        text = converted.get(value)
+        if text is None:
+            text = converted[value] = value.isoformat()
+        return text
+    return isoformat
+
+
+class SchemaSerializer:
+    """
+    Serializador compilado a partir de un esquema de campos.
+    `fields` es una secuencia de tuplas (nombre_salida, nombre_origen, tipo).
+    Con `from_mapping=True` los valores se leen de diccionarios (claves);
+    en caso contrario, de atributos de objetos (modelos).
+    """
+
+    def __init__(self, fields, from_mapping=False):
+        self.fields = tuple(fields)
+        self.from_mapping = from_mapping
+        self.serialize = self._compile()
+
+    def _compile(self):
+        """Genera el código de la función de serialización para el esquema."""
+        body, items = [], []
+        for position, (name, source, kind) in enumerate(self.fields):
+            if self.from_mapping:
+                read = f"_get({source!r}, [])" if kind == LIST else f"_get({source!r})"
+            else:
+                read = f"getattr(obj, {source!r}, None) or []" if kind == LIST else f"obj.{source}"
+            if kind == DATETIME:
+                body.append(f"    v{position} = {read}")
+                read = f"None if not v{position} else _isoformat(v{position})"
+            items.append(f"{name!r}: {read}")
+        source_code = "def serialize(obj, _isoformat=_isoformat):\n"
+        if self.from_mapping:
+            source_code += "    _get = obj.get\n"
+        source_code += "\n".join(body + ["    return {" + ", ".join(items) + "}"]) + "\n"
+        namespace = {"_isoformat": _isoformat}
+        exec(source_code, namespace)
+        return namespace["serialize"]
+
+    def serialize_many(self, objs):
+        """Serializa una secuencia de objetos a una lista de diccionarios."""
+        serialize, isoformat = self.serialize, _memoized_isoformat()
+        return [serialize(obj, isoformat) for obj in objs]
+
+    def dumps_many(self, objs) -> bytes:
+        """Serializa una secuencia de objetos directamente a un array JSON en bytes."""
+        return dumps(self.serialize_many(objs))
+
+
+def dumps(data) -> bytes:
+    """Codifica datos ya serializados a JSON (UTF-8) con el backend disponible."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def is_text(value):
+    """True si `value` es una cadena no vacía (título y contenido de un artículo)."""
+    return isinstance(value, str) and bool(value)
+
+
+def normalize_tags(tags):
+    """
+    Valida y normaliza las etiquetas recibidas por la API: nombres sin espacios en los
+    extremos, sin vacíos ni duplicados y en el orden indicado. None si no son válidas.
+    """
+    if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+        return None
+    names = [tag.strip() for tag in tags if tag.strip()]
+    if any(len(name) > TAG_NAME_LENGTH for name in names):
+        return None
+    return list(dict.fromkeys(names))
+
+
+# Esquema del modelo Article (publication_date se convierte a ISO 8601, tags es una lista) [8]
+_article_schema = SchemaSerializer([
+    ("id", "id", VALUE),
+    ("title", "title", VALUE),
+    ("content", "content", VALUE),
+    ("author_id", "author_id", VALUE),
+    ("publication_date", "publication_date", DATETIME),
+    ("tags", "tags", LIST),
+])
+
 # Serializador para el modelo Article
 class ArticleSerializer:
     """
@@ -40,25 +158,22 @@ class ArticleSerializer:
         El diccionario resultante sigue el esquema JSON definido para artículos [8].
         """
         # Transforma el objeto Article a un diccionario Python
-        # que mapea a la estructura JSON esperada por la API [8].
-        serialized_data = {
-            "id": article.id,
-            "title": article.title,
-            "content": article.content,
-            # Nota: El esquema JSON [8] tiene "author", aquí mapeamos author_id
-            # Asumimos que la API Gateway o la vista manejaría la expansión si es necesaria.
-            # O, si el modelo Article tuviera una relación cargada, se serializaría el objeto author.
-            "author_id": article.author_id, # Usamos author_id del modelo conceptual
-            "publication_date": article.publication_date.isoformat() if article.publication_date else None, # Convertir DateTime a string ISO 8601
-            "tags": article.tags # Los tags son una lista en el esquema [8]
-        }
-        return serialized_data
+        # que mapea a la estructura JSON esperada por la API [8], usando el esquema compilado.
+        # Nota: El esquema JSON [8] tiene "author", aquí mapeamos author_id
+        # Asumimos que la API Gateway o la vista manejaría la expansión si es necesaria.
+        return _article_schema.serialize(article)
 
     def serialize_many(self, articles: list[ConceptualArticleModel]) -> list[dict]:
         """
         Serializa una lista de objetos Article a una lista de diccionarios.
         """
-        return [self.serialize(article) for article in articles]
+        return _article_schema.serialize_many(articles)
+
+    def dumps_many(self, articles: list[ConceptualArticleModel]) -> bytes:
+        """
+        Serializa una lista de objetos Article directamente a JSON en bytes.
+        """
+        return _article_schema.dumps_many(articles)
 
     # Opcionalmente, se puede incluir lógica para deserializar datos entrantes (por ejemplo, JSON)
     # a un formato que la lógica de negocio pueda usar para crear/actualizar modelos.
@@ -84,6 +199,57 @@ class ArticleSerializer:
     #          pass # Ejemplo conceptual
     #     return deserialized_data
 
+# Serializador de los artículos (diccionarios del repositorio) expuestos por la API.
+# Lo comparten la aplicación Flask (views.py) y la aplicación ASGI (asgi.py).
+class ConceptualArticleSerializer:
+    # Esquema del artículo [10], compilado una sola vez (ver SchemaSerializer)
+    _schema = SchemaSerializer([
+        ("id", "id", VALUE),
+        ("title", "title", VALUE),
+        ("content", "content", VALUE), # Usamos 'content' como en el esquema [10]
+        ("author", "author", VALUE), # Mapea a 'author' como en el esquema [10]
+        ("publication_date", "publication_date", DATETIME),
+        ("tags", "tags", LIST),
+    ], from_mapping=True)
+
+    def serialize(self, article):
+        """Simula la serialización de un objeto artículo a diccionario."""
+        return self._schema.serialize(article)
+    def serialize_many(self, articles):
+        """Simula la serialización de una lista de artículos."""
+        return self._schema.serialize_many(articles)
+    # Deserialización conceptual (usada para POST/PUT)
+    def deserialize(self, data: dict) -> dict:
+         """Simula la deserialización de datos de entrada a formato utilizable."""
+         # Validación básica y mapeo a formato interno (podría ser diferente del modelo directo)
+         deserialized_data = {
+             "title": data.get("title"),
+             "content": data.get("content"),
+             "tags": normalize_tags(data.get("tags", [])),
+             # Aquí podrías obtener el author_id del token JWT validado por el API Gateway
+             "author_id": data.get("author_id", 1) # Simulado: Asignar un author_id por defecto o del contexto
+         }
+         # Validación de campos obligatorios: título y contenido de texto no vacíos
+         if not is_text(deserialized_data["title"]) or not is_text(deserialized_data["content"]) or deserialized_data["tags"] is None:
+              # En un caso real, se levantaría una excepción de validación
+             print("Validación fallida: Faltan título o contenido, o las etiquetas no son válidas")
+             return None # Indicar fallo
+         return deserialized_data
+    def deserialize_update(self, data: dict) -> dict:
+         """
+         Extrae los campos actualizables (actualización parcial) de los datos de entrada.
+         None si el título o el contenido no son texto no vacío o las etiquetas no son válidas
+         (la misma validación que en deserialize).
+         """
+         update_data = {field: data[field] for field in ("title", "content") if field in data}
+         if not all(is_text(value) for value in update_data.values()):
+             return None
+         if "tags" in data:
+             update_data["tags"] = normalize_tags(data["tags"])
+             if update_data["tags"] is None:
+                 return None
+         return update_data
+
 # --- Ejemplo de uso (solo para demostración, no parte del archivo real) ---
 if __name__ == "__main__":
     import datetime
@@ -0,0 +1,585 @@
+# alphapp.xyz/content/src/sql_repository.py
+
+"""
+Repositorio de artículos respaldado por SQLAlchemy sobre el modelo Article.
+Expone la misma interfaz que el repositorio en memoria (repository.py) y devuelve
+los artículos como diccionarios, de modo que las vistas y los serializadores no cambian.
+Las consultas seleccionan solo las columnas que necesita el serializador y delegan
+en la base de datos el filtrado, el orden y la paginación por cursor.
+Con un índice de búsqueda (search.SearchIndex) la búsqueda se resuelve en el índice,
+ordenada por relevancia; sin él, se filtra con ILIKE en la base de datos. Cada worker tiene
+su propio índice en memoria (ver SearchRefresh), de modo que ningún archivo tiene dos escritores.
+Las etiquetas viven en las tablas tags/article_tags: se cargan con una consulta por
+bloque de artículos (no una por artículo) y los contadores por etiqueta se mantienen
+en la misma transacción que las asociaciones.
+"""
+
+import datetime
+import threading
+import time
+
+from sqlalchemy import and_, bindparam, delete, insert, or_, select, update
+
+from .models import Article, Tag, article_tags
+from .repository import VersionConflictError
+
+# Tamaño de los bloques de IDs en las cláusulas IN de las operaciones masivas
+_BULK_CHUNK_SIZE = 500
+
+# Segundos entre puestas al día del índice de búsqueda de un worker con las escrituras de los demás
+SEARCH_REFRESH_INTERVAL = 5.0
+# Margen hacia atrás de cada puesta al día: cubre las transacciones confirmadas después de la
+# anterior con una fecha de modificación previa a ella (y relojes algo desfasados entre workers)
+SEARCH_REFRESH_OVERLAP = datetime.timedelta(seconds=60)
+
+# Columnas que necesita el serializador (se evita cargar entidades completas)
+_ARTICLE_COLUMNS = (
+    Article.id,
+    Article.title,
+    Article.content,
+    Article.author_id,
+    Article.publication_date,
+    Article.version,
+    Article.updated_at,
+)
+
+
+def _escape_like(value):
+    """Escapa los comodines de LIKE en un texto de búsqueda."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def row_to_article(row):
+    """Convierte una fila con las columnas de _ARTICLE_COLUMNS en el diccionario del artículo."""
+    return {
+        "id": row.id,
+        "title": row.title,
+        "content": row.content,
+        "author_id": row.author_id,
+        "author": f"Autor ID {row.author_id}", # Simulado hasta expandir autores desde el servicio de usuarios
+        "publication_date": row.publication_date,
+        "tags": [], # Se completan con load_tags / tags_statement
+        "version": row.version,
+        "updated_at": row.updated_at,
+    }
+
+
+def _chunks(items):
+    items = list(items)
+    for start in range(0, len(items), _BULK_CHUNK_SIZE):
+        yield items[start:start + _BULK_CHUNK_SIZE]
+
+
+def tagged_with(tag):
+    """Subconsulta de los IDs de artículo con una etiqueta (usa el índice (tag_id, article_id))."""
+    return (
+        select(article_tags.c.article_id)
+        .join(Tag, Tag.id == article_tags.c.tag_id)
+        .where(Tag.name == tag)
+    )
+
+
+def filter_tags(statement, tags):
+    """Restringe una consulta de artículos a los que tienen todas las etiquetas indicadas."""
+    for tag in tags or ():
+        statement = statement.where(Article.id.in_(tagged_with(tag)))
+    return statement
+
+
+def tags_statement(article_ids):
+    """Etiquetas de un bloque de artículos en una sola consulta, en el orden de cada artículo."""
+    return (
+        select(article_tags.c.article_id, Tag.name)
+        .join(Tag, Tag.id == article_tags.c.tag_id)
+        .where(article_tags.c.article_id.in_(article_ids))
+        .order_by(article_tags.c.article_id, article_tags.c.position)
+    )
+
+
+def attach_tags(articles, rows):
+    """Añade a cada artículo (diccionario) las etiquetas de las filas (article_id, nombre)."""
+    by_id = {article["id"]: article for article in articles}
+    for article_id, name in rows:
+        by_id[article_id]["tags"].append(name)
+
+
+def load_tags(session, articles):
+    """Carga las etiquetas de una lista de artículos con una consulta por bloque de IDs."""
+    for chunk in _chunks(articles):
+        attach_tags(chunk, session.execute(tags_statement([article["id"] for article in chunk])))
+
+
+def tag_counts_statement(limit=None):
+    """Etiquetas en uso con su contador, de la más a la menos usada."""
+    return (
+        select(Tag.name, Tag.article_count)
+        .where(Tag.article_count > 0)
+        .order_by(Tag.article_count.desc(), Tag.name)
+        .limit(limit)
+    )
+
+
+def _insert_ignoring_duplicates(session, table):
+    """INSERT que ignora las filas que violan una restricción única (si el dialecto lo permite)."""
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        return insert(table)
+    return dialect_insert(table).on_conflict_do_nothing()
+
+
+def _tag_ids(session, names):
+    """IDs de las etiquetas con los nombres dados, creando las que no existen."""
+    ids = {}
+    for chunk in _chunks(names):
+        ids.update(session.execute(select(Tag.name, Tag.id).where(Tag.name.in_(chunk))).all())
+    missing = [name for name in names if name not in ids]
+    if missing:
+        # Otra transacción puede crear la misma etiqueta a la vez: se ignora el duplicado y se relee
+        session.execute(_insert_ignoring_duplicates(session, Tag.__table__), [{"name": name, "article_count": 0} for name in missing])
+        for chunk in _chunks(missing):
+            ids.update(session.execute(select(Tag.name, Tag.id).where(Tag.name.in_(chunk))).all())
+    return ids
+
+
+def set_article_tags(session, tags_by_article):
+    """
+    Reemplaza las etiquetas de varios artículos ({article_id: [nombres]}; una lista vacía las
+    elimina) dentro de la transacción de la sesión. Las asociaciones se insertan con un único
+    executemany y los contadores article_count se ajustan con la diferencia de cada etiqueta.
+    Es síncrona; el repositorio asíncrono la ejecuta con AsyncSession.run_sync.
+    """
+    if not tags_by_article:
+        return
+    tags_by_article = {article_id: list(dict.fromkeys(names)) for article_id, names in tags_by_article.items()}
+    previous = {}
+    for chunk in _chunks(tags_by_article):
+        rows = session.execute(select(article_tags.c.article_id, article_tags.c.tag_id).where(article_tags.c.article_id.in_(chunk)))
+        for article_id, tag_id in rows:
+            previous.setdefault(article_id, set()).add(tag_id)
+    tag_ids = _tag_ids(session, list(dict.fromkeys(name for names in tags_by_article.values() for name in names)))
+
+    deltas, associations = {}, []
+    for article_id, names in tags_by_article.items():
+        current = [tag_ids[name] for name in names]
+        old = previous.get(article_id, set())
+        for tag_id in old.difference(current):
+            deltas[tag_id] = deltas.get(tag_id, 0) - 1
+        for tag_id in set(current).difference(old):
+            deltas[tag_id] = deltas.get(tag_id, 0) + 1
+        associations.extend({"article_id": article_id, "tag_id": tag_id, "position": position} for position, tag_id in enumerate(current))
+
+    for chunk in _chunks(previous):
+        session.execute(delete(article_tags).where(article_tags.c.article_id.in_(chunk)))
+    if associations:
+        session.execute(insert(article_tags), associations)
+    counters = [{"_id": tag_id, "_delta": delta} for tag_id, delta in deltas.items() if delta]
+    if counters:
+        table = Tag.__table__
+        statement = update(table).where(table.c.id == bindparam("_id")).values(article_count=table.c.article_count + bindparam("_delta"))
+        session.execute(statement, counters)
+
+
+def list_statement(limit, cursor=None, author_id=None, search=None, tags=None):
+    """
+    Consulta de una página del listado (limit + 1 filas para saber si hay más),
+    compartida por los repositorios síncrono y asíncrono.
+    """
+    statement = filter_tags(select(*_ARTICLE_COLUMNS), tags)
+    if cursor is not None:
+        cursor_date, cursor_id = cursor
+        statement = statement.where(or_(
+            Article.publication_date < cursor_date,
+            and_(Article.publication_date == cursor_date, Article.id < cursor_id),
+        ))
+    if author_id is not None:
+        statement = statement.where(Article.author_id == author_id)
+    if search:
+        pattern = f"%{_escape_like(search)}%"
+        statement = statement.where(or_(
+            Article.title.ilike(pattern, escape="\\"),
+            Article.content.ilike(pattern, escape="\\"),
+        ))
+    return statement.order_by(Article.publication_date.desc(), Article.id.desc()).limit(limit + 1)
+
+
+def check_cursor(cursor, ranked):
+    """
+    Comprueba que el cursor corresponde al tipo de listado: los de una búsqueda por relevancia
+    (`ranked`) llevan la puntuación (float) y los del listado por fecha, la fecha. ValueError si no.
+    """
+    if cursor is not None and isinstance(cursor[0], float) != ranked:
+        raise ValueError("El cursor no corresponde a una búsqueda" if ranked else "El cursor corresponde a una búsqueda")
+
+
+def search_statement(article_ids, tags=None, author_id=None):
+    """
+    Consulta de los artículos `article_ids` (un bloque del ranking del índice de búsqueda) que
+    cumplen los filtros, compartida por los repositorios síncrono y asíncrono.
+    """
+    statement = filter_tags(select(*_ARTICLE_COLUMNS), tags).where(Article.id.in_(article_ids))
+    if author_id is not None:
+        statement = statement.where(Article.author_id == author_id)
+    return statement
+
+
+def ranked_chunks(index, search, after, size):
+    """
+    Resultados de la búsqueda en el orden del ranking, por bloques pedidos con SearchIndex.top:
+    el primero de `size` resultados y cada siguiente del doble (hasta _BULK_CHUNK_SIZE), a partir
+    del último del bloque anterior. Solo se ordenan las coincidencias de los bloques que se piden;
+    los siguientes se piden cuando los filtros de etiquetas o autor descartan artículos.
+    """
+    while True:
+        chunk = index.top(search, size, after=after)
+        if chunk:
+            yield chunk
+        if len(chunk) < size:
+            return
+        after = chunk[-1]
+        size = max(size, min(size * 2, _BULK_CHUNK_SIZE))
+
+
+def append_ranked(page, chunk, articles):
+    """Añade a `page`, en el orden del ranking `chunk` (pares (puntuación, id)), los artículos encontrados de ese bloque."""
+    rows = {article["id"]: article for article in articles}
+    for score, article_id in chunk:
+        if article_id in rows:
+            page.append({**rows[article_id], "score": score})
+
+
+def changed_since_statement(since):
+    """Consulta de los artículos modificados desde `since` (menos SEARCH_REFRESH_OVERLAP), o de todos si es None."""
+    statement = select(*_ARTICLE_COLUMNS)
+    if since is not None:
+        statement = statement.where(Article.updated_at >= since - SEARCH_REFRESH_OVERLAP)
+    return statement.order_by(Article.id)
+
+
+class SearchRefresh:
+    """
+    Mantenimiento del índice de búsqueda en memoria de un worker, compartido por los repositorios
+    síncrono y asíncrono. Cada worker construye su índice con los artículos de la base de datos
+    al arrancar y lo actualiza al momento con sus propias escrituras; las de los demás workers se
+    incorporan, como mucho cada `interval` segundos, releyendo los artículos modificados desde la
+    anterior puesta al día (updated_at). Un artículo cuya versión ya está indexada no se vuelve a
+    indexar (los documentos reemplazados cuentan en las frecuencias hasta la siguiente fusión).
+    Los artículos que eliminan otros workers siguen en el índice, pero no se devuelven: cada
+    página de resultados se carga de la base de datos.
+    """
+
+    def __init__(self, index, interval=SEARCH_REFRESH_INTERVAL, clock=time.monotonic):
+        self.index = index
+        self.interval = interval
+        self.since = None # updated_at más reciente ya indexado
+        self._indexed = {} # article_id -> (versión, updated_at) de los artículos indexados dentro del margen
+        self._clock = clock
+        self._due = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, article):
+        """Indexa un artículo, salvo que esa misma versión ya esté indexada."""
+        key = (article["version"], article["updated_at"])
+        if self._indexed.get(article["id"]) != key:
+            self.index.add(article)
+            self._indexed[article["id"]] = key
+
+    def remove(self, article_id):
+        self.index.remove(article_id)
+        self._indexed.pop(article_id, None)
+
+    def begin(self, force=False):
+        """
+        Consulta de los artículos que hay que reindexar, o None si aún no toca ponerse al día
+        (o ya lo está haciendo otra solicitud). Si no devuelve None, hay que llamar a end.
+        """
+        if (not force and self._clock() < self._due) or not self._lock.acquire(blocking=False):
+            return None
+        return changed_since_statement(self.since)
+
+    def end(self, articles):
+        """Indexa los artículos leídos (None si la consulta falló) y programa la siguiente puesta al día."""
+        try:
+            if articles is not None:
+                for article in articles:
+                    self.add(article)
+                self.since = max((article["updated_at"] for article in articles if article["updated_at"] is not None), default=self.since)
+                if self.since is not None:
+                    # Solo los artículos dentro del margen pueden volver a leerse
+                    horizon = self.since - SEARCH_REFRESH_OVERLAP
+                    self._indexed = {k: v for k, v in self._indexed.items() if v[1] is None or v[1] >= horizon}
+                self._due = self._clock() + self.interval
+        finally:
+            self._lock.release()
+
+
+def update_statement(article_id, update_data, expected_version=None):
+    """
+    UPDATE de los campos presentes en update_data que incrementa la versión.
+    Con expected_version la comprobación se hace en el propio UPDATE (WHERE version = ?).
+    """
+    values = {k: v for k, v in update_data.items() if k in ("title", "content")}
+    statement = update(Article).where(Article.id == article_id)
+    if expected_version is not None:
+        statement = statement.where(Article.version == expected_version)
+    statement = statement.values(**values, version=Article.version + 1, updated_at=datetime.datetime.utcnow())
+    return statement.execution_options(synchronize_session=False)
+
+
+def delete_statement(article_id, expected_version=None):
+    """DELETE de un artículo, condicionado a su versión si se indica expected_version."""
+    statement = delete(Article).where(Article.id == article_id)
+    if expected_version is not None:
+        statement = statement.where(Article.version == expected_version)
+    return statement
+
+
+def new_article(article_data, now):
+    """Entidad Article para los datos de un artículo nuevo."""
+    return Article(
+        title=article_data["title"],
+        content=article_data["content"],
+        author_id=article_data.get("author_id", 1),
+        publication_date=now,
+        version=1,
+        updated_at=now,
+    )
+
+
+class SqlAlchemyContentRepository:
+    """
+    Repositorio de artículos sobre una base de datos relacional.
+    Recibe una fábrica de sesiones con ámbito (ver database.create_session_factory);
+    la vista debe llamar a `remove_session()` al terminar cada solicitud.
+    El índice de búsqueda opcional se mantiene tras cada escritura confirmada y se pone al
+    día con las de los demás workers antes de cada búsqueda (ver SearchRefresh).
+    """
+
+    def __init__(self, session_factory, search_index=None, search_refresh_interval=SEARCH_REFRESH_INTERVAL):
+        self._session_factory = session_factory
+        self._search_index = search_index
+        self._search_refresh = SearchRefresh(search_index, search_refresh_interval) if search_index is not None else None
+
+    @property
+    def _session(self):
+        return self._session_factory()
+
+    def remove_session(self):
+        """Cierra la sesión de la solicitud actual y devuelve su conexión al pool."""
+        self._session_factory.remove()
+
+    def load_search_index(self):
+        """Indexa todos los artículos de la base de datos (al arrancar el worker)."""
+        self.refresh_search_index(force=True)
+        self.remove_session()
+
+    def refresh_search_index(self, force=False):
+        """Incorpora al índice de búsqueda los artículos modificados por otros workers (ver SearchRefresh)."""
+        statement = self._search_refresh.begin(force) if self._search_refresh is not None else None
+        if statement is None:
+            return
+        articles = None
+        try:
+            articles = self._fetch(statement)
+        finally:
+            self._search_refresh.end(articles)
+
+    def _fetch(self, statement):
+        session = self._session
+        articles = [row_to_article(row) for row in session.execute(statement)]
+        load_tags(session, articles)
+        return articles
+
+    # --- Interfaz del repositorio ---
+
+    def get_all_articles(self):
+        return self._fetch(select(*_ARTICLE_COLUMNS).order_by(Article.id))
+
+    def get_article_by_id(self, article_id):
+        rows = self._fetch(select(*_ARTICLE_COLUMNS).where(Article.id == article_id))
+        return rows[0] if rows else None # None si no se encuentra
+
+    def get_articles_by_author(self, author_id):
+        return self._fetch(select(*_ARTICLE_COLUMNS).where(Article.author_id == author_id).order_by(Article.id))
+
+    def get_articles_by_tag(self, tag):
+        return self._fetch(filter_tags(select(*_ARTICLE_COLUMNS), [tag]).order_by(Article.id))
+
+    def tag_counts(self, limit=None):
+        """Etiquetas con su número de artículos (contadores mantenidos), de la más a la menos usada."""
+        rows = self._session.execute(tag_counts_statement(limit))
+        return [{"name": name, "article_count": count} for name, count in rows]
+
+    def get_articles_by_date(self, start=None, end=None):
+        statement = select(*_ARTICLE_COLUMNS)
+        if start is not None:
+            statement = statement.where(Article.publication_date >= start)
+        if end is not None:
+            statement = statement.where(Article.publication_date < end)
+        return self._fetch(statement.order_by(Article.publication_date, Article.id))
+
+    def list_articles(self, limit, cursor=None, tags=None, author_id=None, search=None):
+        """
+        Devuelve una página de artículos ordenada por (publication_date, id) descendente
+        y un indicador de si quedan más artículos. Ver IndexedContentRepository.list_articles.
+        """
+        if search and self._search_index is not None:
+            return self._search_articles(limit, cursor, tags, author_id, search)
+        check_cursor(cursor, ranked=False)
+        statement = list_statement(limit, cursor, author_id, search, tags)
+        page = self._fetch(statement)
+        return page[:limit], len(page) > limit
+
+    def _search_articles(self, limit, cursor, tags, author_id, search):
+        """
+        Página de resultados de búsqueda por relevancia (ver IndexedContentRepository._search_articles).
+        Los artículos se cargan por bloques de IDs en el orden del ranking (ver ranked_chunks)
+        hasta completar la página.
+        """
+        check_cursor(cursor, ranked=True)
+        self.refresh_search_index()
+        page = []
+        for chunk in ranked_chunks(self._search_index, search, cursor, limit + 1):
+            append_ranked(page, chunk, self._fetch(search_statement([article_id for _, article_id in chunk], tags, author_id)))
+            if len(page) > limit:
+                break
+        return page[:limit], len(page) > limit
+
+    def create_article(self, article_data):
+        session = self._session
+        article = new_article(article_data, datetime.datetime.utcnow())
+        tags = list(dict.fromkeys(article_data.get("tags") or []))
+        session.add(article)
+        try:
+            session.flush()
+            set_article_tags(session, {article.id: tags})
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        created = {**row_to_article(article), "tags": tags}
+        if self._search_refresh is not None:
+            self._search_refresh.add(created)
+        return created
+
+    def update_article(self, article_id, update_data, expected_version=None):
+        session = self._session
+        statement = update_statement(article_id, update_data, expected_version)
+        try:
+            result = session.execute(statement)
+            if result.rowcount > 0 and "tags" in update_data:
+                set_article_tags(session, {article_id: update_data["tags"]})
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        if result.rowcount == 0:
+            if expected_version is not None and self.get_article_by_id(article_id) is not None:
+                raise VersionConflictError(article_id)
+            return None # No encontrado
+        updated = self.get_article_by_id(article_id)
+        if self._search_refresh is not None and updated is not None:
+            self._search_refresh.add(updated)
+        return updated
+
+    def delete_article(self, article_id, expected_version=None):
+        session = self._session
+        statement = delete_statement(article_id, expected_version)
+        try:
+            # Las asociaciones se retiran antes que el artículo (clave foránea); si el DELETE
+            # no afecta a ninguna fila, el rollback las restaura junto con los contadores
+            set_article_tags(session, {article_id: []})
+            result = session.execute(statement)
+            if result.rowcount == 0:
+                session.rollback()
+            else:
+                session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        if result.rowcount == 0 and expected_version is not None and self.get_article_by_id(article_id) is not None:
+            raise VersionConflictError(article_id)
+        if self._search_refresh is not None and result.rowcount > 0:
+            self._search_refresh.remove(article_id)
+        return result.rowcount > 0 # True si se eliminó algo
+
+    def _existing_ids(self, session, ids):
+        """IDs de la lista que existen en la base de datos (consultados por bloques)."""
+        existing = set()
+        unique_ids = list(dict.fromkeys(ids))
+        for start in range(0, len(unique_ids), _BULK_CHUNK_SIZE):
+            chunk = unique_ids[start:start + _BULK_CHUNK_SIZE]
+            existing.update(session.scalars(select(Article.id).where(Article.id.in_(chunk))))
+        return existing
+
+    def bulk_apply(self, creates, updates, deletes):
+        """
+        Aplica un lote de operaciones en una única transacción: `creates` (datos de
+        artículos nuevos), `updates` (pares (id, datos)) y `deletes` (ids), en ese orden.
+        Las inserciones y actualizaciones se envían como sentencias executemany.
+        Devuelve (ids creados, indicadores de actualización, indicadores de borrado).
+        """
+        session = self._session
+        now = datetime.datetime.utcnow()
+        try:
+            created_ids = []
+            if creates:
+                articles = [new_article(data, now) for data in creates]
+                session.add_all(articles)
+                session.flush()
+                created_ids = [article.id for article in articles]
+                set_article_tags(session, {article.id: data.get("tags") or [] for article, data in zip(articles, creates)})
+
+            existing = self._existing_ids(session, [article_id for article_id, _ in updates])
+            updated = [article_id in existing for article_id, _ in updates]
+            rows = [
+                {"_id": article_id, **{f"_{k}": v for k, v in data.items() if k in ("title", "content")}}
+                for article_id, data in updates if article_id in existing
+            ]
+            # Agrupar por conjunto de columnas: cada grupo es un único executemany
+            # que además incrementa la versión de cada artículo
+            groups = {}
+            for row in rows:
+                groups.setdefault(tuple(sorted(k[1:] for k in row if k != "_id")), []).append(row)
+            table = Article.__table__
+            for columns, group in groups.items():
+                statement = (
+                    update(table)
+                    .where(table.c.id == bindparam("_id"))
+                    .values({**{column: bindparam(f"_{column}") for column in columns},
+                             "version": table.c.version + 1, "updated_at": now})
+                )
+                session.execute(statement, group)
+            set_article_tags(session, {article_id: data["tags"] for article_id, data in updates if article_id in existing and "tags" in data})
+
+            existing = self._existing_ids(session, deletes)
+            deleted, seen = [], set()
+            for article_id in deletes:
+                deleted.append(article_id in existing and article_id not in seen)
+                seen.add(article_id)
+            existing_list = list(existing)
+            set_article_tags(session, {article_id: [] for article_id in existing_list})
+            for start in range(0, len(existing_list), _BULK_CHUNK_SIZE):
+                chunk = existing_list[start:start + _BULK_CHUNK_SIZE]
+                session.execute(delete(Article).where(Article.id.in_(chunk)))
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        if self._search_refresh is not None:
+            changed_ids = created_ids + [article_id for (article_id, _), flag in zip(updates, updated) if flag]
+            self._reindex(changed_ids, [article_id for article_id, flag in zip(deletes, deleted) if flag])
+        return created_ids, updated, deleted
+
+    def _reindex(self, changed_ids, deleted_ids):
+        """Actualiza el índice de búsqueda tras un lote: reindexa los artículos cambiados y retira los eliminados."""
+        changed_ids = list(dict.fromkeys(changed_ids))
+        for start in range(0, len(changed_ids), _BULK_CHUNK_SIZE):
+            chunk = changed_ids[start:start + _BULK_CHUNK_SIZE]
+            for article in self._fetch(select(*_ARTICLE_COLUMNS).where(Article.id.in_(chunk))):
+                self._search_refresh.add(article)
+        for article_id in deleted_ids:
+            self._search_refresh.remove(article_id)
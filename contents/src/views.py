@@ -8,108 +8,96 @@ y utiliza serializadores para formatear las respuestas en JSON.
 
 # Importar el framework web (ej. Flask o FastAPI). Usaremos Flask para este ejemplo conceptual.
 # En un proyecto real, la elección dependería de la infraestructura específica.
-from flask import Flask, jsonify, request, abort
+from flask import Flask, Response, jsonify, request, stream_with_context
 import json # Importar json para simular la entrada/salida
+import os
 import datetime # Necesario para manejar fechas como en el esquema JSON
 # Importar el serializador definido en serializers.py
 # from .serializers import ArticleSerializer # Ejemplo de importación real
-
-# Simulación conceptual del serializador para el ejemplo
-class ConceptualArticleSerializer:
-    def serialize(self, article):
-        """Simula la serialización de un objeto artículo a diccionario."""
-        # Mapea al esquema JSON del artículo [10]
-        return {
-            "id": article.get("id"),
-            "title": article.get("title"),
-            "content": article.get("content"), # Usamos 'content' como en el esquema [10]
-            "author": article.get("author"), # Mapea a 'author' como en el esquema [10]
-            "publication_date": article.get("publication_date").isoformat() if article.get("publication_date") else None,
-            "tags": article.get("tags", [])
-        }
-    def serialize_many(self, articles):
-        """Simula la serialización de una lista de artículos."""
-        return [self.serialize(article) for article in articles]
-    # Deserialización conceptual (usada para POST/PUT)
-    def deserialize(self, data: dict) -> dict:
-         """Simula la deserialización de datos de entrada a formato utilizable."""
-         # Validación básica y mapeo a formato interno (podría ser diferente del modelo directo)
-         deserialized_data = {
-             "title": data.get("title"),
-             "content": data.get("content"),
-             "tags": data.get("tags", []),
-             # Aquí podrías obtener el author_id del token JWT validado por el API Gateway
-             "author_id": data.get("author_id", 1) # Simulado: Asignar un author_id por defecto o del contexto
-         }
-         # Validación de campos obligatorios (ejemplo conceptual)
-         if not deserialized_data.get("title") or not deserialized_data.get("content"):
-              # En un caso real, se levantaría una excepción de validación
-             print("Validación fallida: Faltan título o contenido")
-             return None # Indicar fallo
-         return deserialized_data
-
+# El serializador y la validación de la API se comparten con la aplicación ASGI (asgi.py)
+from .serializers import ConceptualArticleSerializer, dumps
+from .pagination import iter_articles, parse_list_params
+from .database import DATABASE_URL_ENV, create_session_factory, engine_from_config
+from .sql_repository import SqlAlchemyContentRepository
+from .cache import cache_from_config
+from .search import search_index_from_config
+from .authors import iter_expanded, parse_expand
+from .api import ArticleApi, ConceptualContentRepository, create_author_resolver, run_sync
+from .bulk import BulkRequestError, apply_bulk_operations, iter_lines, parse_ndjson, plan_bulk_operations
 
 # Importar los modelos (simulados para el ejemplo)
 # from .models import Article # Ejemplo de importación real
-# Simulación conceptual de interacción con la base de datos/modelos
-class ConceptualContentRepository:
-    """Simula la interacción con la capa de datos."""
-    def __init__(self):
-        # Simulación de una base de datos en memoria
-        self._articles = [
-            {"id": 1, "title": "Artículo de Prueba 1", "content": "Contenido del artículo 1.", "author_id": 101, "author": "Autor Ejemplo 1", "publication_date": datetime.datetime.utcnow() - datetime.timedelta(days=5), "tags": ["tecnología", "ejemplo"]},
-            {"id": 2, "title": "Artículo de Prueba 2", "content": "Contenido del artículo 2.", "author_id": 102, "author": "Autor Ejemplo 2", "publication_date": datetime.datetime.utcnow() - datetime.timedelta(days=2), "tags": ["programación", "ejemplo"]}
-        ]
-        self._next_id = 3
-
-    def get_all_articles(self):
-        # En un caso real, aplicar paginación, filtrado, búsqueda [17, 18]
-        return self._articles
-
-    def get_article_by_id(self, article_id):
-        for article in self._articles:
-            if article["id"] == article_id:
-                return article
-        return None # No encontrado
-
-    def create_article(self, article_data):
-        # article_data vendría deserializado de la entrada [10]
-        new_article = {
-            "id": self._next_id,
-            "title": article_data["title"],
-            "content": article_data["content"],
-            "author_id": article_data.get("author_id", 1), # Usar author_id del data o un valor por defecto
-            "author": f"Autor ID {article_data.get('author_id', 1)}", # Simulado: Generar nombre de autor
-            "publication_date": datetime.datetime.utcnow(), # Fecha actual al crear
-            "tags": article_data.get("tags", [])
-        }
-        self._articles.append(new_article)
-        self._next_id += 1
-        return new_article
-
-    def update_article(self, article_id, update_data):
-        # update_data vendría deserializado de la entrada
-        for article in self._articles:
-            if article["id"] == article_id:
-                # Actualizar solo los campos presentes en update_data
-                if "title" in update_data:
-                    article["title"] = update_data["title"]
-                if "content" in update_data:
-                    article["content"] = update_data["content"]
-                if "tags" in update_data:
-                     article["tags"] = update_data["tags"]
-                # Otros campos como author_id o publication_date podrían no ser actualizables vía API
-                return article
-        return None # No encontrado
-
-    def delete_article(self, article_id):
-        initial_count = len(self._articles)
-        self._articles = [article for article in self._articles if article["id"] != article_id]
-        return len(self._articles) < initial_count # True si se eliminó algo
+# El repositorio simulado en memoria (ConceptualContentRepository) y la lógica de los endpoints
+# de artículos (ArticleApi) se comparten con la aplicación ASGI: ver api.py
+
+def create_content_repository():
+    """
+    Crea el repositorio de contenidos: si la variable de entorno CONTENT_DATABASE_URL
+    está definida se usa la base de datos (SQLAlchemy con pool de conexiones) y, si está
+    configurado, el índice de búsqueda del worker; en caso contrario, el repositorio simulado en memoria.
+    """
+    if os.environ.get(DATABASE_URL_ENV):
+        repository = SqlAlchemyContentRepository(create_session_factory(engine_from_config()), search_index=search_index_from_config())
+        # Índice de búsqueda en memoria de este worker, construido con los artículos de la base de datos
+        repository.load_search_index()
+        return repository
+    return ConceptualContentRepository()
+
+STREAM_CHUNK_SIZE = 64 * 1024 # Bytes acumulados antes de enviar cada bloque del streaming
+
+def wants_ndjson_stream():
+    """Indica si la solicitud pide el listado en streaming (NDJSON)."""
+    if request.args.get("stream") in ("1", "true"):
+        return True
+    return request.accept_mimetypes.best == "application/x-ndjson"
+
+def generate_ndjson(articles):
+    """
+    Serializa los artículos uno a uno como NDJSON y los agrupa en bloques de
+    ~STREAM_CHUNK_SIZE bytes, de modo que la memoria no crece con el catálogo.
+    """
+    buffer, size = [], 0
+    serialize = article_serializer.serialize
+    for article in articles:
+        line = dumps(serialize(article)) + b"\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= STREAM_CHUNK_SIZE:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+def json_response(data, status=200):
+    """Respuesta JSON codificada con el backend rápido de serializers.dumps."""
+    return Response(dumps(data), status=status, mimetype='application/json')
+
+def article_api():
+    """Manejadores compartidos (api.ArticleApi) sobre el repositorio, la caché y los autores actuales."""
+    return ArticleApi(content_repository, article_serializer, article_cache, author_resolver)
+
+def flask_response(response):
+    """Convierte una api.ApiResponse en una respuesta de Flask."""
+    result = Response(response.body, status=response.status, mimetype='application/json' if response.body else None)
+    if response.etag is not None:
+        result.set_etag(response.etag)
+    if response.last_modified is not None:
+        result.last_modified = response.last_modified
+    return result
 
 app = Flask(__name__)
 article_serializer = ConceptualArticleSerializer()
-content_repository = ConceptualContentRepository() # Instancia del repositorio simulado
+content_repository = create_content_repository()
+# Caché de cuerpos de artículos (ver api.ArticleApi.encoded_article); las escrituras, también las masivas, la invalidan
+article_cache = cache_from_config()
+# Autores expandidos (?expand=author), resueltos por lotes y cacheados con TTL
+author_resolver = create_author_resolver()
+
+@app.teardown_appcontext
+def remove_repository_session(exception=None):
+    """Libera la sesión de base de datos de la solicitud (si el repositorio la usa)."""
+    if hasattr(content_repository, "remove_session"):
+        content_repository.remove_session()
 
 # Endpoint para obtener todos los artículos o crear uno nuevo [13, 14]
 @app.route('/articles', methods=['GET', 'POST'])
@@ -118,118 +106,78 @@ def articles_list_create():
     # Por ejemplo: if not is_authenticated(): return jsonify({"message": "No autorizado"}), 401
 
     if request.method == 'GET':
-        # Lógica para manejar parámetros de paginación, filtrado, búsqueda [17, 18]
-        # page = request.args.get('page', 1, type=int)
-        # limit = request.args.get('limit', 10, type=int)
-        # filter_tag = request.args.get('tags')
-        # search_query = request.args.get('search')
-
-        # Obtener artículos de la capa de datos (repositorio/modelo)
-        # Aplicar lógica de paginación/filtrado/búsqueda si los parámetros existen
-        all_articles = content_repository.get_all_articles() # Simplicidad, sin paginación/filtrado real aquí
-
-        # Serializar la lista de objetos a diccionarios JSON [1, 4, 5]
-        serialized_articles = article_serializer.serialize_many(all_articles)
-
-        # Devolver la respuesta JSON con código 200 OK
-        # En un caso real, añadir metadatos de paginación si aplica [17]
-        return jsonify(serialized_articles), 200
+        # Modo streaming (exportación): NDJSON por bloques, sin construir la lista completa
+        if wants_ndjson_stream():
+            try:
+                list_params = parse_list_params(request.args)
+                expand = parse_expand(request.args)
+            except ValueError as e:
+                return jsonify({"message": str(e)}), 400 # Bad Request
+            list_params.pop("limit")
+            articles = iter_articles(content_repository, **list_params)
+            if "author" in expand:
+                articles = iter_expanded(articles, author_resolver)
+            return Response(stream_with_context(generate_ndjson(articles)), mimetype='application/x-ndjson')
+
+        # Página del listado con paginación por cursor, filtros y búsqueda (ver api.ArticleApi.list_articles)
+        return flask_response(run_sync(article_api().list_articles(request)))
 
     elif request.method == 'POST':
         # Crear un nuevo artículo
-        data = request.get_json() # Obtener datos JSON del cuerpo de la solicitud
-
-        # Deserializar y validar los datos entrantes [1, 4]
-        deserialized_data = article_serializer.deserialize(data)
-
-        # Verificar si la deserialización/validación fue exitosa
-        if deserialized_data is None:
-             return jsonify({"message": "Datos de entrada no válidos"}), 400 # Bad Request [19]
-
         # En un caso real, el author_id se obtendría del contexto de autenticación
-        # deserialized_data['author_id'] = get_user_id_from_auth_context()
-
-        # Crear el artículo usando la capa de datos (repositorio/modelo)
-        try:
-            new_article = content_repository.create_article(deserialized_data)
-        except Exception as e:
-            # Manejo de errores, ej. error de base de datos
-            print(f"Error al crear artículo: {e}")
-            return jsonify({"message": "Error interno al crear artículo"}), 500 # Internal Server Error
-
-        # Serializar el nuevo objeto creado para la respuesta [1, 4, 5]
-        serialized_new_article = article_serializer.serialize(new_article)
-
-        # Devolver la respuesta JSON con código 201 Created [20]
-        return jsonify(serialized_new_article), 201
+        return flask_response(run_sync(article_api().create_article(request.get_json(silent=True))))
+
+# Endpoint de la nube de etiquetas: etiquetas en uso con su número de artículos
+@app.route('/tags', methods=['GET'])
+def tags_list():
+    return flask_response(run_sync(article_api().list_tags(request)))
+
+# Endpoint para operaciones masivas de creación, actualización y eliminación de artículos
+@app.route('/articles/bulk', methods=['POST'])
+def articles_bulk():
+    # Acepta una lista JSON de operaciones o un flujo NDJSON (Content-Type: application/x-ndjson)
+    try:
+        if request.mimetype == 'application/x-ndjson':
+            operations = parse_ndjson(iter_lines(request.stream))
+        else:
+            operations = request.get_json(silent=True)
+            if not isinstance(operations, list):
+                return jsonify({"message": "Se espera una lista de operaciones"}), 400
+        # Validar todas las operaciones en una sola pasada
+        creates, updates, deletes, results = plan_bulk_operations(operations, article_serializer)
+    except BulkRequestError as e:
+        return jsonify({"message": str(e)}), 400
+
+    # Aplicar las operaciones válidas en un único lote del repositorio
+    try:
+        results, summary = apply_bulk_operations(content_repository, creates, updates, deletes, results)
+    except Exception:
+        app.logger.exception("Error al aplicar operaciones masivas")
+        return jsonify({"message": "Error interno al aplicar operaciones masivas"}), 500
+
+    # Invalidar en la caché los artículos creados, actualizados o eliminados
+    if article_cache is not None:
+        for result in results:
+            if result["status"] in (200, 201):
+                article_cache.invalidate(result["id"])
+
+    # Un resultado por operación, en el mismo orden de la solicitud
+    return json_response({"results": results, "summary": summary}, 200)
 
 # Endpoint para obtener, actualizar o eliminar un artículo específico por ID [13, 14]
 @app.route('/articles/<int:article_id>', methods=['GET', 'PUT', 'DELETE'])
 def article_detail(article_id):
     # En un entorno real, la autenticación/autorización y verificación de permisos se realizaría aquí [5, 9, 15, 16]
     # Por ejemplo: if not can_access_article(user, article_id): return jsonify({"message": "Prohibido"}), 403
-
-    # Obtener el artículo de la capa de datos
-    article = content_repository.get_article_by_id(article_id)
-
-    # Si el artículo no se encuentra, devolver 404 Not Found [19]
-    if article is None:
-        abort(404) # Flask Abort generará una respuesta 404 estándar
-
+    api = article_api()
     if request.method == 'GET':
-        # Serializar el objeto Article a un diccionario JSON [1, 4, 5]
-        serialized_article = article_serializer.serialize(article)
-
-        # Devolver la respuesta JSON con código 200 OK
-        return jsonify(serialized_article), 200
-
-    elif request.method == 'PUT':
-        # Actualizar el artículo existente
-        data = request.get_json() # Obtener datos JSON del cuerpo de la solicitud
-
-        # Deserializar y validar los datos entrantes (solo campos permitidos para actualizar)
-        # Podrías tener un serializador de actualización diferente
-        deserialized_update_data = {}
-        if 'title' in data:
-            deserialized_update_data['title'] = data['title']
-        if 'content' in data:
-            deserialized_update_data['content'] = data['content']
-        if 'tags' in data:
-             deserialized_update_data['tags'] = data['tags']
-
-        if not deserialized_update_data: # Si no hay campos válidos para actualizar
-             return jsonify({"message": "No hay campos válidos para actualizar"}), 400
-
-        # En un caso real, verificar que el usuario autenticado sea el autor del artículo para actualizar
-
-        # Actualizar el artículo usando la capa de datos (repositorio/modelo)
-        try:
-            updated_article = content_repository.update_article(article_id, deserialized_update_data)
-        except Exception as e:
-             print(f"Error al actualizar artículo: {e}")
-             return jsonify({"message": "Error interno al actualizar artículo"}), 500
-
-        # Serializar el objeto actualizado para la respuesta [1, 4, 5]
-        serialized_updated_article = article_serializer.serialize(updated_article)
-
-        # Devolver la respuesta JSON con código 200 OK
-        return jsonify(serialized_updated_article), 200
-
-    elif request.method == 'DELETE':
-        # Eliminar el artículo
-        # En un caso real, verificar que el usuario autenticado tenga permisos para eliminar
-
-        # Eliminar el artículo usando la capa de datos (repositorio/modelo)
-        try:
-            is_deleted = content_repository.delete_article(article_id)
-            if not is_deleted: # Esto no debería ocurrir si article se encontró arriba, pero es buena práctica
-                 abort(404)
-        except Exception as e:
-             print(f"Error al eliminar artículo: {e}")
-             return jsonify({"message": "Error interno al eliminar artículo"}), 500
-
-        # Devolver una respuesta exitosa (código 200 OK o 204 No Content) [14] muestra 200 con mensaje
-        return jsonify({"message": f"Artículo con ID {article_id} eliminado"}), 200 # O return '', 204
+        # GET condicional (If-None-Match / If-Modified-Since) y cuerpo servido desde la caché
+        return flask_response(run_sync(api.get_article(request, article_id)))
+    if request.method == 'PUT':
+        # Actualización parcial, con concurrencia optimista si hay If-Match
+        return flask_response(run_sync(api.update_article(request, article_id, request.get_json(silent=True))))
+    # DELETE, con concurrencia optimista si hay If-Match
+    return flask_response(run_sync(api.delete_article(request, article_id)))
 
 # --- Ejemplo de cómo ejecutar la aplicación (para desarrollo/testing local) ---
 if __name__ == '__main__':
@@ -238,8 +186,13 @@ if __name__ == '__main__':
     # app.run(debug=True) # Habilitar debug para desarrollo
      print("Corriendo el microservicio de contenido (simulado)")
      print("Ejemplo: GET /articles")
+     print("Ejemplo: GET /articles?limit=10&tags=ejemplo&author_id=101&cursor=<next_cursor>")
+     print("Ejemplo: GET /articles?stream=1 (o Accept: application/x-ndjson) para exportar en NDJSON")
      print("Ejemplo: POST /articles con body: {'title': 'Test', 'content': 'Contenido', 'tags': ['a'] }")
+     print("Ejemplo: POST /articles/bulk con body: [{'op': 'create', 'data': {'title': 'A', 'content': 'B'}}, {'op': 'delete', 'id': 2}]")
+     print("Ejemplo: GET /tags?limit=20")
      print("Ejemplo: GET /articles/1")
+     print("Ejemplo: GET /articles?expand=author (autores en una sola llamada por página)")
      print("Ejemplo: PUT /articles/1 con body: {'content': 'Contenido Actualizado'}")
      print("Ejemplo: DELETE /articles/1")
 
@@ -0,0 +1,180 @@
+# alphapp.xyz/contenidos/pruebas/test_asgi.py
+
+import asyncio
+import datetime
+import json
+
+import pytest
+
+from src.asgi import ContentApplication
+from src.async_repository import AsyncRepositoryAdapter, AsyncSqlAlchemyContentRepository
+from src.cache import ArticleResponseCache, InProcessCacheBackend
+from src.database import build_async_engine, create_async_session_factory
+from src.models import Article, Base
+from src.repository import IndexedContentRepository
+from src.search import SearchIndex
+
+BASE = datetime.datetime(2024, 1, 1, 10, 0, 0)
+
+
+async def sql_repository(search_index=None):
+    """Repositorio asíncrono sobre SQLite en memoria (aiosqlite) con tres artículos."""
+    engine = build_async_engine("sqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    session_factory = create_async_session_factory(engine)
+    async with session_factory() as session:
+        session.add_all([
+            Article(id=i, title=f"Artículo {i}", content="Contenido", author_id=100 + i % 2, publication_date=BASE + datetime.timedelta(days=i))
+            for i in (1, 2, 3)
+        ])
+        await session.commit()
+    return AsyncSqlAlchemyContentRepository(session_factory, search_index=search_index), engine
+
+
+def memory_repository():
+    return AsyncRepositoryAdapter(IndexedContentRepository([
+        {"id": i, "title": f"Artículo {i}", "content": "Contenido", "author_id": 100 + i % 2,
+         "publication_date": BASE + datetime.timedelta(days=i), "tags": []}
+        for i in (1, 2, 3)
+    ]))
+
+
+class Client:
+    """Cliente mínimo que invoca la aplicación ASGI directamente, sin servidor."""
+
+    def __init__(self, app, loop):
+        self.app = app
+        self.loop = loop
+
+    def request(self, method, path, body=None, headers=None):
+        path, _, query = path.partition("?")
+        scope = {
+            "type": "http", "method": method, "path": path, "query_string": query.encode(),
+            "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+        }
+        payload = json.dumps(body).encode() if body is not None else b""
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": payload, "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        self.loop.run_until_complete(self.app(scope, receive, send))
+        start, end = messages
+        return start["status"], {k.decode(): v.decode() for k, v in start["headers"]}, end["body"]
+
+
+@pytest.fixture(params=["memoria", "aiosqlite"])
+def client(request):
+    """Cliente de la aplicación ASGI sobre el repositorio en memoria y sobre SQLAlchemy asíncrono."""
+    loop = asyncio.new_event_loop()
+    engine = None
+    if request.param == "memoria":
+        repository = memory_repository()
+    else:
+        repository, engine = loop.run_until_complete(sql_repository())
+    yield Client(ContentApplication(repository, cache=ArticleResponseCache(InProcessCacheBackend())), loop)
+    if engine is not None:
+        loop.run_until_complete(engine.dispose())
+    loop.close()
+
+
+def test_listado_paginado(client):
+    """Verifica el sobre de paginación y el cursor del listado."""
+    status, headers, body = client.request("GET", "/articles?limit=2")
+    data = json.loads(body)
+    assert status == 200
+    assert [a["id"] for a in data["data"]] == [3, 2]
+    assert data["pagination"]["has_more"] is True
+    _, _, body = client.request("GET", f"/articles?limit=2&cursor={data['pagination']['next_cursor']}")
+    assert [a["id"] for a in json.loads(body)["data"]] == [1]
+    assert client.request("GET", "/articles?limit=2", headers={"If-None-Match": headers["etag"]})[0] == 304
+    assert client.request("GET", "/articles?limit=x")[0] == 400
+
+
+def test_ciclo_crud_y_condicionales(client):
+    """Verifica creación, lectura condicional, actualización con If-Match y borrado."""
+    status, _, body = client.request("POST", "/articles", {"title": "Nuevo", "content": "Texto"})
+    assert status == 201
+    article_id = json.loads(body)["id"]
+    status, headers, body = client.request("GET", f"/articles/{article_id}")
+    assert status == 200 and json.loads(body)["title"] == "Nuevo"
+    first_etag = headers["etag"]
+    assert first_etag.startswith(f'"{article_id}-1-')
+    assert client.request("GET", f"/articles/{article_id}", headers={"If-None-Match": first_etag})[0] == 304
+
+    status, headers, body = client.request("PUT", f"/articles/{article_id}", {"title": "Editado"}, {"If-Match": first_etag})
+    assert status == 200 and json.loads(body)["title"] == "Editado"
+    assert headers["etag"].startswith(f'"{article_id}-2-')
+    assert client.request("PUT", f"/articles/{article_id}", {"title": "X"}, {"If-Match": first_etag})[0] == 412
+    assert client.request("DELETE", f"/articles/{article_id}", headers={"If-Match": first_etag})[0] == 412
+    assert client.request("DELETE", f"/articles/{article_id}")[0] == 200
+    assert client.request("GET", f"/articles/{article_id}")[0] == 404
+
+
+def test_etiquetas(client):
+    """Verifica la creación con etiquetas, el filtro por etiquetas y la nube de etiquetas."""
+    status, _, body = client.request("POST", "/articles", {"title": "Nuevo", "content": "Texto", "tags": [" python ", "asgi", "python"]})
+    assert status == 201 and json.loads(body)["tags"] == ["python", "asgi"]
+    _, _, body = client.request("GET", "/articles?tags=asgi,python")
+    assert [a["tags"] for a in json.loads(body)["data"]] == [["python", "asgi"]]
+    _, _, body = client.request("GET", "/tags?limit=1")
+    assert json.loads(body)["data"] == [{"name": "asgi", "article_count": 1}]
+    assert client.request("POST", "/articles", {"title": "T", "content": "C", "tags": "python"})[0] == 400
+
+
+def test_errores_de_entrada_y_rutas(client):
+    """Verifica la validación compartida con la aplicación Flask y las rutas desconocidas."""
+    assert client.request("POST", "/articles", {"title": "Sin contenido"})[0] == 400
+    assert client.request("PUT", "/articles/1", {"author_id": 5})[0] == 400
+    assert client.request("PATCH", "/articles/1")[0] == 405
+    assert client.request("GET", "/otros")[0] == 404
+
+
+def test_datos_no_validos_no_se_guardan(client):
+    """Verifica que un título, contenido o etiquetas no válidos responden 400 sin guardar nada."""
+    assert client.request("POST", "/articles", {"title": 123, "content": "x"})[0] == 400
+    assert client.request("POST", "/articles", {"title": "T", "content": {"a": 1}})[0] == 400
+    _, _, body = client.request("GET", "/articles")
+    assert len(json.loads(body)["data"]) == 3
+    assert client.request("PUT", "/articles/1", {"title": ["a"]})[0] == 400
+    assert client.request("PUT", "/articles/1", {"title": "Bien", "content": 5})[0] == 400
+    assert client.request("PUT", "/articles/1", {"title": "Bien", "tags": 5})[0] == 400
+    assert client.request("PUT", "/articles/1", {"tags": ["ok", 3]})[0] == 400
+    _, _, body = client.request("GET", "/articles/1")
+    assert json.loads(body)["title"] == "Artículo 1"
+
+
+def test_busqueda_con_indice_en_repositorio_asincrono():
+    """Verifica la búsqueda por relevancia con índice, su mantenimiento y la comprobación del tipo de cursor."""
+    loop = asyncio.new_event_loop()
+    repository, engine = loop.run_until_complete(sql_repository(SearchIndex()))
+    loop.run_until_complete(repository.load_search_index())
+    client = Client(ContentApplication(repository), loop)
+    status, _, body = client.request("POST", "/articles", {"title": "Python asíncrono", "content": "Texto"})
+    created = json.loads(body)["id"]
+    _, _, body = client.request("GET", "/articles?search=asincrono")
+    data = json.loads(body)
+    assert [a["id"] for a in data["data"]] == [created]
+    _, _, body = client.request("GET", "/articles?search=contenido&limit=1")
+    search_cursor = json.loads(body)["pagination"]["next_cursor"]
+    assert search_cursor is not None
+    assert client.request("GET", f"/articles?cursor={search_cursor}")[0] == 400
+    _, _, body = client.request("GET", "/articles?limit=1")
+    assert client.request("GET", f"/articles?search=contenido&cursor={json.loads(body)['pagination']['next_cursor']}")[0] == 400
+    client.request("DELETE", f"/articles/{created}")
+    assert json.loads(client.request("GET", "/articles?search=asincrono")[2])["data"] == []
+    loop.run_until_complete(engine.dispose())
+    loop.close()
+
+
+def test_modo_en_memoria_como_flask():
+    """Verifica que sin base de datos se sirve el repositorio simulado de la aplicación Flask (con autores)."""
+    from src.asgi import app
+    loop = asyncio.new_event_loop()
+    _, _, body = Client(app, loop).request("GET", "/articles?expand=author")
+    assert [a["author"]["username"] for a in json.loads(body)["data"]] == ["Autor Ejemplo 2", "Autor Ejemplo 1"]
+    loop.close()
@@ -0,0 +1,171 @@
+# alphapp.xyz/contenidos/pruebas/test_authors.py
+
+import asyncio
+import datetime
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import src.views as views
+from src.asgi import ContentApplication
+from src.async_repository import AsyncRepositoryAdapter
+from src.authors import AuthorResolver, HttpUserSource, StaticUserSource, expand_authors, parse_expand
+from src.repository import IndexedContentRepository
+from src.views import app
+
+USERS = {i: {"id": i, "username": f"usuario{i}", "email": f"u{i}@example.com"} for i in range(1, 6)}
+
+
+class CountingSource(StaticUserSource):
+    """Fuente en memoria que registra cada llamada por lotes."""
+
+    def __init__(self, users):
+        super().__init__(users)
+        self.calls = []
+
+    def fetch_many(self, ids):
+        self.calls.append(sorted(ids))
+        return super().fetch_many(ids)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def articles(author_ids):
+    base = datetime.datetime(2024, 1, 1)
+    return [
+        {"id": i, "title": f"T{i}", "content": "c", "author_id": author_id, "publication_date": base + datetime.timedelta(days=i), "tags": []}
+        for i, author_id in enumerate(author_ids, start=1)
+    ]
+
+
+def test_una_llamada_por_pagina_y_cache_con_ttl():
+    """Verifica que los autores de una página se piden juntos y se sirven de la caché hasta expirar."""
+    source, clock = CountingSource(USERS), Clock()
+    resolver = AuthorResolver(source, ttl=60, clock=clock)
+    page = expand_authors(articles([1, 2, 1, 3, 99]), resolver)
+    assert source.calls == [[1, 2, 3, 99]]
+    assert page[0]["author"] == {"id": 1, "username": "usuario1"} # Sin campos privados
+    assert page[4]["author"] is None
+    expand_authors(articles([1, 2, 99]), resolver)
+    assert len(source.calls) == 1 # Aciertos, también el autor inexistente
+    clock.now = 61
+    expand_authors(articles([1, 4]), resolver)
+    assert source.calls[1] == [1, 4]
+
+
+def test_limite_de_entradas_e_invalidacion():
+    """Verifica la expulsión LRU y la invalidación explícita."""
+    source = CountingSource(USERS)
+    resolver = AuthorResolver(source, max_entries=2)
+    resolver.resolve([1, 2])
+    resolver.resolve([1, 3]) # Expulsa al 2
+    assert len(resolver) == 2 and resolver.stats.evictions == 1
+    resolver.resolve([2])
+    resolver.invalidate(1)
+    resolver.resolve([1])
+    assert source.calls == [[1, 2], [3], [2], [1]]
+
+
+def test_fallo_de_la_fuente_no_se_cachea():
+    """Verifica que un error del servicio de usuarios no rompe la página ni se guarda."""
+
+    class FailingSource:
+        calls = 0
+
+        def fetch_many(self, ids):
+            FailingSource.calls += 1
+            raise OSError("servicio caído")
+
+    resolver = AuthorResolver(FailingSource())
+    assert resolver.resolve([1, 2]) == {1: None, 2: None}
+    resolver.resolve([1])
+    assert FailingSource.calls == 2
+
+
+def test_fuente_http_por_lotes():
+    """Verifica el cliente HTTP contra un servicio de usuarios local sustituto."""
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            ids = [int(i) for i in parse_qs(url.query)["ids"][0].split(",")]
+            requests.append((url.path, ids))
+            body = json.dumps({"data": [USERS[i] for i in ids if i in USERS]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        source = HttpUserSource(f"http://127.0.0.1:{server.server_port}/", max_batch=3)
+        users = source.fetch_many([1, 2, 3, 4, 42])
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert requests == [("/users", [1, 2, 3]), ("/users", [4, 42])]
+    assert users == {i: {"id": i, "username": f"usuario{i}"} for i in (1, 2, 3, 4)}
+
+
+def test_parametro_expand():
+    """Verifica la lectura de `expand` y el rechazo de relaciones desconocidas."""
+    assert parse_expand({"expand": "author"}) == {"author"}
+    assert parse_expand({}) == set()
+    with pytest.raises(ValueError):
+        parse_expand({"expand": "author,comments"})
+
+
+def test_endpoints_flask_con_expand(monkeypatch):
+    """Verifica ?expand=author en el listado, el detalle y la exportación NDJSON."""
+    source = CountingSource(USERS)
+    monkeypatch.setattr(views, "content_repository", IndexedContentRepository(articles([1, 2, 1])))
+    monkeypatch.setattr(views, "author_resolver", AuthorResolver(source))
+    with app.test_client() as client:
+        plain = client.get("/articles")
+        response = client.get("/articles?expand=author")
+        assert [a["author"] for a in response.get_json()["data"]] == [
+            {"id": 1, "username": "usuario1"}, {"id": 2, "username": "usuario2"}, {"id": 1, "username": "usuario1"},
+        ]
+        assert response.headers["ETag"] != plain.headers["ETag"]
+        assert client.get("/articles?expand=author", headers={"If-None-Match": response.headers["ETag"]}).status_code == 304
+
+        detail = client.get("/articles/2?expand=author")
+        assert detail.get_json()["author"] == {"id": 2, "username": "usuario2"}
+        assert client.get("/articles/2").get_json()["author"] is None # Sin expandir: el valor del repositorio
+
+        lines = client.get("/articles?stream=1&expand=author").data.splitlines()
+        assert [json.loads(line)["author"]["username"] for line in lines] == ["usuario1", "usuario2", "usuario1"]
+        assert client.get("/articles?expand=comments").status_code == 400
+    assert source.calls == [[1, 2]] # Una sola llamada; el resto, desde la caché
+
+
+def test_endpoints_asgi_con_expand():
+    """Verifica ?expand=author en la aplicación ASGI y el 400 si no hay resolvedor."""
+    from tests.test_asgi import Client
+
+    loop = asyncio.new_event_loop()
+    repository = AsyncRepositoryAdapter(IndexedContentRepository(articles([3, 4])))
+    try:
+        client = Client(ContentApplication(repository, authors=AuthorResolver(StaticUserSource(USERS))), loop)
+        _, _, body = client.request("GET", "/articles?expand=author")
+        assert [a["author"]["username"] for a in json.loads(body)["data"]] == ["usuario4", "usuario3"]
+        _, _, body = client.request("GET", "/articles/1?expand=author")
+        assert json.loads(body)["author"] == {"id": 3, "username": "usuario3"}
+        assert Client(ContentApplication(repository), loop).request("GET", "/articles?expand=author")[0] == 400
+    finally:
+        loop.close()
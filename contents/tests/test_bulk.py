@@ -0,0 +1,154 @@
+# alphapp.xyz/contenidos/pruebas/test_bulk.py
+
+import datetime
+import io
+import json
+
+import pytest
+
+import src.views as views
+from src.bulk import BulkRequestError, iter_lines, parse_ndjson, plan_bulk_operations
+from src.database import build_engine, create_session_factory
+from src.models import Article, Base
+from src.repository import IndexedContentRepository
+from src.sql_repository import SqlAlchemyContentRepository
+from src.views import app
+
+
+OPERATIONS = [
+    {"op": "create", "data": {"title": "Nuevo", "content": "Contenido", "tags": ["a"]}},
+    {"op": "create", "data": {"title": "Sin contenido"}},
+    {"op": "update", "id": 1, "data": {"title": "Actualizado"}},
+    {"op": "update", "id": 999, "data": {"title": "No existe"}},
+    {"op": "update", "id": 1, "data": {"autor": "campo no permitido"}},
+    {"op": "delete", "id": 2},
+    {"op": "delete", "id": "2"},
+    {"op": "publicar", "id": 1},
+]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Cliente de prueba de Flask con un repositorio de dos artículos."""
+    repository = IndexedContentRepository([
+        {"id": i, "title": f"Artículo {i}", "content": "Contenido", "author_id": 1,
+         "publication_date": datetime.datetime(2024, 1, i), "tags": []}
+        for i in (1, 2)
+    ])
+    monkeypatch.setattr(views, "content_repository", repository)
+    with app.test_client() as client:
+        yield client
+
+
+def test_validacion_en_una_pasada():
+    """Verifica que las operaciones no válidas se marcan sin interrumpir el resto."""
+    creates, updates, deletes, results = plan_bulk_operations(OPERATIONS, views.article_serializer)
+    assert [index for index, _ in creates] == [0]
+    assert [index for index, _, _ in updates] == [2, 3]
+    assert [index for index, _ in deletes] == [5]
+    assert [r["index"] for r in results if r is not None] == [1, 4, 6, 7]
+
+
+def test_ndjson_invalido():
+    """Verifica que una línea NDJSON mal formada produce un error de solicitud."""
+    with pytest.raises(BulkRequestError):
+        list(parse_ndjson([b'{"op": "delete", "id": 1}\n', b"{no json\n"]))
+
+
+def test_datos_y_lineas_no_validos(client):
+    """
+    Verifica que un 'data' que no es un objeto y unas etiquetas no válidas se marcan en su
+    operación, y que una línea NDJSON que no es UTF-8 devuelve 400 (no 500).
+    """
+    operations = [
+        {"op": "create", "data": ["no", "es", "objeto"]},
+        {"op": "update", "id": 1, "data": "texto"},
+        {"op": "create", "data": {"title": "T", "content": "C", "tags": "no-es-lista"}},
+        {"op": "update", "id": 1, "data": {"tags": [1, 2]}},
+    ]
+    body = client.post("/articles/bulk", json=operations).get_json()
+    assert [r["status"] for r in body["results"]] == [400] * 4
+    assert [r["message"] for r in body["results"]][:2] == ["El campo 'data' debe ser un objeto"] * 2
+    assert all("etiquetas" in r["message"] for r in body["results"][2:])
+    response = client.post("/articles/bulk", data=b'{"op": "delete", "id": 1}\n\xff\xfe\n',
+                           content_type="application/x-ndjson")
+    assert response.status_code == 400
+
+
+def test_lote_con_titulo_no_textual(client):
+    """
+    Verifica que un título que no es texto se rechaza en su operación (400) y que el resto del
+    lote se aplica y queda indexado para la búsqueda.
+    """
+    operations = [
+        {"op": "create", "data": {"title": "ok", "content": "x"}},
+        {"op": "create", "data": {"title": 123, "content": "x"}},
+        {"op": "update", "id": 1, "data": {"title": "Cambiado"}},
+    ]
+    body = client.post("/articles/bulk", json=operations).get_json()
+    assert [r["status"] for r in body["results"]] == [201, 400, 200]
+    assert body["summary"]["created"] == 1 and body["summary"]["invalid"] == 1
+    assert len(views.content_repository.get_articles_by_date()) == 3
+    data = client.get("/articles?search=ok").get_json()["data"]
+    assert [article["title"] for article in data] == ["ok"]
+    with pytest.raises(AttributeError): # Un dato sin validar no deja el lote a medias
+        views.content_repository.bulk_apply([{"title": "otro", "content": "x"}, {"title": 5, "content": "x"}], [], [])
+    assert len(views.content_repository.get_articles_by_date()) == 3
+
+
+def test_endpoint_bulk_json(client):
+    """Verifica los resultados por operación de POST /articles/bulk con una lista JSON."""
+    response = client.post("/articles/bulk", json=OPERATIONS)
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [r["status"] for r in body["results"]] == [201, 400, 200, 404, 400, 200, 400, 400]
+    assert body["results"][0]["id"] == 3
+    assert body["summary"] == {"created": 1, "updated": 1, "deleted": 1, "not_found": 1, "invalid": 4}
+    assert client.get("/articles/1").get_json()["title"] == "Actualizado"
+    assert client.get("/articles/2").status_code == 404
+
+
+def test_endpoint_bulk_ndjson(client):
+    """Verifica que POST /articles/bulk acepta un flujo NDJSON."""
+    body = "\n".join(json.dumps({"op": "create", "data": {"title": f"T{i}", "content": "c"}}) for i in range(5))
+    response = client.post("/articles/bulk", data=body, content_type="application/x-ndjson")
+    assert response.status_code == 200
+    assert response.get_json()["summary"]["created"] == 5
+    response = client.post("/articles/bulk", data="{roto", content_type="application/x-ndjson")
+    assert response.status_code == 400
+
+
+def test_endpoint_bulk_cuerpo_no_valido(client):
+    """Verifica que un cuerpo que no es una lista devuelve 400."""
+    assert client.post("/articles/bulk", json={"op": "create"}).status_code == 400
+
+
+def test_bulk_en_repositorio_sql():
+    """Verifica que el repositorio SQL aplica el lote en una única transacción."""
+    engine = build_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session_factory = create_session_factory(engine)
+    session = session_factory()
+    session.add(Article(id=1, title="Uno", content="a", author_id=1, publication_date=datetime.datetime(2024, 1, 1)))
+    session.commit()
+    repository = SqlAlchemyContentRepository(session_factory)
+
+    created, updated, deleted = repository.bulk_apply(
+        [{"title": f"T{i}", "content": "c"} for i in range(3)],
+        [(1, {"title": "Uno bis"}), (999, {"title": "X"})],
+        [2, 2, 999],
+    )
+    assert created == [2, 3, 4]
+    assert updated == [True, False]
+    assert deleted == [True, False, False]
+    assert repository.get_article_by_id(1)["title"] == "Uno bis"
+    assert repository.get_article_by_id(2) is None
+    assert len(repository.get_all_articles()) == 3
+    session_factory.remove()
+    engine.dispose()
+
+
+def test_iter_lines_por_bloques():
+    """Verifica que las líneas partidas entre bloques se reconstruyen correctamente."""
+    stream = io.BytesIO(b"uno\ndos\n\ntres")
+    assert list(iter_lines(stream, chunk_size=2)) == [b"uno", b"dos", b"", b"tres"]
@@ -0,0 +1,138 @@
+# alphapp.xyz/contenidos/pruebas/test_cache.py
+
+import datetime
+
+import pytest
+
+import src.views as views
+from src.cache import ArticleResponseCache, InProcessCacheBackend, RedisCacheBackend
+from src.database import build_engine, create_session_factory
+from src.models import Base
+from src.repository import IndexedContentRepository
+from src.sql_repository import SqlAlchemyContentRepository
+from src.views import app
+
+
+class FakeClock:
+    """Reloj controlable para probar el TTL."""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """Sustituto local de un cliente Redis (get/set/delete) compartido entre workers."""
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+def test_lru_con_limite_en_bytes():
+    """Verifica que se expulsan las entradas menos usadas al superar el límite de bytes."""
+    backend = InProcessCacheBackend(max_bytes=10, ttl=None)
+    backend.set("a", b"1234")
+    backend.set("b", b"5678")
+    assert backend.get("a") == b"1234" # "a" pasa a ser la más reciente
+    backend.set("c", b"9012")
+    assert backend.get("b") is None
+    assert backend.size_bytes == 8
+    assert backend.stats.as_dict() == {"hits": 1, "misses": 1, "evictions": 1}
+    backend.set("enorme", b"x" * 11)
+    assert backend.get("enorme") is None
+
+
+def test_ttl_expira_entradas():
+    """Verifica que las entradas caducadas cuentan como fallo y se eliminan."""
+    clock = FakeClock()
+    backend = InProcessCacheBackend(max_bytes=100, ttl=5, clock=clock)
+    backend.set("a", b"valor")
+    clock.now = 4.9
+    assert backend.get("a") == b"valor"
+    clock.now = 5.0
+    assert backend.get("a") is None
+    assert len(backend) == 0
+
+
+def test_cache_de_articulos_por_version_en_backend_compartido():
+    """Verifica que dos workers comparten entradas y que otra versión (otro ETag) es un fallo."""
+    shared = FakeRedis()
+    worker_a = ArticleResponseCache(RedisCacheBackend(shared))
+    worker_b = ArticleResponseCache(RedisCacheBackend(shared))
+    worker_a.set(1, 1, b'{"id":1}')
+    assert worker_b.get(1, 1) == b'{"id":1}'
+    assert worker_b.get(1, 2) is None
+    worker_b.invalidate(1)
+    assert worker_a.get(1, 1) is None
+    assert worker_b.stats() == {"hits": 1, "misses": 1, "evictions": 0}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Cliente de prueba de Flask con repositorio y caché propios."""
+    repository = IndexedContentRepository([
+        {"id": 1, "title": "Uno", "content": "Contenido", "author_id": 1,
+         "publication_date": datetime.datetime(2024, 1, 1), "tags": []}
+    ])
+    cache = ArticleResponseCache(InProcessCacheBackend())
+    monkeypatch.setattr(views, "content_repository", repository)
+    monkeypatch.setattr(views, "article_cache", cache)
+    with app.test_client() as client:
+        yield client, cache
+
+
+def test_detalle_usa_cache_y_escritura_la_actualiza(client):
+    """Verifica aciertos en GET, write-through en PUT e invalidación en DELETE."""
+    client, cache = client
+    assert client.get("/articles/1").get_json()["title"] == "Uno"
+    assert client.get("/articles/1").get_json()["title"] == "Uno"
+    assert cache.stats()["hits"] == 1
+    assert client.put("/articles/1", json={"title": "Uno bis"}).status_code == 200
+    assert cache.get(1, 1) is None
+    assert client.get("/articles/1").get_json()["title"] == "Uno bis"
+    assert cache.stats()["hits"] == 2 # El PUT dejó la nueva versión en la caché
+    client.delete("/articles/1")
+    assert cache.get(1, 2) is None
+    assert client.get("/articles/1").status_code == 404
+
+
+def test_borrado_masivo_invalida_y_no_se_reutiliza_la_entrada(monkeypatch):
+    """
+    Verifica que un artículo creado tras el borrado masivo de otro no recibe el cuerpo
+    cacheado del eliminado (SQLite podía reutilizar su ID con la misma versión).
+    """
+    engine = build_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session_factory = create_session_factory(engine)
+    cache = ArticleResponseCache(InProcessCacheBackend())
+    monkeypatch.setattr(views, "content_repository", SqlAlchemyContentRepository(session_factory))
+    monkeypatch.setattr(views, "article_cache", cache)
+    with app.test_client() as client:
+        first = client.post("/articles", json={"title": "Secreto", "content": "C"}).get_json()["id"]
+        assert client.get(f"/articles/{first}").get_json()["title"] == "Secreto"
+        client.post("/articles/bulk", json=[{"op": "delete", "id": first}])
+        assert len(cache.backend) == 0
+        response = client.post("/articles", json={"title": "Nuevo", "content": "C"})
+        assert response.get_json()["title"] == "Nuevo"
+        assert client.get(f"/articles/{response.get_json()['id']}").get_json()["title"] == "Nuevo"
+    session_factory.remove()
+    engine.dispose()
+
+
+def test_entrada_de_otro_etag_no_se_sirve():
+    """Verifica que una entrada guardada con otro ETag (otra versión o artículo) es un fallo."""
+    cache = ArticleResponseCache(InProcessCacheBackend())
+    cache.set(1, "1-1-a", b'{"title":"Secreto"}')
+    assert cache.get(1, "1-1-b") is None
+    cache.set(1, "1-1-b", b'{"title":"Nuevo"}')
+    assert cache.get(1, "1-1-b") == b'{"title":"Nuevo"}'
+    assert len(cache.backend) == 1
@@ -0,0 +1,136 @@
+# alphapp.xyz/contenidos/pruebas/test_concurrency.py
+
+import datetime
+import random
+import sys
+import threading
+import time
+
+import pytest
+
+from src.repository import IndexedContentRepository, SnapshotSortedIndex, VersionConflictError
+
+THREADS = 32
+OPERATIONS_PER_THREAD = 1_000
+MIN_OPERATIONS_PER_SECOND = 5_000 # Umbral conservador para detectar contención patológica
+
+
+@pytest.fixture
+def short_switch_interval():
+    """Reduce el intervalo de cambio de hilo para forzar entrelazados frecuentes."""
+    previous = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(previous)
+
+
+def hammer(repository, seed, created, errors, barrier):
+    """Mezcla de creaciones, actualizaciones, borrados y lecturas desde un hilo."""
+    rng = random.Random(seed)
+    own = []
+    try:
+        barrier.wait()
+        for _ in range(OPERATIONS_PER_THREAD):
+            choice = rng.random()
+            if choice < 0.4 or not own:
+                article = repository.create_article({
+                    "title": f"Hilo {seed}", "content": "contenido",
+                    "author_id": rng.randrange(8), "tags": [f"t{rng.randrange(4)}"],
+                })
+                own.append(article["id"])
+                created.append(article["id"])
+            elif choice < 0.7:
+                # Actualizaciones sobre artículos de cualquier hilo para provocar conflictos
+                target = rng.choice(created)
+                current = repository.get_article_by_id(target)
+                if current is not None:
+                    try:
+                        repository.update_article(target, {"tags": [f"t{rng.randrange(4)}"]}, expected_version=current["version"])
+                    except VersionConflictError:
+                        pass
+            elif choice < 0.85:
+                repository.delete_article(own.pop(rng.randrange(len(own))))
+            else:
+                page, _ = repository.list_articles(limit=20, tags=[f"t{rng.randrange(4)}"])
+                assert all(article["id"] is not None for article in page)
+    except Exception as exc: # pragma: no cover - se informa en el hilo principal
+        errors.append(exc)
+
+
+def run_threads(repository, created):
+    """Ejecuta `hammer` en THREADS hilos y devuelve los segundos que tardan todos."""
+    errors = []
+    barrier = threading.Barrier(THREADS)
+    threads = [threading.Thread(target=hammer, args=(repository, seed, created, errors, barrier)) for seed in range(THREADS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    return time.perf_counter() - start
+
+
+def test_escrituras_concurrentes_mantienen_invariantes(short_switch_interval):
+    """Verifica IDs únicos e índices coherentes con 32 hilos."""
+    repository = IndexedContentRepository()
+    created = []
+    run_threads(repository, created)
+
+    assert len(created) == len(set(created)) # Ningún ID duplicado
+
+    articles = {article["id"]: article for article in repository.get_all_articles()}
+    assert [key[1] for key in repository._by_date] == sorted(articles, key=lambda i: (articles[i]["publication_date"], i))
+    assert len(repository._by_date) == len(articles)
+    for author_id in range(8):
+        expected = sorted(i for i, a in articles.items() if a["author_id"] == author_id)
+        assert [a["id"] for a in repository.get_articles_by_author(author_id)] == expected
+    for tag in (f"t{i}" for i in range(4)):
+        expected = sorted(i for i, a in articles.items() if tag in a["tags"])
+        assert [a["id"] for a in repository.get_articles_by_tag(tag)] == expected
+
+
+@pytest.mark.performance
+def test_rendimiento_con_escrituras_concurrentes(short_switch_interval):
+    """Verifica un rendimiento mínimo con 32 hilos (depende de la máquina: prueba de rendimiento)."""
+    elapsed = run_threads(IndexedContentRepository(), [])
+    throughput = THREADS * OPERATIONS_PER_THREAD / elapsed
+    assert throughput > MIN_OPERATIONS_PER_SECOND, f"{throughput:.0f} op/s"
+
+
+def test_lectores_ven_instantanea_consistente():
+    """Verifica que una lectura en curso no ve las escrituras posteriores del índice de fechas."""
+    index = SnapshotSortedIndex([(1, 1), (2, 2), (3, 3)], block_size=2)
+    iterator = index.iter_before()
+    assert next(iterator) == (3, 3)
+    index.remove((2, 2))
+    index.insert((4, 4))
+    assert list(iterator) == [(2, 2), (1, 1)]
+    assert list(index.iter_before()) == [(4, 4), (3, 3), (1, 1)]
+
+
+def test_indice_ordenado_por_bloques():
+    """Verifica inserción, borrado y rangos del índice con muchos bloques."""
+    keys = list(range(0, 2_000, 2))
+    index = SnapshotSortedIndex(keys, block_size=8)
+    for key in range(1, 2_000, 2):
+        index.insert(key)
+    assert list(index) == list(range(2_000))
+    assert index.remove(500) is True
+    assert index.remove(500) is False
+    assert index.remove(5_000) is False
+    assert len(index) == 1_999
+    assert list(index.iter_range(498, 503)) == [498, 499, 501, 502]
+    assert list(index.iter_before(503))[:4] == [502, 501, 499, 498]
+    assert list(SnapshotSortedIndex().iter_before()) == []
+
+
+def test_versiones_publicadas_no_cambian():
+    """Verifica que una actualización publica un artículo nuevo sin modificar el que ya leyó otro hilo."""
+    base = datetime.datetime(2024, 1, 1)
+    repository = IndexedContentRepository([{"id": 1, "title": "Uno", "content": "a", "author_id": 1, "publication_date": base, "tags": []}])
+    before = repository.get_article_by_id(1)
+    after = repository.update_article(1, {"title": "Uno bis"})
+    assert before["title"] == "Uno" and before["version"] == 1
+    assert after["title"] == "Uno bis" and after["version"] == 2
+    assert repository.get_article_by_id(1) is after
@@ -0,0 +1,105 @@
+# alphapp.xyz/contenidos/pruebas/test_conditional.py
+
+import datetime
+
+import pytest
+
+import src.views as views
+from src.conditional import article_etag, collection_etag
+from src.database import build_engine, create_session_factory
+from src.models import Article, Base
+from src.repository import IndexedContentRepository, VersionConflictError
+from src.sql_repository import SqlAlchemyContentRepository
+from src.views import app
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Cliente de prueba de Flask con un repositorio de dos artículos y sin caché."""
+    repository = IndexedContentRepository([
+        {"id": i, "title": f"Artículo {i}", "content": "Contenido", "author_id": 1,
+         "publication_date": datetime.datetime(2024, 1, i, 10, 0, 0, 500), "tags": []}
+        for i in (1, 2)
+    ])
+    monkeypatch.setattr(views, "content_repository", repository)
+    monkeypatch.setattr(views, "article_cache", None)
+    with app.test_client() as client:
+        yield client
+
+
+# ETag de la versión 1 del artículo 1 del fixture (ID, versión y fecha de modificación)
+ETAG_1 = '"1-1-20240101100000000500"'
+
+
+def test_etag_y_last_modified_en_detalle(client):
+    """Verifica las cabeceras ETag y Last-Modified del detalle."""
+    response = client.get("/articles/1")
+    assert response.headers["ETag"] == ETAG_1
+    assert response.headers["Last-Modified"] == "Mon, 01 Jan 2024 10:00:00 GMT"
+
+
+def test_get_condicional_devuelve_304(client):
+    """Verifica If-None-Match e If-Modified-Since en el detalle."""
+    response = client.get("/articles/1", headers={"If-None-Match": ETAG_1})
+    assert response.status_code == 304
+    assert response.data == b""
+    response = client.get("/articles/1", headers={"If-Modified-Since": "Mon, 01 Jan 2024 10:00:00 GMT"})
+    assert response.status_code == 304
+    response = client.get("/articles/1", headers={"If-Modified-Since": "Mon, 01 Jan 2024 09:59:59 GMT"})
+    assert response.status_code == 200
+    # If-None-Match tiene prioridad sobre If-Modified-Since
+    response = client.get("/articles/1", headers={"If-None-Match": '"1-0"', "If-Modified-Since": "Tue, 02 Jan 2024 00:00:00 GMT"})
+    assert response.status_code == 200
+
+
+def test_etag_de_coleccion_cambia_con_las_escrituras(client):
+    """Verifica el ETag de la página del listado y su invalidación al actualizar."""
+    etag = client.get("/articles").headers["ETag"]
+    assert client.get("/articles", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/articles?limit=1", headers={"If-None-Match": etag}).status_code == 200
+    client.put("/articles/2", json={"title": "Cambiado"})
+    assert client.get("/articles", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_if_match_en_put_y_delete(client):
+    """Verifica la concurrencia optimista con If-Match."""
+    response = client.put("/articles/1", json={"title": "Nuevo"}, headers={"If-Match": ETAG_1})
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert etag.startswith('"1-2-')
+    response = client.put("/articles/1", json={"title": "Otro"}, headers={"If-Match": ETAG_1})
+    assert response.status_code == 412
+    assert response.headers["ETag"] == etag
+    assert client.delete("/articles/1", headers={"If-Match": ETAG_1}).status_code == 412
+    assert client.delete("/articles/1", headers={"If-Match": "*"}).status_code == 200
+
+
+def test_version_esperada_en_repositorio_sql():
+    """Verifica que el repositorio SQL comprueba la versión en el propio UPDATE/DELETE."""
+    engine = build_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session_factory = create_session_factory(engine)
+    session = session_factory()
+    session.add(Article(id=1, title="Uno", content="a", author_id=1, publication_date=datetime.datetime(2024, 1, 1)))
+    session.commit()
+    repository = SqlAlchemyContentRepository(session_factory)
+
+    updated = repository.update_article(1, {"title": "Uno bis"}, expected_version=1)
+    assert updated["version"] == 2
+    assert updated["updated_at"] is not None
+    with pytest.raises(VersionConflictError):
+        repository.update_article(1, {"title": "X"}, expected_version=1)
+    with pytest.raises(VersionConflictError):
+        repository.delete_article(1, expected_version=1)
+    assert repository.update_article(999, {"title": "X"}, expected_version=1) is None
+    assert repository.delete_article(1, expected_version=2) is True
+    session_factory.remove()
+    engine.dispose()
+
+
+def test_etag_distingue_articulo_que_reutiliza_el_id():
+    """Verifica que un artículo nuevo con el ID y la versión de uno eliminado tiene otro ETag."""
+    deleted = {"id": 1, "version": 1, "updated_at": datetime.datetime(2024, 1, 1, 10, 0, 0, 1)}
+    created = {"id": 1, "version": 1, "updated_at": datetime.datetime(2024, 1, 1, 10, 0, 0, 2)}
+    assert article_etag(deleted) != article_etag(created)
+    assert collection_etag([deleted], {}) != collection_etag([created], {})
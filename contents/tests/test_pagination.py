@@ -0,0 +1,86 @@
+# alphapp.xyz/contenidos/pruebas/test_pagination.py
+
+import datetime
+
+import pytest
+
+from src.pagination import MAX_LIMIT, DEFAULT_LIMIT, clamp_limit, decode_cursor, encode_cursor
+from src.views import app, parse_list_params
+from src.repository import IndexedContentRepository
+import src.views as views
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Cliente de prueba de Flask con un repositorio de 25 artículos."""
+    base = datetime.datetime(2024, 1, 1)
+    repository = IndexedContentRepository([
+        {"id": i, "title": f"Artículo {i}", "content": "Contenido", "author_id": 100 + i % 2,
+         "author": "Autor", "publication_date": base + datetime.timedelta(hours=i),
+         "tags": ["par"] if i % 2 == 0 else ["impar"]}
+        for i in range(1, 26)
+    ])
+    monkeypatch.setattr(views, "content_repository", repository)
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        yield client
+
+
+def test_cursor_ida_y_vuelta():
+    """Verifica que un cursor codificado se decodifica a la misma clave."""
+    key = (datetime.datetime(2024, 5, 1, 12, 30), 42)
+    assert decode_cursor(encode_cursor(*key)) == key
+
+
+def test_cursor_invalido():
+    """Verifica que un cursor manipulado produce ValueError."""
+    with pytest.raises(ValueError):
+        decode_cursor("no-es-un-cursor")
+
+
+def test_limite_acotado():
+    """Verifica los valores por defecto y el máximo de `limit`."""
+    assert clamp_limit(None) == DEFAULT_LIMIT
+    assert clamp_limit("1000") == MAX_LIMIT
+    assert clamp_limit("0") == 1
+    with pytest.raises(ValueError):
+        parse_list_params({"limit": "diez"})
+
+
+def test_listado_recorre_todas_las_paginas(client):
+    """Verifica que siguiendo next_cursor se obtienen todos los artículos una sola vez."""
+    seen = []
+    url = "/articles?limit=10"
+    while True:
+        response = client.get(url)
+        assert response.status_code == 200
+        body = response.get_json()
+        seen.extend(article["id"] for article in body["data"])
+        if not body["pagination"]["has_more"]:
+            assert body["pagination"]["next_cursor"] is None
+            break
+        url = f"/articles?limit=10&cursor={body['pagination']['next_cursor']}"
+    assert seen == list(range(25, 0, -1))
+
+
+def test_listado_filtrado_por_etiqueta_y_autor(client):
+    """Verifica los filtros `tags` y `author_id` en GET /articles."""
+    body = client.get("/articles?tags=par&limit=3").get_json()
+    assert [a["id"] for a in body["data"]] == [24, 22, 20]
+    body = client.get("/articles?author_id=101&limit=100").get_json()
+    assert all(a["id"] % 2 == 1 for a in body["data"])
+    assert len(body["data"]) == 13
+
+
+def test_listado_con_parametros_invalidos(client):
+    """Verifica que los parámetros no válidos devuelven 400."""
+    assert client.get("/articles?cursor=xyz").status_code == 400
+    assert client.get("/articles?author_id=abc").status_code == 400
+
+
+def test_cursor_con_zona_horaria(client):
+    """Verifica que un cursor con una fecha con zona horaria se rechaza con 400 y no con 500."""
+    aware = encode_cursor(datetime.datetime(2024, 5, 1, tzinfo=datetime.timezone.utc), 3)
+    with pytest.raises(ValueError):
+        decode_cursor(aware)
+    assert client.get(f"/articles?cursor={aware}").status_code == 400
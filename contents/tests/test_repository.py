@@ -0,0 +1,119 @@
+# alphapp.xyz/contenidos/pruebas/test_repository.py
+
+import datetime
+
+import pytest
+
+from src.repository import IndexedContentRepository
+
+
+@pytest.fixture
+def repository():
+    """Proporciona un repositorio con tres artículos de ejemplo."""
+    base = datetime.datetime(2024, 1, 1)
+    return IndexedContentRepository([
+        {"id": 1, "title": "Uno", "content": "a", "author_id": 101, "publication_date": base, "tags": ["python", "ejemplo"]},
+        {"id": 2, "title": "Dos", "content": "b", "author_id": 102, "publication_date": base + datetime.timedelta(days=1), "tags": ["ejemplo"]},
+        {"id": 3, "title": "Tres", "content": "c", "author_id": 101, "publication_date": base + datetime.timedelta(days=2), "tags": []},
+    ])
+
+
+def test_obtener_articulo_por_id(repository):
+    """Verifica la búsqueda por el índice primario."""
+    assert repository.get_article_by_id(2)["title"] == "Dos"
+    assert repository.get_article_by_id(999) is None
+
+
+def test_crear_articulo_asigna_id_siguiente(repository):
+    """Verifica que los IDs continúan a partir de los artículos iniciales."""
+    article = repository.create_article({"title": "Cuatro", "content": "d", "author_id": 103, "tags": ["nuevo"]})
+    assert article["id"] == 4
+    assert repository.get_article_by_id(4) is article
+    assert repository.get_articles_by_tag("nuevo") == [article]
+    assert repository.get_articles_by_date()[-1] is article
+
+
+def test_indices_secundarios(repository):
+    """Verifica las búsquedas por autor, etiqueta y rango de fechas."""
+    assert [a["id"] for a in repository.get_articles_by_author(101)] == [1, 3]
+    assert [a["id"] for a in repository.get_articles_by_tag("ejemplo")] == [1, 2]
+    start = datetime.datetime(2024, 1, 2)
+    assert [a["id"] for a in repository.get_articles_by_date(start=start)] == [2, 3]
+    assert [a["id"] for a in repository.get_articles_by_date(end=start)] == [1]
+
+
+def test_actualizar_etiquetas_reindexa(repository):
+    """Verifica que cambiar las etiquetas actualiza el índice de etiquetas."""
+    repository.update_article(1, {"tags": ["rust"]})
+    assert [a["id"] for a in repository.get_articles_by_tag("ejemplo")] == [2]
+    assert [a["id"] for a in repository.get_articles_by_tag("rust")] == [1]
+    assert repository.get_articles_by_tag("python") == []
+    assert repository.update_article(999, {"title": "X"}) is None
+
+
+def test_contadores_de_etiquetas(repository):
+    """Verifica la nube de etiquetas ordenada por número de artículos."""
+    assert repository.tag_counts() == [{"name": "ejemplo", "article_count": 2}, {"name": "python", "article_count": 1}]
+    repository.update_article(2, {"tags": ["python"]})
+    assert repository.tag_counts(limit=1) == [{"name": "python", "article_count": 2}]
+
+
+def test_eliminar_articulo_limpia_indices(repository):
+    """Verifica que la eliminación retira el artículo de todos los índices."""
+    assert repository.delete_article(1) is True
+    assert repository.delete_article(1) is False
+    assert repository.get_article_by_id(1) is None
+    assert [a["id"] for a in repository.get_articles_by_author(101)] == [3]
+    assert [a["id"] for a in repository.get_articles_by_tag("ejemplo")] == [2]
+    assert [a["id"] for a in repository.get_articles_by_date()] == [2, 3]
+    assert [a["id"] for a in repository.get_all_articles()] == [2, 3]
+
+
+def test_listar_articulos_paginado_por_cursor(repository):
+    """Verifica que el listado recorre las páginas en orden descendente sin repetir artículos."""
+    page, has_more = repository.list_articles(limit=2)
+    assert [a["id"] for a in page] == [3, 2]
+    assert has_more is True
+    last = page[-1]
+    page, has_more = repository.list_articles(limit=2, cursor=(last["publication_date"], last["id"]))
+    assert [a["id"] for a in page] == [1]
+    assert has_more is False
+
+
+def test_listar_articulos_con_filtros(repository):
+    """Verifica los filtros por etiqueta, autor y búsqueda del listado."""
+    page, _ = repository.list_articles(limit=10, tags=["ejemplo"])
+    assert [a["id"] for a in page] == [2, 1]
+    page, _ = repository.list_articles(limit=10, tags=["ejemplo", "python"], author_id=101)
+    assert [a["id"] for a in page] == [1]
+    page, _ = repository.list_articles(limit=10, author_id=999)
+    assert page == []
+    page, _ = repository.list_articles(limit=10, search="TRES")
+    assert [a["id"] for a in page] == [3]
+
+
+def test_listar_articulos_filtro_selectivo_con_cursor():
+    """Verifica la paginación cuando el filtro es lo bastante selectivo para ordenar solo los candidatos."""
+    base = datetime.datetime(2024, 1, 1)
+    repository = IndexedContentRepository([
+        {"id": i, "title": str(i), "content": "", "author_id": 1, "publication_date": base + datetime.timedelta(days=i),
+         "tags": ["rara"] if i % 20 == 0 else []}
+        for i in range(1, 101)
+    ])
+    page, has_more = repository.list_articles(limit=3, tags=["rara"])
+    assert [a["id"] for a in page] == [100, 80, 60]
+    assert has_more is True
+    last = page[-1]
+    page, has_more = repository.list_articles(limit=3, tags=["rara"], cursor=(last["publication_date"], last["id"]))
+    assert [a["id"] for a in page] == [40, 20]
+    assert has_more is False
+
+
+def test_fallo_al_indexar_no_deja_escrituras_a_medias(repository):
+    """Verifica que si no se puede calcular la entrada del índice de búsqueda no se guarda nada."""
+    with pytest.raises(AttributeError):
+        repository.create_article({"title": 123, "content": "x", "author_id": 101, "tags": []})
+    assert len(repository.get_articles_by_date()) == 3
+    with pytest.raises(AttributeError):
+        repository.update_article(1, {"title": ["a"]})
+    assert repository.get_article_by_id(1)["title"] == "Uno"
@@ -0,0 +1,214 @@
+# alphapp.xyz/contenidos/pruebas/test_search.py
+
+import datetime
+
+import pytest
+
+import src.views as views
+from src.database import build_engine, create_session_factory
+from src.models import Base
+from src.pagination import cursor_for, decode_cursor
+from src.repository import IndexedContentRepository
+from src.search import SearchIndex, search_index_from_config, tokenize
+from src.sql_repository import SqlAlchemyContentRepository
+from src.views import app
+
+ARTICLES = [
+    {"id": 1, "title": "Canción de cuna", "content": "Una canción para dormir a los niños.", "tags": ["música"]},
+    {"id": 2, "title": "Recetas de verano", "content": "Piña colada y una canción de fondo.", "tags": ["cocina"]},
+    {"id": 3, "title": "Programación en Python", "content": "Python para análisis de datos.", "tags": ["tecnología"]},
+    {"id": 4, "title": "Más Python", "content": "Python, python y más python.", "tags": ["tecnología"]},
+]
+
+
+@pytest.fixture
+def index():
+    """Índice en memoria con segmentos pequeños para ejercitar el sellado y la fusión."""
+    index = SearchIndex(segment_size=2, max_segments=2)
+    for article in ARTICLES:
+        index.add(article)
+    return index
+
+
+def test_tokenizacion_pliega_acentos_y_omite_palabras_vacias():
+    """Verifica el plegado de acentos y mayúsculas y la eliminación de palabras vacías."""
+    assert tokenize("La CANCIÓN del Niño y la piña") == ["cancion", "nino", "pina"]
+
+
+def test_busqueda_sin_acentos_y_ranking_bm25(index):
+    """Verifica que la consulta sin acentos encuentra el texto acentuado y el orden por relevancia."""
+    assert [article_id for _, article_id in index.ranked("cancion")] == [1, 2]
+    assert [article_id for _, article_id in index.ranked("PYTHON")] == [4, 3]
+    assert [article_id for _, article_id in index.ranked("python datos")] == [3] # Todos los términos
+    assert index.ranked("inexistente") == []
+    assert index.ranked("de la") == []
+
+
+def test_mantenimiento_incremental(index):
+    """Verifica que actualizar y eliminar artículos se refleja en las búsquedas."""
+    index.add({"id": 4, "title": "Java", "content": "Sin serpientes", "tags": []})
+    assert [article_id for _, article_id in index.ranked("python")] == [3]
+    assert index.remove(1) is True
+    assert index.remove(1) is False
+    assert [article_id for _, article_id in index.ranked("cancion")] == [2]
+    assert len(index) == 3
+
+
+def test_paginacion_por_puntuacion(index):
+    """Verifica que `after` continúa el ranking justo después del último resultado."""
+    first = index.top("python", 1)
+    assert [article_id for _, article_id in first] == [4]
+    assert [article_id for _, article_id in index.top("python", 1, after=first[-1])] == [3]
+
+
+def test_persistencia_en_disco(tmp_path):
+    """Verifica que el índice se recupera tras reiniciar, con y sin cierre ordenado."""
+    index = SearchIndex(str(tmp_path), segment_size=2, max_segments=2)
+    for article in ARTICLES:
+        index.add(article)
+    index.remove(2)
+    index.add({"id": 5, "title": "Nueva canción", "content": "", "tags": []})
+    expected = index.ranked("cancion")
+    assert [article_id for _, article_id in expected] == [5, 1]
+
+    # Sin cierre: los cambios pendientes se recuperan del registro
+    reopened = SearchIndex(str(tmp_path), segment_size=2, max_segments=2)
+    assert reopened.ranked("cancion") == expected
+    assert len(reopened) == 4
+
+    # Tras el cierre los segmentos se fusionan; las frecuencias ya no cuentan los borrados
+    index.close()
+    reopened = SearchIndex(str(tmp_path))
+    assert [article_id for _, article_id in reopened.ranked("cancion")] == [5, 1]
+    assert [article_id for _, article_id in reopened.ranked("python")] == [4, 3]
+
+
+def test_repositorio_en_memoria_busca_con_indice():
+    """Verifica la búsqueda del repositorio, combinada con filtros y paginada por cursor."""
+    base = datetime.datetime(2024, 1, 1)
+    repository = IndexedContentRepository([
+        {**article, "author_id": 100 + article["id"] % 2, "publication_date": base + datetime.timedelta(days=article["id"])}
+        for article in ARTICLES
+    ])
+    page, has_more = repository.list_articles(limit=1, search="python")
+    assert [a["id"] for a in page] == [4] and has_more is True
+    cursor = decode_cursor(cursor_for(page[-1]))
+    page, has_more = repository.list_articles(limit=1, search="python", cursor=cursor)
+    assert [a["id"] for a in page] == [3] and has_more is False
+    page, _ = repository.list_articles(limit=10, search="python", author_id=101)
+    assert [a["id"] for a in page] == [3]
+    repository.update_article(3, {"title": "Datos"})
+    repository.delete_article(4)
+    page, _ = repository.list_articles(limit=10, search="programacion")
+    assert page == []
+    with pytest.raises(ValueError):
+        repository.list_articles(limit=10, search="python", cursor=(base, 1))
+
+
+def test_repositorio_sql_con_indice(tmp_path):
+    """Verifica que el repositorio SQL mantiene el índice y resuelve la búsqueda con él."""
+    engine = build_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    repository = SqlAlchemyContentRepository(create_session_factory(engine), search_index=SearchIndex(str(tmp_path)))
+    for article in ARTICLES:
+        repository.create_article(article)
+    repository.update_article(1, {"title": "Nana"})
+    repository.bulk_apply([{"title": "Python rápido", "content": "python"}], [(2, {"content": "Sin música"})], [3])
+    page, _ = repository.list_articles(limit=10, search="python")
+    assert [a["id"] for a in page] == [4, 5]
+    page, _ = repository.list_articles(limit=10, search="cancion")
+    assert [a["id"] for a in page] == [1]
+    engine.dispose()
+
+
+def test_indices_por_worker_se_ponen_al_dia(tmp_path):
+    """
+    Verifica que cada worker tiene su propio índice en memoria (sin archivos compartidos), que
+    se construye con la base de datos al arrancar e incorpora las escrituras de los demás workers.
+    """
+    engine = build_engine(f"sqlite:///{tmp_path / 'contents.db'}")
+    Base.metadata.create_all(engine)
+    first = SqlAlchemyContentRepository(create_session_factory(engine), search_index=SearchIndex())
+    first.create_article(ARTICLES[0])
+    second = SqlAlchemyContentRepository(create_session_factory(engine), search_index=SearchIndex(), search_refresh_interval=0)
+    second.load_search_index()
+    assert [a["id"] for a in second.list_articles(limit=10, search="cancion")[0]] == [1]
+    first.create_article(ARTICLES[2])
+    first.update_article(1, {"title": "Nana"})
+    assert [a["id"] for a in second.list_articles(limit=10, search="python")[0]] == [2]
+    assert [a["id"] for a in second.list_articles(limit=10, search="nana")[0]] == [1]
+    first.delete_article(2)
+    assert second.list_articles(limit=10, search="python")[0] == []
+    assert list(tmp_path.iterdir()) == [tmp_path / "contents.db"]
+    engine.dispose()
+
+
+def test_indice_desde_configuracion(tmp_path):
+    """Verifica que [search] enabled crea un índice en memoria (sin ruta en disco) y que sin él no hay índice."""
+    config = tmp_path / "config.ini"
+    config.write_text("[search]\nenabled = true\nsegment_size = 10\n")
+    index = search_index_from_config(str(config))
+    assert index.path is None and index.segment_size == 10
+    config.write_text("[search]\nsegment_size = 10\n")
+    assert search_index_from_config(str(config)) is None
+
+
+def test_endpoint_busqueda_paginada(monkeypatch):
+    """Verifica GET /articles?search= ordenado por relevancia y su cursor."""
+    base = datetime.datetime(2024, 1, 1)
+    repository = IndexedContentRepository([
+        {**article, "author_id": 1, "publication_date": base + datetime.timedelta(days=article["id"])} for article in ARTICLES
+    ])
+    monkeypatch.setattr(views, "content_repository", repository)
+    with app.test_client() as client:
+        data = client.get("/articles?search=python&limit=1").get_json()
+        assert [a["id"] for a in data["data"]] == [4]
+        assert "score" not in data["data"][0]
+        cursor = data["pagination"]["next_cursor"]
+        data = client.get(f"/articles?search=python&limit=1&cursor={cursor}").get_json()
+        assert [a["id"] for a in data["data"]] == [3]
+        assert client.get(f"/articles?limit=1&cursor={cursor}").status_code == 400
+
+
+def test_puntuacion_vectorizada_coincide_con_python(monkeypatch):
+    """Verifica que numpy y el recorrido en Python dan las mismas claves, también paginando."""
+    import random
+
+    import src.search as search
+
+    rng = random.Random(3)
+    words = ["python", "datos", "canción", "música", "cocina", "verano"]
+    index = SearchIndex(segment_size=50)
+    for article_id in range(1, 301):
+        index.add({"id": article_id, "title": rng.choice(words), "content": " ".join(rng.choices(words, k=8)), "tags": []})
+    for article_id in range(1, 301, 7):
+        index.remove(article_id)
+    queries = ["python", "datos cancion", "musica cocina verano"]
+    vectorized = [(index.ranked(q), index.top(q, 5), index.top(q, 5, after=index.ranked(q)[9]), index.ranked(q, candidates={2, 3, 50, 299})) for q in queries]
+    monkeypatch.setattr(search, "numpy", None)
+    assert vectorized == [(index.ranked(q), index.top(q, 5), index.top(q, 5, after=index.ranked(q)[9]), index.ranked(q, candidates={2, 3, 50, 299})) for q in queries]
+
+
+def test_busqueda_sql_por_bloques_acotados(monkeypatch):
+    """
+    Verifica que la búsqueda del repositorio SQL pide al índice solo los primeros resultados
+    (top, sin ordenar todas las coincidencias) y pide más cuando el filtro de etiquetas los descarta.
+    """
+    engine = build_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    index = SearchIndex()
+    repository = SqlAlchemyContentRepository(create_session_factory(engine), search_index=index)
+    for i in range(40):
+        repository.create_article({"title": f"Python {i}", "content": "python " * (i % 7 + 1),
+                                   "tags": ["raro"] if i % 10 == 0 else ["comun"]})
+    expected = [article_id for _, article_id in index.ranked("python") if (article_id - 1) % 10 == 0]
+    sizes = []
+    top = index.top
+    monkeypatch.setattr(index, "top", lambda query, limit, **kwargs: sizes.append(limit) or top(query, limit, **kwargs))
+    monkeypatch.setattr(index, "ranked", None)
+    page, has_more = repository.list_articles(limit=2, search="python", tags=["raro"])
+    assert [a["id"] for a in page] == expected[:2] and has_more
+    assert sizes[0] == 3 and max(sizes) < 40
+    page, has_more = repository.list_articles(limit=2, search="python", tags=["raro"], cursor=decode_cursor(cursor_for(page[-1])))
+    assert [a["id"] for a in page] == expected[2:4] and not has_more
+    engine.dispose()
@@ -0,0 +1,55 @@
+# alphapp.xyz/contenidos/pruebas/test_serializers.py
+
+import datetime
+import json
+
+import pytest
+
+import src.serializers as serializers
+from src.serializers import DATETIME, LIST, VALUE, ArticleSerializer, ConceptualArticleModel, SchemaSerializer
+from src.views import ConceptualArticleSerializer
+
+
+@pytest.fixture
+def article():
+    """Artículo de ejemplo como diccionario (formato del repositorio)."""
+    return {"id": 1, "title": "Título ñ", "content": "Contenido", "author_id": 101, "author": "Autor",
+            "publication_date": datetime.datetime(2024, 5, 1, 12, 30, 15, 250), "tags": ["a", "b"]}
+
+
+def test_esquema_compilado_equivale_al_serializador_original(article):
+    """Verifica que la salida compilada coincide con la serialización campo a campo."""
+    expected = {"id": 1, "title": "Título ñ", "content": "Contenido", "author": "Autor",
+                "publication_date": "2024-05-01T12:30:15.000250", "tags": ["a", "b"]}
+    assert ConceptualArticleSerializer().serialize(article) == expected
+
+
+def test_campos_ausentes_usan_valores_por_defecto():
+    """Verifica None para fechas ausentes y lista vacía para tags ausentes."""
+    result = ConceptualArticleSerializer().serialize({"id": 2, "title": "T", "content": "C"})
+    assert result["publication_date"] is None
+    assert result["tags"] == []
+    assert result["author"] is None
+
+
+def test_serializador_de_modelo_por_atributos():
+    """Verifica el serializador de ArticleSerializer sobre objetos del modelo."""
+    model = ConceptualArticleModel(1, "T", "C", 7, datetime.datetime(2024, 1, 1), tags=None)
+    result = ArticleSerializer().serialize(model)
+    assert result == {"id": 1, "title": "T", "content": "C", "author_id": 7,
+                      "publication_date": "2024-01-01T00:00:00", "tags": []}
+    assert json.loads(ArticleSerializer().dumps_many([model, model])) == [result, result]
+
+
+@pytest.mark.parametrize("backend", ["orjson", "json"])
+def test_dumps_many_con_ambos_backends(monkeypatch, article, backend):
+    """Verifica que la codificación a bytes es equivalente con orjson y con json estándar."""
+    if backend == "json":
+        monkeypatch.setattr(serializers, "orjson", None)
+    elif serializers.orjson is None:
+        pytest.skip("orjson no está instalado")
+    schema = SchemaSerializer([("id", "id", VALUE), ("date", "publication_date", DATETIME), ("tags", "tags", LIST)],
+                              from_mapping=True)
+    payload = schema.dumps_many([article])
+    assert isinstance(payload, bytes)
+    assert json.loads(payload) == [{"id": 1, "date": "2024-05-01T12:30:15.000250", "tags": ["a", "b"]}]
@@ -0,0 +1,122 @@
+# alphapp.xyz/contenidos/pruebas/test_sql_repository.py
+
+import datetime
+
+import pytest
+
+from src.database import build_engine, create_session_factory, load_database_config
+from src.models import Article, Base
+from src.sql_repository import SqlAlchemyContentRepository
+
+
+@pytest.fixture
+def repository():
+    """Repositorio sobre SQLite en memoria con tres artículos de ejemplo."""
+    engine = build_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session_factory = create_session_factory(engine)
+    base = datetime.datetime(2024, 1, 1)
+    session = session_factory()
+    session.add_all([
+        Article(id=1, title="Uno", content="Hola mundo", author_id=101, publication_date=base),
+        Article(id=2, title="Dos", content="100% python", author_id=102, publication_date=base + datetime.timedelta(days=1)),
+        Article(id=3, title="Tres", content="Adiós", author_id=101, publication_date=base + datetime.timedelta(days=2)),
+    ])
+    session.commit()
+    yield SqlAlchemyContentRepository(session_factory)
+    session_factory.remove()
+    engine.dispose()
+
+
+def test_obtener_articulo_por_id(repository):
+    """Verifica la lectura de un artículo como diccionario serializable."""
+    article = repository.get_article_by_id(2)
+    assert article["title"] == "Dos"
+    assert article["tags"] == []
+    assert repository.get_article_by_id(999) is None
+
+
+def test_crear_actualizar_y_eliminar(repository):
+    """Verifica el ciclo CRUD completo contra la base de datos."""
+    created = repository.create_article({"title": "Cuatro", "content": "d", "author_id": 103})
+    assert created["id"] == 4
+    updated = repository.update_article(4, {"title": "Cuatro bis"})
+    assert updated["title"] == "Cuatro bis"
+    assert repository.get_article_by_id(4)["title"] == "Cuatro bis"
+    assert repository.update_article(999, {"title": "X"}) is None
+    assert repository.delete_article(4) is True
+    assert repository.delete_article(4) is False
+
+
+def test_listar_articulos_paginado_por_cursor(repository):
+    """Verifica la paginación por cursor resuelta en la base de datos."""
+    page, has_more = repository.list_articles(limit=2)
+    assert [a["id"] for a in page] == [3, 2]
+    assert has_more is True
+    last = page[-1]
+    page, has_more = repository.list_articles(limit=2, cursor=(last["publication_date"], last["id"]))
+    assert [a["id"] for a in page] == [1]
+    assert has_more is False
+
+
+def test_listar_articulos_con_filtros(repository):
+    """Verifica los filtros por autor y búsqueda (con comodines escapados)."""
+    page, _ = repository.list_articles(limit=10, author_id=101)
+    assert [a["id"] for a in page] == [3, 1]
+    page, _ = repository.list_articles(limit=10, search="HOLA")
+    assert [a["id"] for a in page] == [1]
+    page, _ = repository.list_articles(limit=10, search="100%")
+    assert [a["id"] for a in page] == [2]
+    page, _ = repository.list_articles(limit=10, search="%")
+    assert [a["id"] for a in page] == [2]
+
+
+def test_etiquetas_normalizadas_y_contadores(repository):
+    """Verifica las etiquetas en tablas propias: carga por lotes, filtros y contadores mantenidos."""
+    created = repository.create_article({"title": "Cuatro", "content": "d", "tags": ["python", "sql", "python"]})
+    assert created["tags"] == ["python", "sql"]
+    repository.update_article(1, {"tags": ["sql", "ejemplo"]})
+    repository.bulk_apply([{"title": "Cinco", "content": "e", "tags": ["python"]}], [(2, {"tags": ["ejemplo"]})], [4])
+    assert repository.get_article_by_id(1)["tags"] == ["sql", "ejemplo"] # Orden indicado por el autor
+    assert repository.get_article_by_id(3)["tags"] == []
+    assert [a["id"] for a in repository.get_articles_by_tag("ejemplo")] == [1, 2]
+    page, _ = repository.list_articles(limit=10, tags=["sql", "ejemplo"])
+    assert [a["id"] for a in page] == [1]
+    page, _ = repository.list_articles(limit=10, tags=["inexistente"])
+    assert page == []
+    assert repository.tag_counts() == [
+        {"name": "ejemplo", "article_count": 2},
+        {"name": "python", "article_count": 1},
+        {"name": "sql", "article_count": 1},
+    ]
+    repository.delete_article(1)
+    repository.update_article(5, {"tags": []})
+    assert repository.tag_counts() == [{"name": "ejemplo", "article_count": 1}]
+
+
+def test_etiquetas_se_cargan_con_una_consulta_por_pagina(repository):
+    """Verifica que listar una página no lanza una consulta de etiquetas por artículo."""
+    from sqlalchemy import event
+
+    for i in range(20):
+        repository.create_article({"title": f"T{i}", "content": "c", "tags": [f"t{i}", "comun"]})
+    statements = []
+    engine = repository._session.get_bind()
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    page, _ = repository.list_articles(limit=20)
+    assert all(a["tags"][-1] == "comun" for a in page)
+    assert len(statements) == 2 # Artículos + etiquetas de la página
+
+
+def test_configuracion_del_pool(tmp_path, monkeypatch):
+    """Verifica la lectura de los parámetros del pool desde el archivo de configuración."""
+    monkeypatch.delenv("CONTENT_DATABASE_URL", raising=False)
+    config = tmp_path / "config.ini"
+    config.write_text("[database]\nurl = sqlite:///%s\n\n[pool]\npool_size = 3\nmax_overflow = 2\npool_pre_ping = false\npool_recycle = 60\n" % (tmp_path / "c.db"))
+    url, pool_options = load_database_config(str(config))
+    assert url.startswith("sqlite:///")
+    assert pool_options["pool_size"] == 3
+    assert pool_options["pool_pre_ping"] is False
+    engine = build_engine(url, **pool_options)
+    assert engine.pool.size() == 3
+    engine.dispose()
@@ -0,0 +1,82 @@
+# alphapp.xyz/contenidos/pruebas/test_streaming.py
+
+import datetime
+import json
+import tracemalloc
+
+import pytest
+
+import src.views as views
+from src.repository import IndexedContentRepository
+from src.views import app
+
+EXPORT_SIZE = 500_000
+MEMORY_BUDGET = 8 * 1024 * 1024 # Pico de memoria permitido durante la exportación (bytes)
+
+
+class SyntheticRepository:
+    """
+    Repositorio que genera los artículos al vuelo a partir del cursor, sin almacenarlos,
+    para medir solo la memoria del camino de exportación.
+    """
+    def __init__(self, size):
+        self.size = size
+        self.base = datetime.datetime(2020, 1, 1)
+
+    def list_articles(self, limit, cursor=None, tags=None, author_id=None, search=None):
+        start = self.size if cursor is None else cursor[1] - 1
+        ids = range(start, max(start - limit, 0), -1)
+        page = [
+            {"id": i, "title": f"Artículo {i}", "content": "Contenido del artículo.", "author": "Autor",
+             "publication_date": self.base + datetime.timedelta(seconds=i), "tags": ["exportación"]}
+            for i in ids
+        ]
+        return page, start - limit > 0
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Cliente de prueba de Flask con un repositorio de tres artículos."""
+    repository = IndexedContentRepository([
+        {"id": i, "title": f"Artículo {i}", "content": "Contenido", "author_id": 1,
+         "publication_date": datetime.datetime(2024, 1, i), "tags": ["par"] if i % 2 == 0 else []}
+        for i in (1, 2, 3)
+    ])
+    monkeypatch.setattr(views, "content_repository", repository)
+    with app.test_client() as client:
+        yield client
+
+
+def test_streaming_por_parametro_y_cabecera(client):
+    """Verifica que ?stream=1 y Accept: application/x-ndjson devuelven NDJSON completo."""
+    for headers, query in (({}, "?stream=1"), ({"Accept": "application/x-ndjson"}, "")):
+        response = client.get(f"/articles{query}", headers=headers)
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+        lines = response.get_data(as_text=True).splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [3, 2, 1]
+
+
+def test_streaming_respeta_filtros(client):
+    """Verifica que los filtros del listado se aplican también en streaming."""
+    lines = client.get("/articles?stream=1&tags=par").get_data(as_text=True).splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [2]
+
+
+@pytest.mark.performance
+def test_streaming_memoria_acotada(monkeypatch):
+    """Verifica que exportar 500k artículos mantiene el pico de memoria acotado."""
+    monkeypatch.setattr(views, "content_repository", SyntheticRepository(EXPORT_SIZE))
+    with app.test_client() as client:
+        tracemalloc.start()
+        try:
+            response = client.get("/articles?stream=1", buffered=False)
+            count = 0
+            for chunk in response.response:
+                count += chunk.count(b"\n")
+            response.close()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    assert count == EXPORT_SIZE
+    assert peak < MEMORY_BUDGET
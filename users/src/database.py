@@ -0,0 +1,77 @@
+# alphapp.xyz/users/src/database.py
+
+"""
+Conexión a la base de datos del microservicio de usuarios: engine de SQLAlchemy con pool de
+conexiones y fábrica de sesiones con ámbito (scoped_session), de modo que cada solicitud
+HTTP trabaje con su propia sesión.
+
+La URL sale de USERS_DATABASE_URL, de database.url o de los campos de la sección
+[database] de config.ini (PostgreSQL); si no hay ninguna, el servicio no arranca.
+"""
+
+import configparser
+import os
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import URL
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Ruta por defecto del archivo de configuración del servicio
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "config.ini")
+
+# Variable de entorno que permite sobrescribir la URL de la base de datos
+DATABASE_URL_ENV = "USERS_DATABASE_URL"
+
+
+def build_engine(url, pool_size=10, max_overflow=20, pool_recycle=1800, pool_timeout=30):
+    """
+    Crea un engine de SQLAlchemy con pool de conexiones.
+    Para SQLite en memoria se usa un StaticPool (una única conexión compartida),
+    ya que cada conexión nueva vería una base de datos vacía.
+    """
+    url = str(url)
+    if url in ("sqlite://", "sqlite:///:memory:"):
+        return create_engine(url, poolclass=StaticPool, connect_args={"check_same_thread": False})
+    if url.startswith("sqlite"):
+        return create_engine(url, connect_args={"check_same_thread": False})
+    return create_engine(url, pool_size=pool_size, max_overflow=max_overflow, pool_pre_ping=True,
+                         pool_recycle=pool_recycle, pool_timeout=pool_timeout)
+
+
+def load_database_url(path=DEFAULT_CONFIG_PATH):
+    """
+    URL de la base de datos: USERS_DATABASE_URL, database.url o la URL de PostgreSQL
+    construida con los campos de [database]. ValueError si no hay ninguna configurada.
+    """
+    url = os.environ.get(DATABASE_URL_ENV)
+    if url:
+        return url
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    if not parser.has_section("database"):
+        raise ValueError(f"Falta la sección [database] en {path} (o la variable {DATABASE_URL_ENV})")
+    database = parser["database"]
+    if database.get("url"):
+        return database["url"]
+    return URL.create(
+        "postgresql+psycopg2",
+        username=database.get("user"),
+        password=database.get("password"),
+        host=database.get("host"),
+        port=database.getint("port"),
+        database=database.get("database"),
+    ).render_as_string(hide_password=False)
+
+
+def engine_from_config(path=DEFAULT_CONFIG_PATH):
+    """Crea el engine con la URL configurada (ver load_database_url)."""
+    return build_engine(load_database_url(path))
+
+
+def create_session_factory(engine):
+    """
+    Crea una fábrica de sesiones con ámbito por hilo/solicitud.
+    `expire_on_commit=False` evita recargar los atributos tras cada commit.
+    """
+    return scoped_session(sessionmaker(bind=engine, expire_on_commit=False))
@@ -0,0 +1,99 @@
+# alphapp.xyz/users/src/passwords.py
+
+"""
+Hash y verificación de contraseñas del servicio de usuarios.
+
+- Formato: PBKDF2-HMAC-SHA256 con sal aleatoria, guardado como
+  "pbkdf2_sha256$<iteraciones>$<sal>$<hash>" (base64), de modo que se pueden subir las
+  iteraciones sin invalidar los hashes existentes.
+- El cálculo es deliberadamente costoso (decenas de ms). hashlib libera el GIL mientras
+  calcula, así que PasswordHasher lo ejecuta en un pool de hilos acotado: como mucho
+  `max_workers` hashes a la vez (uno por núcleo) y `max_pending` solicitudes en espera.
+  Una ráfaga de inicios de sesión por encima de ese límite se rechaza enseguida
+  (HasherBusy -> 503) en lugar de acumular hilos de solicitud bloqueados.
+"""
+
+import base64
+import concurrent.futures
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+
+ALGORITHM = "pbkdf2_sha256"
+DEFAULT_ITERATIONS = 600_000 # Recomendación OWASP para PBKDF2-HMAC-SHA256
+SALT_BYTES = 16
+
+
+class HasherBusy(Exception):
+    """El pool de hash de contraseñas está saturado; el cliente debe reintentar."""
+
+
+def _b64(data):
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+
+def _unb64(text):
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def hash_password(password, iterations=DEFAULT_ITERATIONS, salt=None):
+    """Hash codificado de una contraseña (ver el formato en la cabecera del módulo)."""
+    salt = salt if salt is not None else secrets.token_bytes(SALT_BYTES)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+    return f"{ALGORITHM}${iterations}${_b64(salt)}${_b64(digest)}"
+
+
+def verify_password(password, encoded):
+    """Comprueba una contraseña contra su hash codificado (comparación en tiempo constante)."""
+    try:
+        algorithm, iterations, salt, expected = encoded.split("$")
+        iterations = int(iterations)
+    except (AttributeError, ValueError):
+        return False
+    if algorithm != ALGORITHM:
+        return False
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), _unb64(salt), iterations)
+    return hmac.compare_digest(digest, _unb64(expected))
+
+
+class PasswordHasher:
+    """
+    Ejecuta hash_password/verify_password en un pool de hilos acotado.
+    Los métodos bloquean al hilo que llama hasta obtener el resultado, pero el número de
+    cálculos simultáneos y en cola está limitado; por encima del límite lanzan HasherBusy.
+    """
+
+    def __init__(self, max_workers=None, max_pending=64, iterations=DEFAULT_ITERATIONS):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.iterations = iterations
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hasher")
+        self._slots = threading.BoundedSemaphore(self.max_workers + max_pending)
+        # Hash de referencia para no revelar, por el tiempo de respuesta, si un usuario existe
+        self._dummy_hash = hash_password(secrets.token_hex(8), iterations)
+
+    def _run(self, function, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HasherBusy()
+        try:
+            future = self._executor.submit(function, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+
+    def hash(self, password):
+        return self._run(hash_password, password, self.iterations)
+
+    def verify(self, password, encoded):
+        return self._run(verify_password, password, encoded)
+
+    def verify_dummy(self, password):
+        """Verificación de coste equivalente para usuarios inexistentes (siempre False)."""
+        self._run(verify_password, password, self._dummy_hash)
+        return False
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,259 @@
+# alphapp.xyz/users/src/repository.py
+
+"""
+Capa de datos del servicio de usuarios sobre el modelo User.
+
+- Búsquedas por id, username y email resueltas con los índices únicos de la tabla
+  (el email se guarda y se busca en minúsculas).
+- `get_many(ids)` resuelve un lote de usuarios con una consulta IN por bloque (lo usa la
+  expansión de autores del servicio de contenidos), sirviendo de la caché los que ya estén.
+- Caché LRU en el proceso con los usuarios más consultados, indexada también por username y
+  email; cada escritura invalida la entrada del usuario y las entradas caducan a los `ttl`
+  segundos (escrituras de otros procesos del servicio).
+- La verificación de credenciales lee siempre el usuario de la base de datos (una contraseña
+  cambiada o una cuenta desactivada en otro proceso no se acepta desde la caché) y calcula el
+  hash en el pool acotado de passwords.PasswordHasher.
+
+Los usuarios se devuelven como diccionarios; `password_hash` no sale de este módulo salvo
+para la verificación (los serializadores no lo incluyen).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+
+from .models import User
+from .passwords import PasswordHasher
+
+# Tamaño de los bloques de IDs en las cláusulas IN
+_CHUNK_SIZE = 500
+
+_USER_COLUMNS = (User.id, User.username, User.email, User.password_hash, User.is_active)
+
+# Segundos que un usuario permanece en la caché desde que se leyó de la base de datos
+DEFAULT_CACHE_TTL = 60.0
+
+
+class DuplicateUserError(Exception):
+    """Ya existe un usuario con el mismo username o email."""
+
+
+def normalize_email(email):
+    return email.strip().lower()
+
+
+def row_to_user(row):
+    return {
+        "id": row.id,
+        "username": row.username,
+        "email": row.email,
+        "password_hash": row.password_hash,
+        "is_active": row.is_active,
+    }
+
+
+class UserCache:
+    """
+    Caché LRU de usuarios por id con índices secundarios username/email -> id (segura entre hilos).
+    Los diccionarios guardados no se modifican: una escritura invalida la entrada completa.
+    Cada invalidación incrementa `generation`; una lectura que empezó antes de la última
+    invalidación no guarda su resultado (podría ser anterior a la escritura).
+    Las entradas caducan a los `ttl` segundos de guardarse: las invalidaciones solo llegan a
+    la caché del proceso que escribe, así que el TTL acota lo desactualizadas que pueden
+    estar las de los demás procesos.
+    """
+
+    def __init__(self, max_entries=1024, ttl=DEFAULT_CACHE_TTL, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._users = OrderedDict() # id -> (usuario, instante en que caduca)
+        self._keys = {} # ("username" | "email", valor) -> id
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._users)
+
+    def get(self, user_id):
+        with self._lock:
+            return self._get(user_id)
+
+    def get_by(self, field, value):
+        with self._lock:
+            user_id = self._keys.get((field, value))
+            if user_id is None:
+                self.misses += 1
+                return None
+            return self._get(user_id)
+
+    def _get(self, user_id):
+        entry = self._users.get(user_id)
+        if entry is not None and entry[1] <= self._clock():
+            self._discard(user_id) # Caducada
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._users.move_to_end(user_id)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, user, generation=None):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._discard(user["id"])
+            self._users[user["id"]] = (user, self._clock() + self.ttl)
+            self._keys[("username", user["username"])] = user["id"]
+            self._keys[("email", user["email"])] = user["id"]
+            while len(self._users) > self.max_entries:
+                self._discard(next(iter(self._users)))
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self.generation += 1
+            self._discard(user_id)
+
+    def _discard(self, user_id):
+        user, _ = self._users.pop(user_id, (None, None))
+        if user is not None:
+            self._keys.pop(("username", user["username"]), None)
+            self._keys.pop(("email", user["email"]), None)
+
+
+class UserRepository:
+    """
+    Repositorio de usuarios sobre una base de datos relacional.
+    Recibe una fábrica de sesiones con ámbito (ver database.create_session_factory);
+    la vista debe llamar a `remove_session()` al terminar cada solicitud.
+    """
+
+    def __init__(self, session_factory, cache=None, hasher=None):
+        self._session_factory = session_factory
+        self.cache = cache if cache is not None else UserCache()
+        self.hasher = hasher if hasher is not None else PasswordHasher()
+
+    @property
+    def _session(self):
+        return self._session_factory()
+
+    def remove_session(self):
+        """Cierra la sesión de la solicitud actual y devuelve su conexión al pool."""
+        self._session_factory.remove()
+
+    def _fetch_one(self, condition):
+        generation = self.cache.generation
+        row = self._session.execute(select(*_USER_COLUMNS).where(condition)).first()
+        if row is None:
+            return None
+        user = row_to_user(row)
+        self.cache.put(user, generation)
+        return user
+
+    # --- Lecturas ---
+
+    def get_by_id(self, user_id):
+        user = self.cache.get(user_id)
+        return user if user is not None else self._fetch_one(User.id == user_id)
+
+    def get_by_username(self, username):
+        user = self.cache.get_by("username", username)
+        return user if user is not None else self._fetch_one(User.username == username)
+
+    def get_by_email(self, email):
+        email = normalize_email(email)
+        user = self.cache.get_by("email", email)
+        return user if user is not None else self._fetch_one(User.email == email)
+
+    def get_many(self, ids):
+        """
+        Diccionario id -> usuario para los IDs existentes de la lista: los que están en la
+        caché se sirven de ella y el resto se consulta con una sentencia IN por bloque.
+        """
+        users, missing = {}, []
+        for user_id in dict.fromkeys(ids):
+            user = self.cache.get(user_id)
+            if user is not None:
+                users[user_id] = user
+            else:
+                missing.append(user_id)
+        session, generation = self._session, self.cache.generation
+        for start in range(0, len(missing), _CHUNK_SIZE):
+            chunk = missing[start:start + _CHUNK_SIZE]
+            for row in session.execute(select(*_USER_COLUMNS).where(User.id.in_(chunk))):
+                user = row_to_user(row)
+                self.cache.put(user, generation)
+                users[user["id"]] = user
+        return users
+
+    # --- Escrituras ---
+
+    def create_user(self, username, email, password):
+        """Crea un usuario (el hash se calcula en el pool acotado). DuplicateUserError si ya existe."""
+        user = User(username=username, email=normalize_email(email), password_hash=self.hasher.hash(password), is_active=True)
+        session = self._session
+        session.add(user)
+        try:
+            session.commit()
+        except IntegrityError:
+            session.rollback()
+            raise DuplicateUserError(username)
+        except Exception:
+            session.rollback()
+            raise
+        return row_to_user(user)
+
+    def update_user(self, user_id, data):
+        """
+        Actualiza username, email, is_active y/o la contraseña (`password`) e invalida la
+        entrada del usuario en la caché. Devuelve el usuario actualizado o None si no existe.
+        """
+        values = {field: data[field] for field in ("username", "is_active") if field in data}
+        if "email" in data:
+            values["email"] = normalize_email(data["email"])
+        if "password" in data:
+            values["password_hash"] = self.hasher.hash(data["password"])
+        session = self._session
+        try:
+            result = session.execute(update(User).where(User.id == user_id).values(**values)) if values else None
+            session.commit()
+        except IntegrityError:
+            session.rollback()
+            raise DuplicateUserError(data.get("username") or data.get("email"))
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            # Se invalida aunque falle: la entrada podría no reflejar ya la base de datos
+            self.cache.invalidate(user_id)
+        if result is not None and result.rowcount == 0:
+            return None
+        return self.get_by_id(user_id)
+
+    # --- Credenciales ---
+
+    def verify_credentials(self, login, password):
+        """
+        Devuelve el usuario si `login` (username o email) y la contraseña son correctos y el
+        usuario está activo; None en caso contrario. Para un usuario inexistente se calcula
+        igualmente un hash, de modo que el tiempo de respuesta no revela si existe.
+        Lanza passwords.HasherBusy si el pool de hash está saturado.
+        """
+        # Sin la caché: el hash y is_active deben ser los de la base de datos
+        if "@" in login:
+            user = self._fetch_one(User.email == normalize_email(login))
+        else:
+            user = self._fetch_one(User.username == login)
+        if user is None:
+            return self.hasher.verify_dummy(password) or None
+        if not self.hasher.verify(password, user["password_hash"]) or not user["is_active"]:
+            return None
+        return user
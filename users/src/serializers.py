@@ -1 +1,60 @@
+# alphapp.xyz/users/src/serializers.py
 
+"""
+Serializadores del servicio de usuarios: transforman los usuarios del repositorio
+(diccionarios) en las representaciones de la API y validan los datos de entrada.
+El hash de la contraseña nunca se incluye en una respuesta.
+"""
+
+USERNAME_LENGTH = 50 # Ver models.User.username
+EMAIL_LENGTH = 100 # Ver models.User.email
+MIN_PASSWORD_LENGTH = 8
+
+
+class UserSerializer:
+    """Serializador de usuarios para la API."""
+
+    # Campos públicos (visibles para otros servicios, p. ej. la expansión de autores)
+    public_fields = ("id", "username", "is_active")
+
+    def serialize(self, user):
+        return {field: user[field] for field in self.public_fields}
+
+    def serialize_private(self, user):
+        """Representación para el propio usuario: incluye el email."""
+        return {**self.serialize(user), "email": user["email"]}
+
+    def serialize_many(self, users):
+        return [self.serialize(user) for user in users]
+
+    def deserialize(self, data):
+        """Datos de un usuario nuevo (username, email, password) o None si no son válidos."""
+        if not isinstance(data, dict):
+            return None
+        username, email, password = data.get("username"), data.get("email"), data.get("password")
+        if not _valid_username(username) or not _valid_email(email) or not _valid_password(password):
+            return None
+        return {"username": username, "email": email, "password": password}
+
+    def deserialize_update(self, data):
+        """Campos actualizables válidos (actualización parcial); None si alguno no es válido."""
+        if not isinstance(data, dict):
+            return None
+        validators = {"username": _valid_username, "email": _valid_email, "password": _valid_password,
+                      "is_active": lambda value: isinstance(value, bool)}
+        update_data = {field: data[field] for field in validators if field in data}
+        if not all(validators[field](value) for field, value in update_data.items()):
+            return None
+        return update_data
+
+
+def _valid_username(value):
+    return isinstance(value, str) and 0 < len(value) <= USERNAME_LENGTH and "@" not in value
+
+
+def _valid_email(value):
+    return isinstance(value, str) and 0 < len(value) <= EMAIL_LENGTH and "@" in value
+
+
+def _valid_password(value):
+    return isinstance(value, str) and len(value) >= MIN_PASSWORD_LENGTH
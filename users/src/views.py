@@ -1 +1,135 @@
+# alphapp.xyz/users/src/views.py
 
+"""
+Vistas (endpoints de la API) del microservicio de usuarios.
+
+- GET  /users?ids=1,2,3   usuarios de un lote (expansión de autores del servicio de contenidos)
+- GET  /users/<id>        un usuario
+- POST /users             alta de usuario
+- PUT  /users/<id>        actualización parcial (invalida la caché del usuario)
+- POST /login             verificación de credenciales; 503 si el pool de hash está saturado
+"""
+
+import configparser
+
+from flask import Flask, jsonify, request
+
+from .database import DEFAULT_CONFIG_PATH, create_session_factory, engine_from_config
+from .models import Base
+from .passwords import DEFAULT_ITERATIONS, HasherBusy, PasswordHasher
+from .repository import DEFAULT_CACHE_TTL, DuplicateUserError, UserCache, UserRepository
+from .serializers import UserSerializer
+
+MAX_BATCH_IDS = 100 # IDs máximos por solicitud de GET /users?ids=
+
+
+def create_user_repository(path=DEFAULT_CONFIG_PATH):
+    """
+    Crea el repositorio con la base de datos, la caché y el pool de hash configurados
+    (secciones [database], [cache] y [passwords]). La URL sale de USERS_DATABASE_URL o de
+    [database] (ver database.load_database_url); con SQLite (desarrollo local) se crean las tablas.
+    """
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    engine = engine_from_config(path)
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(engine)
+    cache = parser["cache"] if parser.has_section("cache") else {}
+    passwords = parser["passwords"] if parser.has_section("passwords") else {}
+    hasher = PasswordHasher(
+        max_workers=passwords.getint("max_workers", 0) if passwords else None,
+        max_pending=passwords.getint("max_pending", 64) if passwords else 64,
+        iterations=passwords.getint("iterations", DEFAULT_ITERATIONS) if passwords else DEFAULT_ITERATIONS,
+    )
+    return UserRepository(
+        create_session_factory(engine),
+        cache=UserCache(
+            cache.getint("max_entries", 1024) if cache else 1024,
+            ttl=cache.getfloat("ttl", DEFAULT_CACHE_TTL) if cache else DEFAULT_CACHE_TTL,
+        ),
+        hasher=hasher,
+    )
+
+
+def busy_response():
+    """503 con Retry-After cuando el pool de hash de contraseñas está saturado."""
+    response = jsonify({"message": "Servicio ocupado, reintente en unos segundos"})
+    response.status_code = 503
+    response.headers["Retry-After"] = "1"
+    return response
+
+
+app = Flask(__name__)
+user_serializer = UserSerializer()
+user_repository = create_user_repository()
+
+
+@app.teardown_appcontext
+def remove_repository_session(exception=None):
+    """Libera la sesión de base de datos de la solicitud."""
+    user_repository.remove_session()
+
+
+@app.route('/users', methods=['GET', 'POST'])
+def users_list_create():
+    if request.method == 'GET':
+        try:
+            ids = [int(value) for value in request.args.get("ids", "").split(",") if value.strip()]
+        except ValueError:
+            return jsonify({"message": "El parámetro 'ids' debe ser una lista de enteros"}), 400
+        if not ids or len(ids) > MAX_BATCH_IDS:
+            return jsonify({"message": f"Se esperan entre 1 y {MAX_BATCH_IDS} IDs"}), 400
+        users = user_repository.get_many(ids)
+        return jsonify({"data": user_serializer.serialize_many(users[i] for i in dict.fromkeys(ids) if i in users)}), 200
+
+    data = user_serializer.deserialize(request.get_json(silent=True))
+    if data is None:
+        return jsonify({"message": "Datos de entrada no válidos"}), 400
+    try:
+        user = user_repository.create_user(**data)
+    except DuplicateUserError:
+        return jsonify({"message": "El nombre de usuario o el email ya existen"}), 409
+    except HasherBusy:
+        return busy_response()
+    return jsonify(user_serializer.serialize_private(user)), 201
+
+
+@app.route('/users/<int:user_id>', methods=['GET', 'PUT'])
+def user_detail(user_id):
+    if request.method == 'GET':
+        user = user_repository.get_by_id(user_id)
+        if user is None:
+            return jsonify({"message": "Usuario no encontrado"}), 404
+        return jsonify(user_serializer.serialize(user)), 200
+
+    # En un entorno real, solo el propio usuario (o un administrador) puede actualizarlo
+    data = user_serializer.deserialize_update(request.get_json(silent=True))
+    if not data:
+        return jsonify({"message": "No hay campos válidos para actualizar"}), 400
+    try:
+        user = user_repository.update_user(user_id, data)
+    except DuplicateUserError:
+        return jsonify({"message": "El nombre de usuario o el email ya existen"}), 409
+    except HasherBusy:
+        return busy_response()
+    if user is None:
+        return jsonify({"message": "Usuario no encontrado"}), 404
+    return jsonify(user_serializer.serialize_private(user)), 200
+
+
+@app.route('/login', methods=['POST'])
+def login():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        data = {}
+    login_name, password = data.get("login"), data.get("password")
+    if not isinstance(login_name, str) or not isinstance(password, str):
+        return jsonify({"message": "Se esperan 'login' y 'password'"}), 400
+    try:
+        user = user_repository.verify_credentials(login_name, password)
+    except HasherBusy:
+        return busy_response()
+    if user is None:
+        return jsonify({"message": "Credenciales no válidas"}), 401
+    # La emisión del token (JWT) corresponde al API Gateway / módulo de autenticación
+    return jsonify({"user": user_serializer.serialize_private(user)}), 200
@@ -0,0 +1,6 @@
+# alphapp.xyz/usuarios/pruebas/conftest.py
+
+import os
+
+# src.views crea el repositorio al importarse: las pruebas usan SQLite en memoria
+os.environ.setdefault("USERS_DATABASE_URL", "sqlite://")
@@ -0,0 +1,156 @@
+# alphapp.xyz/usuarios/pruebas/test_repository.py
+
+import threading
+import time
+
+import pytest
+from sqlalchemy import event
+
+from src.database import DATABASE_URL_ENV, build_engine, create_session_factory, load_database_url
+from src.models import Base
+from src.passwords import HasherBusy, PasswordHasher, hash_password, verify_password
+from src.repository import DuplicateUserError, UserCache, UserRepository
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(max_workers=2, max_pending=2, iterations=1_000)
+    yield hasher
+    hasher.shutdown()
+
+
+@pytest.fixture
+def repository(hasher):
+    """Repositorio sobre SQLite en memoria con tres usuarios (hash con pocas iteraciones)."""
+    engine = build_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session_factory = create_session_factory(engine)
+    repository = UserRepository(session_factory, cache=UserCache(max_entries=2), hasher=hasher)
+    for i in (1, 2, 3):
+        repository.create_user(f"usuario{i}", f"Usuario{i}@Example.com", f"secreto-{i}")
+    repository.statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: repository.statements.append(args[2]))
+    yield repository
+    session_factory.remove()
+    engine.dispose()
+
+
+def test_hash_de_contrasena():
+    """Verifica el formato del hash, la sal aleatoria y la verificación."""
+    encoded = hash_password("correcta", iterations=1_000)
+    assert encoded.startswith("pbkdf2_sha256$1000$")
+    assert encoded != hash_password("correcta", iterations=1_000)
+    assert verify_password("correcta", encoded)
+    assert not verify_password("incorrecta", encoded)
+    assert not verify_password("correcta", "md5$x")
+
+
+def test_busquedas_indexadas_y_cache(repository):
+    """Verifica las búsquedas por id, username y email (sin distinguir mayúsculas) servidas por la caché."""
+    user = repository.get_by_username("usuario1")
+    assert user["email"] == "usuario1@example.com"
+    queries = len(repository.statements)
+    assert repository.get_by_id(user["id"]) is user
+    assert repository.get_by_email("USUARIO1@example.com") is user
+    assert len(repository.statements) == queries # Sin consultas: aciertos de la caché
+    assert repository.get_by_username("nadie") is None
+
+
+def test_get_many_en_una_consulta(repository):
+    """Verifica que un lote se resuelve con una sola consulta IN para los que faltan en la caché."""
+    repository.get_by_id(1)
+    users = repository.get_many([1, 2, 3, 2, 99])
+    assert sorted(users) == [1, 2, 3]
+    assert len(repository.statements) == 2 # get_by_id(1) + un IN con 2 y 3 (y el 99 inexistente)
+
+
+def test_actualizacion_invalida_la_cache(repository):
+    """Verifica que una actualización no deja la versión anterior en la caché."""
+    repository.get_by_username("usuario2")
+    updated = repository.update_user(2, {"username": "renombrado", "password": "nueva-clave"})
+    assert updated["username"] == "renombrado"
+    assert repository.get_by_username("usuario2") is None
+    assert repository.get_by_id(2)["username"] == "renombrado"
+    assert repository.verify_credentials("renombrado", "nueva-clave")["id"] == 2
+    assert repository.update_user(99, {"username": "x"}) is None
+    with pytest.raises(DuplicateUserError):
+        repository.update_user(2, {"email": "usuario1@example.com"})
+    with pytest.raises(DuplicateUserError):
+        repository.create_user("usuario1", "otro@example.com", "secreto-x")
+
+
+def test_lectura_anterior_a_una_invalidacion_no_se_guarda():
+    """Verifica que un resultado leído antes de una invalidación no vuelve a la caché."""
+    cache = UserCache()
+    generation = cache.generation
+    cache.invalidate(1)
+    cache.put({"id": 1, "username": "viejo", "email": "v@example.com"}, generation)
+    assert cache.get(1) is None
+
+
+def test_verificacion_de_credenciales(repository):
+    """Verifica login por username o email, contraseña incorrecta, usuario inexistente e inactivo."""
+    assert repository.verify_credentials("usuario1", "secreto-1")["id"] == 1
+    assert repository.verify_credentials("usuario1@example.com", "secreto-1")["id"] == 1
+    assert repository.verify_credentials("usuario1", "secreto-2") is None
+    assert repository.verify_credentials("nadie", "secreto-1") is None
+    repository.update_user(3, {"is_active": False})
+    assert repository.verify_credentials("usuario3", "secreto-3") is None
+
+
+def test_pool_de_hash_acotado():
+    """Verifica que por encima de hilos + cola el pool rechaza en lugar de acumular solicitudes."""
+    release = threading.Event()
+    hasher = PasswordHasher(max_workers=1, max_pending=1, iterations=1_000)
+    try:
+        blocked = [threading.Thread(target=hasher._run, args=(release.wait,)) for _ in range(2)]
+        for thread in blocked:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while hasher._slots._value and time.monotonic() < deadline: # Esperar a que ambos ocupen su plaza
+            time.sleep(0.001)
+        with pytest.raises(HasherBusy):
+            hasher.verify("clave", hash_password("clave", iterations=1_000))
+        release.set()
+        for thread in blocked:
+            thread.join()
+        assert hasher.verify("clave", hash_password("clave", iterations=1_000))
+    finally:
+        hasher.shutdown()
+
+
+def test_entradas_de_la_cache_caducan():
+    """Verifica que un usuario deja de servirse de la caché pasados `ttl` segundos."""
+    now = [0.0]
+    cache = UserCache(ttl=10, clock=lambda: now[0])
+    cache.put({"id": 1, "username": "ana", "email": "ana@example.com"})
+    now[0] = 9.9
+    assert cache.get_by("username", "ana")["id"] == 1
+    now[0] = 10.0
+    assert cache.get(1) is None
+    assert cache.get_by("email", "ana@example.com") is None
+    assert len(cache) == 0
+
+
+def test_credenciales_no_se_sirven_de_la_cache(repository):
+    """Verifica que un cambio hecho por otro proceso (sin invalidar esta caché) se respeta al verificar."""
+    repository.get_by_username("usuario1") # En la caché
+    other = UserRepository(repository._session_factory, cache=UserCache(), hasher=repository.hasher)
+    other.update_user(1, {"password": "otra-clave"})
+    assert repository.verify_credentials("usuario1", "secreto-1") is None
+    assert repository.verify_credentials("usuario1@example.com", "otra-clave")["id"] == 1
+    other.update_user(1, {"is_active": False})
+    assert repository.verify_credentials("usuario1", "otra-clave") is None
+
+
+def test_sin_base_de_datos_configurada(tmp_path, monkeypatch):
+    """Verifica que la URL sale de [database] y que sin configuración se lanza un error."""
+    monkeypatch.delenv(DATABASE_URL_ENV, raising=False)
+    path = tmp_path / "config.ini"
+    path.write_text("[database]\nhost = db\nport = 5432\nuser = u\npassword = p\ndatabase = users_db\n")
+    assert load_database_url(str(path)) == "postgresql+psycopg2://u:p@db:5432/users_db"
+    path.write_text("[cache]\nmax_entries = 8\n")
+    with pytest.raises(ValueError):
+        load_database_url(str(path))
+    monkeypatch.setenv(DATABASE_URL_ENV, "sqlite://")
+    assert load_database_url(str(path)) == "sqlite://"
@@ -1 +1,52 @@
+# alphapp.xyz/usuarios/pruebas/test_views.py
 
+import pytest
+
+import src.views as views
+from src.database import build_engine, create_session_factory
+from src.models import Base
+from src.passwords import PasswordHasher
+from src.repository import UserRepository
+from src.views import app
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Cliente de la API sobre un repositorio SQLite en memoria con dos usuarios."""
+    engine = build_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    hasher = PasswordHasher(max_workers=2, iterations=1_000)
+    repository = UserRepository(create_session_factory(engine), hasher=hasher)
+    for name in ("ana", "luis"):
+        repository.create_user(name, f"{name}@example.com", f"clave-de-{name}")
+    monkeypatch.setattr(views, "user_repository", repository)
+    with app.test_client() as client:
+        yield client
+    hasher.shutdown()
+    engine.dispose()
+
+
+def test_usuarios_por_lote(client):
+    """Verifica GET /users?ids= (contrato de la expansión de autores) sin campos privados."""
+    data = client.get("/users?ids=2,1,99,2").get_json()["data"]
+    assert data == [{"id": 2, "username": "luis", "is_active": True}, {"id": 1, "username": "ana", "is_active": True}]
+    assert client.get("/users?ids=a").status_code == 400
+    assert client.get("/users").status_code == 400
+    assert client.get(f"/users?ids={','.join(map(str, range(101)))}").status_code == 400
+
+
+def test_alta_actualizacion_y_login(client):
+    """Verifica el alta, el conflicto de duplicados, la actualización y el login."""
+    response = client.post("/users", json={"username": "eva", "email": "Eva@example.com", "password": "clave-de-eva"})
+    assert response.status_code == 201
+    assert response.get_json() == {"id": 3, "username": "eva", "is_active": True, "email": "eva@example.com"}
+    assert client.post("/users", json={"username": "eva", "email": "x@example.com", "password": "clave-de-eva"}).status_code == 409
+    assert client.post("/users", json={"username": "corto", "email": "c@example.com", "password": "123"}).status_code == 400
+
+    assert client.post("/login", json={"login": "eva@example.com", "password": "clave-de-eva"}).status_code == 200
+    assert client.put("/users/3", json={"password": "otra-clave-eva"}).status_code == 200
+    assert client.post("/login", json={"login": "eva", "password": "clave-de-eva"}).status_code == 401
+    assert client.post("/login", json={"login": "eva", "password": "otra-clave-eva"}).get_json()["user"]["id"] == 3
+    assert client.post("/login", json=["eva"]).status_code == 400
+    assert client.get("/users/3").get_json()["username"] == "eva"
+    assert client.get("/users/99").status_code == 404